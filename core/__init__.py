@@ -0,0 +1 @@
+# 📦 페이지 공용 로직 모음
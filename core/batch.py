@@ -0,0 +1,95 @@
+# 🗂️ 주문/입금 엑셀 묶음 일괄 정산 CLI
+#
+# 사용 예)
+#   python -m core.batch ./월말 -o ./정산결과 --workers 8
+#
+# 입력 폴더의 파일 이름에서 주문/입금 태그를 떼어낸 나머지(상점 이름)로 짝을 짓는다.
+#   A상점_주문.xlsx + A상점_입금.xlsx → 정산결과/A상점_정산결과.xlsx
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from core.ingest import parse_excel
+from core.reconcile import reconcile, write_workbook
+
+EXCEL_SUFFIXES = {".xls", ".xlsx"}
+DEFAULT_ORDER_TAG = "주문"
+DEFAULT_DEPOSIT_TAG = "입금"
+
+
+def _shop_name(stem, tag):
+    return stem.replace(tag, "").strip(" _-.()")
+
+
+def find_pairs(input_dir, order_tag=DEFAULT_ORDER_TAG, deposit_tag=DEFAULT_DEPOSIT_TAG):
+    """폴더 안의 (상점 이름, 주문 파일, 입금 파일) 목록과 짝이 없는 파일 목록."""
+    orders, deposits = {}, {}
+    for path in sorted(Path(input_dir).iterdir()):
+        if path.suffix.lower() not in EXCEL_SUFFIXES or path.name.startswith("~$"):
+            continue
+        if order_tag in path.stem:
+            orders[_shop_name(path.stem, order_tag)] = path
+        elif deposit_tag in path.stem:
+            deposits[_shop_name(path.stem, deposit_tag)] = path
+
+    pairs = [(shop, orders[shop], deposits[shop]) for shop in sorted(orders.keys() & deposits.keys())]
+    orphans = [orders[s] for s in orders.keys() - deposits.keys()] + [deposits[s] for s in deposits.keys() - orders.keys()]
+    return pairs, sorted(orphans)
+
+
+def run_pair(shop, order_path, deposit_path, output_dir, amount_tolerance=None):
+    """한 쌍을 정산해 결과 엑셀을 쓰고 (상점 이름, 결과 경로, 행 수)를 돌려준다."""
+    order_df = parse_excel(Path(order_path).read_bytes())
+    deposit_df = parse_excel(Path(deposit_path).read_bytes())
+    result_df, sheets, reports = reconcile(order_df, deposit_df, amount_tolerance)
+    for label, report in reports.items():
+        if report.unparsed:
+            print(f"⚠️ {shop}: {label} 값 {report.unparsed}개를 숫자로 읽지 못해 0으로 처리 (예: {', '.join(report.samples)})", file=sys.stderr)
+
+    out_path = Path(output_dir) / f"{shop or 'result'}_정산결과.xlsx"
+    write_workbook(sheets, out_path)
+    return shop, out_path, len(result_df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="주문/입금 엑셀 묶음을 일괄 정산합니다.")
+    parser.add_argument("input_dir", help="주문/입금 엑셀 파일이 들어 있는 폴더")
+    parser.add_argument("-o", "--output-dir", default="정산결과", help="결과 엑셀을 저장할 폴더")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(), help="동시에 처리할 프로세스 수")
+    parser.add_argument("--order-tag", default=DEFAULT_ORDER_TAG, help="주문내역 파일 이름에 들어가는 태그")
+    parser.add_argument("--deposit-tag", default=DEFAULT_DEPOSIT_TAG, help="입금내역 파일 이름에 들어가는 태그")
+    parser.add_argument("--amount-tolerance", type=float, help="이름이 안 맞는 주문·입금을 이 금액 차이(원) 이하끼리 2차 매칭 (0 = 같은 금액만)")
+    args = parser.parse_args(argv)
+
+    pairs, orphans = find_pairs(args.input_dir, args.order_tag, args.deposit_tag)
+    for path in orphans:
+        print(f"⚠️ 짝이 없는 파일 건너뜀: {path.name}", file=sys.stderr)
+    if not pairs:
+        print("❌ 정산할 주문/입금 파일 쌍이 없습니다.", file=sys.stderr)
+        return 1
+
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=max(1, args.workers or 1)) as pool:
+        futures = {
+            pool.submit(run_pair, shop, order_path, deposit_path, args.output_dir, args.amount_tolerance): shop
+            for shop, order_path, deposit_path in pairs
+        }
+        for future in as_completed(futures):
+            shop = futures[future]
+            try:
+                _, out_path, row_count = future.result()
+                print(f"✅ {shop}: {row_count}건 → {out_path}")
+            except Exception as e:
+                failed += 1
+                print(f"❌ {shop}: 오류 발생: {e}", file=sys.stderr)
+
+    print(f"📦 완료 {len(pairs) - failed}/{len(pairs)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
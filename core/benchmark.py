@@ -0,0 +1,295 @@
+# 🏁 페이지 파이프라인 벤치마크 CLI
+#
+# 사용 예)
+#   python -m core.benchmark                          # 1k/10k/100k, 저장된 기준과 비교
+#   python -m core.benchmark --sizes 1m               # 백만 행 (입금 엑셀 파싱만 수 분 걸림)
+#   python -m core.benchmark --sizes 1k,10k --pages refurb,returns
+#   python -m core.benchmark --save-baseline          # 지금 결과를 기준으로 저장
+#
+# core/synthetic.py 로 만든 가짜 데이터를 Streamlit 없이 각 페이지와 같은 순서로 처리하고
+# 단계(parse/transform/match/aggregate/render/export)별 시간과 최대 메모리를 잰다.
+# 시간은 --repeat 번 중 가장 빠른 값, 메모리는 tracemalloc 을 켠 별도 1회 실행에서 잰다.
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from core import synthetic
+from core.export import export_bytes
+from core.ingest import parse_excel
+from core.reconcile import reconcile, workbook_bytes
+from core.refurb import SCHEMA as REFURB_SCHEMA, build_refurb_cube
+from core.returns import SCHEMA as RETURNS_SCHEMA, build_returns_cube
+from core.sheets import Snapshot
+from core.shipments import (
+    SCHEMA as SHIPMENTS_SCHEMA, ShipmentStore, calendar_events, month_range, prepare_shipments, shipment_cards,
+    upcoming_cards,
+)
+from core.views import CARD_PAGE_SIZES, TABLE_PAGE_SIZE
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SIZES = ["1k", "10k", "100k"]
+DEFAULT_BASELINE = Path(__file__).resolve().parent.parent / ".profile" / "benchmark_baseline.json"
+# 기준보다 TOLERANCE 배 이상 느리고 MIN_REGRESSION_SECONDS 이상 차이 나면 회귀로 본다
+TOLERANCE = 0.25
+MIN_REGRESSION_SECONDS = 0.01
+
+
+class _Stages:
+    """step(name, fn) 으로 단계를 실행하며 시간·최대 메모리를 모은다 (같은 단계는 합산)."""
+
+    def __init__(self, track_memory):
+        self.track_memory = track_memory
+        self.seconds = {}
+        self.peak_bytes = {}
+
+    def __call__(self, name, fn):
+        if self.track_memory:
+            tracemalloc.reset_peak()
+            start_memory = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        result = fn()
+        self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - started
+        if self.track_memory:
+            peak = tracemalloc.get_traced_memory()[1] - start_memory
+            self.peak_bytes[name] = max(self.peak_bytes.get(name, 0), peak)
+        return result
+
+
+# ---------- 페이지별 파이프라인 (페이지 스크립트와 같은 순서, 위젯 값은 기본값) ----------
+
+def _deposit_data(n, seed):
+    orders = synthetic.order_frame(n, seed)
+    return synthetic.workbook(orders), synthetic.workbook(synthetic.deposit_frame(orders, seed))
+
+
+def _deposit(data, step):
+    order_bytes, deposit_bytes = data
+    order_df = step("parse", lambda: parse_excel(order_bytes))
+    deposit_df = step("parse", lambda: parse_excel(deposit_bytes))
+    result_df, sheets, _ = step("match", lambda: reconcile(order_df, deposit_df))
+    step("export", lambda: workbook_bytes(sheets))
+    return len(order_df) + len(deposit_df)
+
+
+def _shipments_data(n, seed):
+    return synthetic.shipment_frame(n, seed, today=date.today())
+
+
+def _shipments(raw, step):
+    today = date.today()
+    df = step("parse", lambda: SHIPMENTS_SCHEMA.load(raw))
+    store = step("transform", lambda: ShipmentStore(prepare_shipments(df, today)))
+
+    def aggregate():
+        store.summary(today)
+        store.day_summary(today)
+        view_start, view_end = month_range(today.strftime("%Y-%m"))
+        start, end = view_start - pd.Timedelta(days=31), view_end + pd.Timedelta(days=31)
+        calendar_events(store.window(start, end), start, end)
+        return store.on(today), store.between(today, today + pd.Timedelta(days=7))
+
+    matched, upcoming = step("aggregate", aggregate)
+    page_size = CARD_PAGE_SIZES[1]
+    step("render", lambda: (shipment_cards(matched.iloc[:page_size]), upcoming_cards(upcoming.iloc[:page_size])))
+    return len(raw)
+
+
+def _refurb_data(n, seed):
+    return synthetic.refurb_frame(n, seed)
+
+
+def _refurb(raw, step):
+    df = step("parse", lambda: REFURB_SCHEMA.load(raw))
+    cube, _ = step("transform", lambda: build_refurb_cube(df))
+
+    def aggregate():
+        view = cube.view()
+        for dimension in ("거래 상태", "모델명", "사이트"):
+            view = view.where(dimension, view.members(dimension))
+        view = view.dropna("날짜")
+        view.count(), view.total("정산 금액"), view.mean("정산 금액"), view.max("정산 금액"), view.min("정산 금액")
+        view.rollup("거래 상태"), view.rollup("날짜", "정산 금액"), view.rollup("날짜", "수량")
+        view.rollup("모델명", "정산 금액"), view.rollup("모델명", "수량"), view.rollup(["사이트", "거래 상태"])
+        return view
+
+    view = step("aggregate", aggregate)
+    rows = view.rows()
+    step("render", lambda: rows.slice(0, TABLE_PAGE_SIZE))
+    step("export", lambda: export_bytes(rows, "Excel (xlsx)", sheet_name="리퍼 정산"))
+    return len(raw)
+
+
+def _returns_data(n, seed):
+    return synthetic.returns_frames(n, seed)
+
+
+def _returns(frames, step):
+    names = list(frames)
+    snapshots = step("parse", lambda: [
+        Snapshot(("benchmark", name), RETURNS_SCHEMA.load(frame), 0.0, i) for i, (name, frame) in enumerate(frames.items())
+    ])
+    cube, _ = step("transform", lambda: build_returns_cube(names, snapshots))
+
+    def aggregate():
+        view = cube.view()
+        view = view.where("처리방식", view.members("처리방식", dropna=False))
+        view.total("수량"), view.mean("수량"), view.max("수량"), view.count()
+        view.rollup(["시트이름", "처리방식"], "수량"), view.rollup("모델명", "수량").nlargest(10)
+        view.rollup("처리방식", "수량"), view.rollup("처리방식")
+        view.rollup(["처리방식", "시트이름"], "수량").unstack("시트이름")
+        return view
+
+    view = step("aggregate", aggregate)
+    # 시트별 표는 기본으로 접혀 있다: 건수만 세고, 첫 시트만 펼쳐 첫 쪽을 보낸다
+    def render():
+        sheets = [view.where("시트이름", [name]) for name in view.members("시트이름")]
+        counts = [sheet.count() for sheet in sheets]
+        return counts, sheets[0].rows().slice(0, TABLE_PAGE_SIZE) if sheets else None
+
+    step("render", render)
+    return sum(len(frame) for frame in frames.values())
+
+
+# 이름 → (데이터 생성, 파이프라인)
+PIPELINES = {
+    "deposit": (_deposit_data, _deposit),
+    "shipments": (_shipments_data, _shipments),
+    "refurb": (_refurb_data, _refurb),
+    "returns": (_returns_data, _returns),
+}
+
+
+def run_pipeline(page, size, repeat=3, seed=0):
+    """한 페이지·한 크기 → {단계: {"seconds": 최솟값, "peak_mb": 최대 메모리}} (+ "total")."""
+    make_data, pipeline = PIPELINES[page]
+    data = make_data(SIZES[size], seed)
+
+    timings = []
+    for _ in range(repeat):
+        stages = _Stages(track_memory=False)
+        pipeline(data, stages)
+        timings.append(stages.seconds)
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        memory = _Stages(track_memory=True)
+        pipeline(data, memory)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    result = {
+        name: {
+            "seconds": min(t[name] for t in timings),
+            "peak_mb": memory.peak_bytes.get(name, 0) / 1024 / 1024,
+        }
+        for name in timings[0]
+    }
+    result["total"] = {
+        "seconds": min(sum(t.values()) for t in timings),
+        "peak_mb": max(memory.peak_bytes.values(), default=0) / 1024 / 1024,
+    }
+    return result
+
+
+def run(pages, sizes, repeat=3, seed=0, log=print):
+    """{"page/size": run_pipeline 결과}."""
+    results = {}
+    for size in sizes:
+        for page in pages:
+            started = time.perf_counter()
+            results[f"{page}/{size}"] = run_pipeline(page, size, repeat=repeat, seed=seed)
+            log(f"⏱️ {page}/{size}: {results[f'{page}/{size}']['total']['seconds']:.3f}s (측정 {time.perf_counter() - started:.1f}s)")
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """결과·기준 비교 표와 회귀 목록 (기준에 없는 항목은 비교하지 않음)."""
+    rows, regressions = [], []
+    for case, stages in results.items():
+        for stage, measured in stages.items():
+            before = baseline.get(case, {}).get(stage)
+            row = {"case": case, "stage": stage, **measured, "baseline_seconds": None, "change": None}
+            if before:
+                row["baseline_seconds"] = before["seconds"]
+                row["change"] = measured["seconds"] / before["seconds"] - 1 if before["seconds"] else None
+                slower = measured["seconds"] - before["seconds"]
+                if slower > MIN_REGRESSION_SECONDS and measured["seconds"] > before["seconds"] * (1 + tolerance):
+                    regressions.append(row)
+            rows.append(row)
+    return pd.DataFrame(rows), regressions
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))["results"]
+
+
+def save_baseline(path, results):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {"python": platform.python_version(), "pandas": pd.__version__, "machine": platform.machine(), "saved_at": time.time()}
+    path.write_text(json.dumps({"meta": meta, "results": results}, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def _format_table(table):
+    shown = table.assign(
+        seconds=table["seconds"].map("{:.4f}".format),
+        peak_mb=table["peak_mb"].map("{:.1f}".format),
+        baseline_seconds=table["baseline_seconds"].map(lambda v: "" if pd.isna(v) else f"{v:.4f}"),
+        change=table["change"].map(lambda v: "" if pd.isna(v) else f"{v:+.0%}"),
+    )
+    return shown.to_string(index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지별 처리 파이프라인을 가짜 데이터로 벤치마크합니다.")
+    parser.add_argument("--sizes", default=",".join(DEFAULT_SIZES), help=f"쉼표로 구분 ({', '.join(SIZES)})")
+    parser.add_argument("--pages", default=",".join(PIPELINES), help=f"쉼표로 구분 ({', '.join(PIPELINES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="시간 측정 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준 결과 JSON 경로")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준으로 저장")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="회귀로 볼 느려짐 비율 (0.25 = 25%%)")
+    parser.add_argument("--json", help="결과를 JSON 으로도 저장할 경로")
+    args = parser.parse_args(argv)
+
+    sizes = [s.strip().lower() for s in args.sizes.split(",") if s.strip()]
+    pages = [p.strip() for p in args.pages.split(",") if p.strip()]
+    unknown = [s for s in sizes if s not in SIZES] + [p for p in pages if p not in PIPELINES]
+    if unknown:
+        print(f"❌ 알 수 없는 크기/페이지: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    results = run(pages, sizes, repeat=max(1, args.repeat), seed=args.seed)
+    table, regressions = compare(results, load_baseline(args.baseline), tolerance=args.tolerance)
+    print(_format_table(table))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update(results)
+        save_baseline(args.baseline, baseline)
+        print(f"💾 기준 저장: {args.baseline}")
+        return 0
+    if regressions:
+        for row in regressions:
+            print(f"❌ 회귀: {row['case']} {row['stage']} {row['baseline_seconds']:.4f}s → {row['seconds']:.4f}s ({row['change']:+.0%})", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# 🗄️ 프로세스 공용 캐시
+#
+# Streamlit 은 위젯을 건드릴 때마다 페이지 스크립트를 처음부터 다시 실행하므로,
+# 재실행 사이에 살아남아야 하는 값은 여기 모듈 수준 캐시에 둔다 (모든 세션 공유).
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def sizeof(value):
+    """캐시 항목의 대략적인 메모리 크기 (bytes)."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return int(pd.Series(value.ravel()).memory_usage(index=False, deep=True))
+        return value.nbytes
+    if hasattr(value, "to_plotly_json"):
+        # Plotly Figure: 트레이스 배열·레이아웃이 든 dict 로 잰다 (sys.getsizeof 는 껍데기만 잼)
+        return sizeof(value.to_plotly_json())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sum(sizeof(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """총 크기(max_bytes) 기준으로 오래 안 쓴 항목부터 버리는 LRU 캐시."""
+
+    def __init__(self, max_bytes, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._items = OrderedDict()
+        self._total = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key][0]
+
+    def put(self, key, value):
+        size = sizeof(value)
+        with self._lock:
+            if key in self._items:
+                self._total -= self._items.pop(key)[1]
+            if size > self.max_bytes:
+                return value
+            self._items[key] = (value, size)
+            self._total += size
+            while self._total > self.max_bytes or (self.max_entries and len(self._items) > self.max_entries):
+                _, (_, old_size) = self._items.popitem(last=False)
+                self._total -= old_size
+        return value
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._total = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def total_bytes(self):
+        return self._total
+
+
+_MISSING = object()
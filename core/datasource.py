@@ -0,0 +1,249 @@
+# 🔌 시트 데이터 소스 (교체 가능한 백엔드)
+#
+# 페이지는 스프레드시트 ID·워크시트 이름으로만 데이터를 요청하고, 실제로 어디서
+# 읽을지는 MURRAY_DATA_SOURCE 환경변수로 정한다.
+#   gspread (기본)       : 구글 시트 실시간 (증분 미러 사용)
+#   local[:<폴더>]       : <폴더>/<스프레드시트 ID>/<워크시트>.parquet|.csv|.xlsx
+#                          (폴더 기본값: MURRAY_LOCAL_DIR 또는 ./snapshots)
+#   fake                 : 프로세스 안의 dict (벤치마크·부하 테스트용, set_data_source 로 채움)
+#
+# schema(core/schema.py SheetSchema)를 주면 어느 백엔드든 읽는 자리에서 열 타입을 바꿔 돌려준다.
+# 캐시에는 그 결과만 들어간다.
+#
+# 로컬 스냅샷 만들기:
+#   python -m core.datasource snapshot ./snapshots <스프레드시트 ID> ...
+import abc
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+from core.google_api import open_spreadsheet
+from core.sheets import (
+    DEFAULT_TTL, fetch_worksheets, has_snapshot, load_sheet, load_sheets, numericise_frame, prime_sheet,
+    refresh_sheet,
+)
+
+LOCAL_SUFFIXES = (".parquet", ".csv", ".xlsx")
+
+
+class WorksheetNotFound(KeyError):
+    pass
+
+
+class DataSource(abc.ABC):
+    """백엔드 공통 인터페이스 (worksheet_titles·read 를 빠뜨린 백엔드는 만들 때 TypeError)."""
+
+    name = "base"
+    remote = False  # 예약 갱신(core/scheduler.py) 할 가치가 있는 원격 백엔드인지
+
+    @abc.abstractmethod
+    def worksheet_titles(self, spreadsheet_id):
+        """스프레드시트의 워크시트 이름 목록."""
+
+    @abc.abstractmethod
+    def read(self, spreadsheet_id, worksheet, mirror=None, full=False, schema=None):
+        """워크시트 → get_all_records() 모양의 DataFrame (schema 가 있으면 타입 변환까지).
+
+        mirror 는 증분 미러 이름 (지원 백엔드만).
+        """
+
+    def read_many(self, spreadsheet_id, worksheets, schema=None):
+        return {name: self.read(spreadsheet_id, name, schema=schema) for name in worksheets}
+
+    def local_frame(self, spreadsheet_id, worksheet, mirror=None, schema=None):
+        """네트워크 없이 바로 줄 수 있는 이전 데이터 (없으면 None)."""
+        return None
+
+
+def _typed(df, schema):
+    return df if schema is None else schema.load(df)
+
+
+class GSpreadSource(DataSource):
+    """구글 시트. 클라이언트·자격 증명·HTTP 세션은 core.google_api 의 프로세스 공용 객체를 쓴다."""
+
+    name = "gspread"
+    remote = True
+
+    def worksheet_titles(self, spreadsheet_id):
+        return [ws.title for ws in open_spreadsheet(spreadsheet_id).worksheets()]
+
+    def read(self, spreadsheet_id, worksheet, mirror=None, full=False, schema=None):
+        ws = open_spreadsheet(spreadsheet_id).worksheet(worksheet)
+        if mirror is not None:
+            from core.mirror import get_mirror
+            return get_mirror(mirror, schema=schema).sync(ws, full=full)
+        return _typed(pd.DataFrame(ws.get_all_records()), schema)
+
+    def read_many(self, spreadsheet_id, worksheets, schema=None):
+        fetched = fetch_worksheets(open_spreadsheet(spreadsheet_id), list(worksheets))
+        return {name: _typed(df, schema) for name, df in fetched.items()}
+
+    def local_frame(self, spreadsheet_id, worksheet, mirror=None, schema=None):
+        if mirror is None:
+            return None
+        from core.mirror import get_mirror
+        return get_mirror(mirror, schema=schema).local_frame()
+
+
+def _file_stem(worksheet):
+    return worksheet.replace("/", "_").replace("\\", "_")
+
+
+class LocalSource(DataSource):
+    """폴더에 저장된 시트 스냅샷. 같은 이름이면 parquet → csv → xlsx 순으로 고른다."""
+
+    name = "local"
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _folder(self, spreadsheet_id):
+        return self.directory / spreadsheet_id
+
+    def worksheet_titles(self, spreadsheet_id):
+        folder = self._folder(spreadsheet_id)
+        if not folder.is_dir():
+            return []
+        return sorted({p.stem for p in folder.iterdir() if p.suffix in LOCAL_SUFFIXES})
+
+    def read(self, spreadsheet_id, worksheet, mirror=None, full=False, schema=None):
+        folder = self._folder(spreadsheet_id)
+        for suffix in LOCAL_SUFFIXES:
+            path = folder / f"{_file_stem(worksheet)}{suffix}"
+            if not path.exists():
+                continue
+            # 어느 형식이든 시트처럼 문자열로 읽고 (빈 칸은 ""), 숫자로 읽히는 값만 같은 규칙으로 바꾼다
+            if suffix == ".parquet":
+                df = pd.read_parquet(path)
+            elif suffix == ".csv":
+                df = pd.read_csv(path, dtype=object, keep_default_na=False)
+            else:
+                df = pd.read_excel(path, dtype=str, keep_default_na=False)
+            return _typed(numericise_frame(df), schema)
+        raise WorksheetNotFound(f"{folder}/{worksheet}")
+
+
+class FakeSource(DataSource):
+    """프로세스 메모리 안의 시트. tables: {스프레드시트 ID: {워크시트 이름: DataFrame}}."""
+
+    name = "fake"
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.reads = 0
+
+    def put(self, spreadsheet_id, worksheet, df):
+        self.tables.setdefault(spreadsheet_id, {})[worksheet] = df
+
+    def worksheet_titles(self, spreadsheet_id):
+        return list(self.tables.get(spreadsheet_id, {}))
+
+    def read(self, spreadsheet_id, worksheet, mirror=None, full=False, schema=None):
+        self.reads += 1
+        try:
+            return _typed(self.tables[spreadsheet_id][worksheet].copy(), schema)
+        except KeyError:
+            raise WorksheetNotFound(f"{spreadsheet_id}/{worksheet}") from None
+
+
+def source_from_env():
+    spec = os.environ.get("MURRAY_DATA_SOURCE", "gspread").strip()
+    kind, _, arg = spec.partition(":")
+    if kind == "gspread":
+        return GSpreadSource()
+    if kind == "local":
+        return LocalSource(arg or os.environ.get("MURRAY_LOCAL_DIR", "snapshots"))
+    if kind == "fake":
+        return FakeSource()
+    raise ValueError(f"알 수 없는 MURRAY_DATA_SOURCE: {spec}")
+
+
+_source = None
+
+
+def get_data_source():
+    global _source
+    if _source is None:
+        _source = source_from_env()
+    return _source
+
+
+def set_data_source(source):
+    """백엔드 교체 (벤치마크·테스트용). 캐시 키에 백엔드 이름이 들어가므로 섞이지 않는다."""
+    global _source
+    _source = source
+
+
+# ---------- 페이지용 캐시 경유 로더 ----------
+
+def load_worksheet(spreadsheet_id, worksheet, ttl=DEFAULT_TTL, force=False, mirror=None, schema=None):
+    """워크시트 스냅샷. 캐시가 비어 있으면 먼저 로컬에 남은 데이터(미러 등)를 내보내고 갱신한다."""
+    source = get_data_source()
+    key = (source.name, spreadsheet_id, worksheet)
+    if not has_snapshot(key):
+        local = source.local_frame(spreadsheet_id, worksheet, mirror=mirror, schema=schema)
+        if local is not None:
+            prime_sheet(key, local)
+    return load_sheet(
+        key, lambda: source.read(spreadsheet_id, worksheet, mirror=mirror, full=force, schema=schema), ttl=ttl, force=force,
+    )
+
+
+def load_worksheets(spreadsheet_id, worksheets, ttl=DEFAULT_TTL, force=False, schema=None):
+    """여러 워크시트 스냅샷 목록. 캐시에 없는 것들은 read_many 한 번으로 받아 온다."""
+    source = get_data_source()
+
+    def fetch_many(keys):
+        fetched = source.read_many(spreadsheet_id, [name for _, _, name in keys], schema=schema)
+        return {(source.name, spreadsheet_id, name): frame for name, frame in fetched.items()}
+
+    keys = [(source.name, spreadsheet_id, name) for name in worksheets]
+    return load_sheets(keys, fetch_many, ttl=ttl, force=force)
+
+
+def load_worksheet_titles(spreadsheet_id, ttl=DEFAULT_TTL, force=False):
+    source = get_data_source()
+    key = (source.name, spreadsheet_id, "__worksheets__")
+    return load_sheet(key, lambda: source.worksheet_titles(spreadsheet_id), ttl=ttl, force=force)
+
+
+def refresh_worksheet(spreadsheet_id, worksheet, mirror=None, warm=None, schema=None):
+    """예약 갱신: load_worksheet 와 같은 캐시 항목을 다시 받아 warm 으로 파생 데이터까지 만든 뒤 교체한다."""
+    source = get_data_source()
+    key = (source.name, spreadsheet_id, worksheet)
+    return refresh_sheet(key, lambda: source.read(spreadsheet_id, worksheet, mirror=mirror, schema=schema), warm=warm)
+
+
+def refresh_worksheet_titles(spreadsheet_id):
+    source = get_data_source()
+    key = (source.name, spreadsheet_id, "__worksheets__")
+    return refresh_sheet(key, lambda: source.worksheet_titles(spreadsheet_id))
+
+
+def snapshot_to_local(directory, spreadsheet_ids, source=None):
+    """현재 백엔드의 시트들을 로컬 parquet 스냅샷으로 저장한다."""
+    source = source or get_data_source()
+    for spreadsheet_id in spreadsheet_ids:
+        folder = Path(directory) / spreadsheet_id
+        folder.mkdir(parents=True, exist_ok=True)
+        for title in source.worksheet_titles(spreadsheet_id):
+            df = source.read(spreadsheet_id, title)
+            df.columns = [str(c) for c in df.columns]
+            # 빈 값은 시트처럼 "" 로 (astype(str) 만 하면 "nan"·"None" 글자가 된다)
+            df.astype(object).fillna("").astype(str).to_parquet(folder / f"{_file_stem(title)}.parquet", index=False)
+            print(f"✅ {spreadsheet_id}/{title}: {len(df)}행")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4 or sys.argv[1] != "snapshot":
+        print("사용법: python -m core.datasource snapshot <폴더> <스프레드시트 ID> ...", file=sys.stderr)
+        sys.exit(2)
+    from core import returns
+    from core.google_api import use_credential
+
+    # 앱과 같은 계정으로 받는다 (반품 시트만 따로)
+    use_credential(returns.SPREADSHEET_ID, returns.CREDENTIAL)
+    snapshot_to_local(sys.argv[2], sys.argv[3:])
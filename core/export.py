@@ -0,0 +1,85 @@
+# ⬇️ 표 내보내기 (CSV / xlsx / Parquet)
+#
+# 다운로드 파일은 다운로드 버튼을 누를 때만 만들고 (st.download_button 에 data 대신 함수를 넘긴다),
+# (데이터 버전, 필터 상태, 형식) 별로 캐시한다. 세 형식 모두 CHUNK_ROWS 행씩 나눠 쓰지만 파일 전체는
+# 메모리(BytesIO)에 모인다 — 브라우저로 조금씩 흘려 보내는 것은 아니다.
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.cache import LRUCache
+from core.views import RowView
+from core.xlsx_stream import write_xlsx
+
+CHUNK_ROWS = 50_000
+
+# 표시 이름 → (확장자, MIME)
+EXPORT_FORMATS = {
+    "Excel (xlsx)": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+_exports = LRUCache(256 * 1024 * 1024, max_entries=16)
+
+
+def write_csv(df, target):
+    """엑셀에서 한글이 깨지지 않도록 맨 앞에만 BOM 을 붙인다 (utf-8-sig)."""
+    for start in range(0, max(len(df), 1), CHUNK_ROWS):
+        chunk = df.iloc[start:start + CHUNK_ROWS]
+        target.write(chunk.to_csv(index=False, header=start == 0).encode("utf-8-sig" if start == 0 else "utf-8"))
+
+
+def _excel_frame(df):
+    """시각이 모두 자정인 날짜 열은 date 값으로 (xlsx_stream 이 yyyy-mm-dd 서식의 날짜 셀로 쓴다)."""
+    dates = {}
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values.dtype) and (values.dropna().dt.normalize() == values.dropna()).all():
+            dates[col] = values.dt.date.astype(object).where(values.notna(), None)
+    return df.assign(**dates) if dates else df
+
+
+def write_excel(df, target, sheet_name="Sheet1"):
+    write_xlsx(target, {sheet_name: (_excel_frame(df), {})})
+
+
+def _arrow_frame(df):
+    """숫자·문자가 섞인 object 열은 문자열 열로 (Parquet 은 열마다 한 타입)."""
+    mixed = {
+        col: df[col].astype(str)
+        for col in df.columns
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty")
+    }
+    return df.assign(**mixed) if mixed else df
+
+
+def write_parquet(df, target):
+    df = _arrow_frame(df).rename(columns=str)
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(target, schema) as writer:
+        for start in range(0, max(len(df), 1), CHUNK_ROWS):
+            chunk = df.iloc[start:start + CHUNK_ROWS]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export_bytes(df, export_format, sheet_name="Sheet1"):
+    """df 는 DataFrame 또는 RowView (RowView 는 여기서 처음 행들을 꺼낸다)."""
+    if isinstance(df, RowView):
+        df = df.to_frame()
+    extension, _ = EXPORT_FORMATS[export_format]
+    target = io.BytesIO()
+    if extension == "csv":
+        write_csv(df, target)
+    elif extension == "xlsx":
+        write_excel(df, target, sheet_name)
+    else:
+        write_parquet(df, target)
+    return target.getvalue()
+
+
+def export_cached(key, df, export_format, sheet_name="Sheet1"):
+    """key = (데이터 버전, 필터 상태, 형식). 같은 key 면 만들어 둔 파일 바이트를 그대로 준다 (df 도 꺼내지 않음)."""
+    return _exports.get_or_compute(key, lambda: export_bytes(df, export_format, sheet_name))
@@ -0,0 +1,25 @@
+# 📈 Plotly 차트 캐시
+#
+# 차트 입력은 (데이터 버전, 필터 상태, 차트 id) 로 정해지므로, 세 값이 같으면 px 로 다시
+# 집계·생성하지 않고 만들어 둔 Figure 를 그대로 st.plotly_chart 에 넘긴다.
+# 필터 상태는 CubeView.state() (걸러진 큐브 칸 마스크의 해시) 처럼 정규화된 값을 쓴다.
+# 크기는 Figure 의 트레이스 데이터로 재므로 (core.cache.sizeof) 바이트 한도와 개수 한도가 같이 걸린다.
+#
+# 한계: 아끼는 것은 집계와 px 호출뿐이다. st.plotly_chart 는 받은 Figure 를 매번 to_dict → JSON 으로
+# 다시 직렬화하고, 미리 만든 spec 을 넘길 공개 API 가 없다 (dict·JSON 을 넘기면 오히려 go.Figure 로 다시
+# 검증해서 더 느리다). 그래서 Figure 객체를 그대로 넘긴다. 40개 트레이스 막대 차트 기준 직렬화 약 10ms,
+# 다시 만들기 약 140ms.
+from core.cache import LRUCache
+
+MAX_FIGURES = 256
+
+_figures = LRUCache(512 * 1024 * 1024, max_entries=MAX_FIGURES)
+
+
+def figure_cached(data_key, chart_id, build):
+    """data_key = (데이터 버전, 필터 상태). 처음 보는 조합일 때만 build() 로 Figure 를 만든다 (수정 금지)."""
+    return _figures.get_or_compute((data_key, chart_id), build)
+
+
+def clear_figures():
+    _figures.clear()
@@ -0,0 +1,158 @@
+# 🔑 구글 API 클라이언트 (프로세스 공용)
+#
+# 서비스 계정 JSON 파싱·자격 증명·HTTP 세션·gspread 클라이언트를 계정마다 프로세스에서 한 번만
+# 만들고 모든 페이지·세션이 같이 쓴다. 토큰은 만료 TOKEN_REFRESH_MARGIN 초 전에 한 번만(락) 갱신하고,
+# HTTP 연결은 keep-alive 풀(POOL_SIZE)로 재사용한다.
+#
+# 계정은 스프레드시트마다 정한다. 예전 페이지들이 서로 다른 환경변수(gcp_service_account /
+# GOOGLE_CREDS)를 읽었으므로, use_credential 로 등록한 스프레드시트는 그 환경변수의 계정으로,
+# 나머지는 DEFAULT_CREDENTIAL (환경변수, 없으면 st.secrets["gcp_service_account"]) 로 연다.
+# 두 환경변수가 같은 키를 가리키면 클라이언트 하나를 같이 쓴다.
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+DEFAULT_CREDENTIAL = "gcp_service_account"
+
+TOKEN_REFRESH_MARGIN = 300
+POOL_SIZE = 16
+HTTP_RETRIES = 3
+
+_lock = threading.RLock()
+_credential_for = {}    # 스프레드시트 ID → 환경변수 이름
+_infos = {}             # 환경변수 이름 → 서비스 계정 JSON
+_accounts = {}          # (client_email, private_key_id) → _Account
+_token_request = None
+_spreadsheets = {}
+
+
+class _Account:
+    """서비스 계정 하나의 자격 증명과 gspread 클라이언트."""
+
+    __slots__ = ("info", "credentials", "client")
+
+    def __init__(self, info):
+        self.info = info
+        self.credentials = None
+        self.client = None
+
+
+def use_credential(spreadsheet_id, env_var):
+    """spreadsheet_id 는 env_var 환경변수의 서비스 계정으로 연다.
+
+    env_var 가 설정돼 있지 않으면 기본 계정으로 연다.
+    """
+    with _lock:
+        if _credential_for.get(spreadsheet_id, env_var) != env_var:
+            raise ValueError(f"{spreadsheet_id} 는 이미 {_credential_for[spreadsheet_id]} 계정으로 등록됨")
+        _credential_for[spreadsheet_id] = env_var
+
+
+def credential_for(spreadsheet_id):
+    """스프레드시트를 열 때 실제로 읽는 자격 증명 이름."""
+    env_var = _credential_for.get(spreadsheet_id, DEFAULT_CREDENTIAL)
+    return env_var if env_var in os.environ else DEFAULT_CREDENTIAL
+
+
+def load_service_account_info(env_var=DEFAULT_CREDENTIAL):
+    """서비스 계정 JSON. 환경변수 → (기본 계정만) st.secrets 순. 이름마다 한 번만 읽는다."""
+    with _lock:
+        info = _infos.get(env_var)
+        if info is None:
+            if env_var in os.environ:
+                info = json.loads(os.environ[env_var])
+            elif env_var == DEFAULT_CREDENTIAL:
+                import streamlit as st
+                info = dict(st.secrets[DEFAULT_CREDENTIAL])
+            else:
+                raise KeyError(f"서비스 계정 환경변수 {env_var} 가 없습니다")
+            _infos[env_var] = info
+        return info
+
+
+def _account(env_var):
+    info = load_service_account_info(env_var)
+    key = (info.get("client_email"), info.get("private_key_id"))
+    with _lock:
+        account = _accounts.get(key)
+        if account is None:
+            account = _accounts[key] = _Account(info)
+        return account
+
+
+def _expires_soon(credentials):
+    if not credentials.token or credentials.expiry is None:
+        return True
+    # google-auth 의 expiry 는 UTC naive datetime
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return credentials.expiry - now < timedelta(seconds=TOKEN_REFRESH_MARGIN)
+
+
+def _refreshed(account):
+    global _token_request
+    with _lock:
+        if account.credentials is None:
+            from google.oauth2.service_account import Credentials
+            account.credentials = Credentials.from_service_account_info(account.info, scopes=SCOPES)
+        if _expires_soon(account.credentials):
+            if _token_request is None:
+                from google.auth.transport.requests import Request
+                _token_request = Request()
+            account.credentials.refresh(_token_request)
+        return account.credentials
+
+
+def get_credentials(env_var=DEFAULT_CREDENTIAL):
+    """서비스 계정 자격 증명. 토큰이 곧 만료되면 여기서 한 번만 갱신한다."""
+    return _refreshed(_account(env_var))
+
+
+def _pooled_session(credentials):
+    import requests
+    from google.auth.transport.requests import AuthorizedSession
+
+    session = AuthorizedSession(credentials)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=HTTP_RETRIES)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_client(env_var=DEFAULT_CREDENTIAL):
+    """계정별 프로세스 공용 gspread 클라이언트 (요청 전에 토큰 만료 여유를 확인)."""
+    account = _account(env_var)
+    credentials = _refreshed(account)
+    with _lock:
+        if account.client is None:
+            import gspread
+            account.client = gspread.Client(auth=None, session=_pooled_session(credentials))
+        return account.client
+
+
+def open_spreadsheet(spreadsheet_id):
+    """스프레드시트 핸들 (open_by_key 의 메타데이터 요청은 ID 마다 한 번만).
+
+    워크시트 목록·행 수는 매번 worksheet()/worksheets() 로 새로 받으므로 핸들을 재사용해도 된다.
+    """
+    client = get_client(credential_for(spreadsheet_id))
+    with _lock:
+        spreadsheet = _spreadsheets.get(spreadsheet_id)
+    if spreadsheet is None:
+        spreadsheet = client.open_by_key(spreadsheet_id)
+        with _lock:
+            spreadsheet = _spreadsheets.setdefault(spreadsheet_id, spreadsheet)
+    return spreadsheet
+
+
+def reset():
+    """자격 증명·클라이언트를 버린다 (키 교체 등). 다음 요청에서 새로 만든다. 등록한 계정 지정은 남긴다."""
+    global _token_request
+    with _lock:
+        for account in _accounts.values():
+            if account.client is not None:
+                account.client.http_client.session.close()
+        _infos.clear()
+        _accounts.clear()
+        _token_request = None
+        _spreadsheets.clear()
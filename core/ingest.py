@@ -0,0 +1,75 @@
+# 📥 업로드 엑셀 읽기 (내용 해시 기반 캐시)
+#
+# 같은 파일이 다시 들어오면(위젯 클릭으로 인한 재실행 포함) 파싱하지 않고
+# 캐시된 DataFrame 을 돌려준다. 형식은 확장자가 아니라 파일 시그니처로 고른다.
+import hashlib
+import io
+
+import pandas as pd
+
+from core.cache import LRUCache
+
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+XLSX_MAGIC = b"PK\x03\x04"
+XLS_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_frames = LRUCache(MAX_CACHE_BYTES)
+
+try:
+    import python_calamine  # noqa: F401  # Rust 기반 리더 (있으면 xls/xlsx 모두 사용)
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+
+def content_hash(data):
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def detect_format(data):
+    """'xlsx' / 'xls' / 'html' (은행 엑셀 다운로드 중 HTML 표로 된 .xls)."""
+    if data.startswith(XLSX_MAGIC):
+        return "xlsx"
+    if data.startswith(XLS_MAGIC):
+        return "xls"
+    head = data[:1024].lstrip().lower()
+    if head.startswith((b"<html", b"<!doctype", b"<table", b"<meta")):
+        return "html"
+    return "xlsx"
+
+
+def parse_excel(data):
+    """bytes → DataFrame. 형식마다 가장 빠른 리더를 쓴다."""
+    fmt = detect_format(data)
+    if fmt == "html":
+        return pd.read_html(io.BytesIO(data))[0]
+    if HAS_CALAMINE:
+        return pd.read_excel(io.BytesIO(data), engine="calamine")
+    if fmt == "xls":
+        return pd.read_excel(io.BytesIO(data), engine="xlrd")
+    # pandas 의 openpyxl 리더는 read_only 모드로 행을 스트리밍한다
+    return pd.read_excel(io.BytesIO(data), engine="openpyxl")
+
+
+def read_excel_cached(data):
+    """(DataFrame, 내용 해시). 반환된 DataFrame 은 얕은 복사본이라 열을 바꿔도 캐시는 그대로다."""
+    key = content_hash(data)
+    df = _frames.get_or_compute(key, lambda: parse_excel(data))
+    return df.copy(deep=False), key
+
+
+def read_upload(uploaded_file):
+    """Streamlit UploadedFile(또는 파일 객체/경로) → (DataFrame, 내용 해시)."""
+    if hasattr(uploaded_file, "getvalue"):
+        data = uploaded_file.getvalue()
+    elif hasattr(uploaded_file, "read"):
+        data = uploaded_file.read()
+    else:
+        with open(uploaded_file, "rb") as f:
+            data = f.read()
+    return read_excel_cached(data)
+
+
+def clear_cache():
+    _frames.clear()
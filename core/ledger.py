@@ -0,0 +1,262 @@
+# 📒 정산 누적 원장 (SQLite)
+#
+# 업로드마다 처음부터 다시 맞추지 않고, 아직 끝나지 않은(open) 항목만 새 업로드와 함께 맞춘다.
+#   - 주문/입금 행은 식별 열(주문번호 / 거래일시+잔액) 값 + "같은 값의 몇 번째 행인지" 로 식별한다.
+#     누적 엑셀을 다시 올려도, 금액·이름이 나중에 고쳐졌어도 이미 원장에 있는 행은 건너뛴다.
+#     식별 열이 없는 파일은 행 전체 내용으로 식별하므로, 고친 행은 새 행으로 들어간다 (LedgerRun 에 표시).
+#   - 금액이 딱 맞은 묶음(차이 0)은 matched 로 닫는다. 더/덜 입금된 묶음, 짝 없는 주문·입금
+#     (B2B 이외 시트)은 open 으로 남아 다음 업로드에서 새 행과 합쳐 다시 맞춘다.
+# 매칭 대상은 open 항목뿐이므로 실행 시간은 전체 이력이 아니라 새 데이터 + 미결 항목 크기를 따른다.
+#
+# MURRAY_LEDGER : 원장 파일 경로 (기본 <저장소>/.ledger/reconcile.sqlite)
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from core.cache import LRUCache
+from core.reconcile import deposit_rows, group_deposits, group_orders, match_all, order_rows, split_sheets
+
+LEDGER_PATH = Path(os.environ.get("MURRAY_LEDGER", Path(__file__).resolve().parent.parent / ".ledger" / "reconcile.sqlite"))
+
+OPEN = "open"
+MATCHED = "matched"
+CLOSED = "closed"  # 수동 마감
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+# (원장 경로, 주문 해시, 입금 해시, 허용 오차) → 정산 결과. 원장의 마지막 실행이 그 결과를 만든 실행일 때만
+# 다시 쓴다 (그 사이 다른 업로드·수동 마감이 있었으면 open 항목이 바뀌었으므로 다시 맞춘다).
+_results = LRUCache(256 * 1024 * 1024, max_entries=32)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    label TEXT
+);
+CREATE TABLE IF NOT EXISTS orders (
+    id INTEGER PRIMARY KEY,
+    fingerprint INTEGER NOT NULL UNIQUE,
+    key TEXT NOT NULL,
+    orderer TEXT,
+    payer TEXT,
+    amount NUMERIC NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    status TEXT NOT NULL DEFAULT 'open',
+    closed_run_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS orders_status_key ON orders(status, key);
+CREATE TABLE IF NOT EXISTS deposits (
+    id INTEGER PRIMARY KEY,
+    fingerprint INTEGER NOT NULL UNIQUE,
+    key TEXT NOT NULL,
+    depositor TEXT,
+    amount NUMERIC NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    status TEXT NOT NULL DEFAULT 'open',
+    closed_run_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS deposits_status_key ON deposits(status, key);
+"""
+
+
+# 행 식별 열: 묶음마다 키워드 중 하나가 들어간 열이 있어야 하고, 모든 묶음이 있을 때만 쓴다
+ORDER_ID_COLUMNS = (("주문번호", "주문 번호"),)
+DEPOSIT_ID_COLUMNS = (("거래일시", "거래일자", "일시"), ("잔액",))
+
+
+def id_columns(columns, keyword_groups):
+    """keyword_groups 의 묶음마다 처음 맞는 열 이름 목록. 하나라도 없으면 빈 목록."""
+    found = []
+    for keywords in keyword_groups:
+        match = next((col for col in columns if any(k in str(col) for k in keywords)), None)
+        if match is None:
+            return []
+        found.append(match)
+    return found
+
+
+def row_fingerprints(df, columns=None):
+    """원본 행마다 64비트 식별값: columns (없으면 행 전체) 값의 해시 + 같은 값이 파일 안에서 몇 번째인지.
+
+    주문번호 하나에 상품 행이 여러 개인 파일도 행마다 따로 기록되고, 누적 파일을 다시 올리면 같은 값이 나온다.
+    """
+    content = pd.util.hash_pandas_object((df[columns] if columns else df).astype(str), index=False)
+    occurrence = content.groupby(content.to_numpy(), sort=False).cumcount()
+    combined = pd.DataFrame({"content": content.to_numpy(), "occurrence": occurrence.to_numpy()})
+    return pd.util.hash_pandas_object(combined, index=False).to_numpy().view(np.int64)
+
+
+def _nullable(series):
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+class LedgerRun:
+    """원장 정산 한 번의 요약 (행 수)."""
+
+    __slots__ = (
+        "run_id", "order_id_columns", "deposit_id_columns",
+        "new_orders", "new_deposits", "skipped_orders", "skipped_deposits",
+        "carried_orders", "carried_deposits", "matched_orders", "matched_deposits",
+    )
+
+    def __init__(self, run_id, order_id_columns=(), deposit_id_columns=(), **counts):
+        self.run_id = run_id
+        self.order_id_columns = list(order_id_columns)
+        self.deposit_id_columns = list(deposit_id_columns)
+        for name in self.__slots__[3:]:
+            setattr(self, name, counts.get(name, 0))
+
+
+class Ledger:
+    """SQLite 파일 하나. 여러 세션이 같이 써도 되도록 정산 한 번을 한 트랜잭션으로 처리한다."""
+
+    def __init__(self, path=LEDGER_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @contextmanager
+    def _transaction(self):
+        """잠금 + 연결 하나 + 트랜잭션 (예외면 롤백), 끝나면 연결을 닫는다."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            try:
+                if not self._ready:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._ready = True
+                with conn:
+                    yield conn
+            finally:
+                conn.close()
+
+    def reconcile(self, order_df, deposit_df, label=None, amount_tolerance=None):
+        """새 업로드를 원장에 기록하고 open 항목 전체를 맞춘다 → (정산표, 시트별 DataFrame, 읽기 결과, LedgerRun).
+
+        정산표는 이번 실행 시점의 open 항목 기준이다 (이번에 차이 0 으로 닫힌 묶음도 포함).
+        amount_tolerance 는 core.reconcile.reconcile 과 같다 (금액으로 맞은 묶음도 차이 0 이면 닫힌다).
+        """
+        reports = {}
+        orders = order_rows(order_df, reports)
+        deposits = deposit_rows(deposit_df, reports)
+        order_ids = id_columns(order_df.columns, ORDER_ID_COLUMNS)
+        deposit_ids = id_columns(deposit_df.columns, DEPOSIT_ID_COLUMNS)
+        order_fp, deposit_fp = row_fingerprints(order_df, order_ids), row_fingerprints(deposit_df, deposit_ids)
+
+        with self._transaction() as conn:
+            run_id = conn.execute("INSERT INTO runs (created_at, label) VALUES (?, ?)", (time.time(), label)).lastrowid
+
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO orders (fingerprint, key, orderer, payer, amount, run_id) VALUES (?, ?, ?, ?, ?, ?)",
+                zip(order_fp.tolist(), orders["입금자키"].tolist(), _nullable(orders["주문자"]),
+                    _nullable(orders["입금자(사이트)"]), orders["총 구매금액"].tolist(), repeat(run_id)),
+            )
+            new_orders = conn.total_changes - before
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO deposits (fingerprint, key, depositor, amount, run_id) VALUES (?, ?, ?, ?, ?)",
+                zip(deposit_fp.tolist(), deposits["입금자키"].tolist(), _nullable(deposits["입금자(실제)"]),
+                    deposits["통장입금"].tolist(), repeat(run_id)),
+            )
+            new_deposits = conn.total_changes - before
+
+            open_orders = pd.read_sql_query(
+                'SELECT key AS "입금자키", orderer AS "주문자", payer AS "입금자(사이트)", amount AS "총 구매금액", run_id'
+                " FROM orders WHERE status = ? ORDER BY id", conn, params=(OPEN,),
+            )
+            open_deposits = pd.read_sql_query(
+                'SELECT key AS "입금자키", depositor AS "입금자(실제)", amount AS "통장입금", run_id'
+                " FROM deposits WHERE status = ? ORDER BY id", conn, params=(OPEN,),
+            )
+
+            order_grouped, deposit_grouped = group_orders(open_orders), group_deposits(open_deposits)
+            match_idx, result_df = match_all(order_grouped, deposit_grouped, amount_tolerance)
+
+            # 차이 0 으로 맞은 묶음만 닫는다
+            hit = match_idx >= 0
+            settled = hit.copy()
+            settled[hit] = (
+                order_grouped["총 구매금액"].to_numpy()[hit] == deposit_grouped["통장입금"].to_numpy()[match_idx[hit]]
+            )
+            order_keys = order_grouped["입금자키"].to_numpy()[settled].tolist()
+            deposit_keys = deposit_grouped["입금자키"].to_numpy()[match_idx[settled]].tolist()
+            matched_orders = self._close(conn, "orders", order_keys, MATCHED, run_id)
+            matched_deposits = self._close(conn, "deposits", deposit_keys, MATCHED, run_id)
+
+        summary = LedgerRun(
+            run_id, order_id_columns=order_ids, deposit_id_columns=deposit_ids,
+            new_orders=new_orders, new_deposits=new_deposits,
+            skipped_orders=len(orders) - new_orders, skipped_deposits=len(deposits) - new_deposits,
+            carried_orders=int((open_orders["run_id"] < run_id).sum()),
+            carried_deposits=int((open_deposits["run_id"] < run_id).sum()),
+            matched_orders=matched_orders, matched_deposits=matched_deposits,
+        )
+        return result_df, split_sheets(result_df), reports, summary
+
+    @staticmethod
+    def _close(conn, table, keys, status, run_id):
+        before = conn.total_changes
+        conn.executemany(
+            f"UPDATE {table} SET status = ?, closed_run_id = ? WHERE status = ? AND key = ?",
+            ((status, run_id, OPEN, key) for key in keys),
+        )
+        return conn.total_changes - before
+
+    def open_items(self):
+        """입금자키별 미결 (주문 묶음, 입금 묶음) DataFrame."""
+        with self._transaction() as conn:
+            orders = pd.read_sql_query(
+                'SELECT key AS "입금자키", MIN(orderer) AS "주문자", SUM(amount) AS "총 구매금액", COUNT(*) AS "건수",'
+                ' MIN(run_id) AS "첫 기록" FROM orders WHERE status = ? GROUP BY key ORDER BY MIN(id)', conn, params=(OPEN,),
+            )
+            deposits = pd.read_sql_query(
+                'SELECT key AS "입금자키", MIN(depositor) AS "입금자(실제)", SUM(amount) AS "통장입금", COUNT(*) AS "건수",'
+                ' MIN(run_id) AS "첫 기록" FROM deposits WHERE status = ? GROUP BY key ORDER BY MIN(id)', conn, params=(OPEN,),
+            )
+        return orders, deposits
+
+    def close(self, order_keys=(), deposit_keys=()):
+        """손으로 정리한 미결 항목을 마감한다 → (마감된 주문 행 수, 입금 행 수)."""
+        with self._transaction() as conn:
+            run_id = conn.execute("INSERT INTO runs (created_at, label) VALUES (?, ?)", (time.time(), "수동 마감")).lastrowid
+            return (
+                self._close(conn, "orders", order_keys, CLOSED, run_id),
+                self._close(conn, "deposits", deposit_keys, CLOSED, run_id),
+            )
+
+    def last_run_id(self):
+        """가장 최근 실행(정산·수동 마감) 번호. 원장에 아무것도 없으면 None."""
+        with self._transaction() as conn:
+            return conn.execute("SELECT MAX(id) FROM runs").fetchone()[0]
+
+
+def get_ledger(path=LEDGER_PATH):
+    """경로마다 하나의 Ledger (같은 프로세스 안의 동시 정산을 직렬화)."""
+    path = Path(path).resolve()
+    with _ledgers_lock:
+        if path not in _ledgers:
+            _ledgers[path] = Ledger(path)
+        return _ledgers[path]
+
+
+def ledger_reconcile_cached(cache_key, order_df, deposit_df, path=LEDGER_PATH, amount_tolerance=None):
+    """Streamlit 재실행마다 원장을 다시 맞추지 않도록 업로드 쌍(cache_key)별로 한 번만 정산한다.
+
+    그 뒤에 원장이 바뀌었으면 (다른 업로드 정산·수동 마감, 다른 프로세스 포함) 다시 정산한다.
+    """
+    ledger = get_ledger(path)
+    key = (str(ledger.path), cache_key, amount_tolerance)
+    cached = _results.get(key)
+    if cached is not None and cached[3].run_id == ledger.last_run_id():
+        return cached
+    return _results.put(key, ledger.reconcile(order_df, deposit_df, amount_tolerance=amount_tolerance))
@@ -0,0 +1,200 @@
+# 🔎 입금자키 부분 문자열 매칭 엔진
+#
+# 기존 페이지의 이중 iterrows 루프와 결과가 완전히 같아야 한다:
+#   - 주문 키를 순서대로 처리하고
+#   - 입금 키 목록에서 (site_key in deposit_key or deposit_key in site_key) 를
+#     만족하는 "아직 쓰이지 않은" 첫 번째 입금 키를 배정한다.
+# 두 방향을 각각 인덱스로 찾은 뒤 더 앞선 위치를 고르면 같은 결과가 나온다.
+# 같은 입금 키가 여러 번 나오면 행마다 따로 한 번씩 배정한다 (예전 루프는 키 단위로 "사용" 을 기록해
+# 두 번째 행부터는 배정하지 않았다. match_all 은 입금자키로 묶은 뒤 부르므로 키가 겹치지 않는다).
+#
+# 이름으로 짝이 없는 주문·입금은 match_amounts 로 금액만 보고 한 번 더 맞출 수 있다.
+import heapq
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+GRAM_SIZE = 2
+
+
+def _build_gram_index(keys, n):
+    index = defaultdict(list)
+    for i, key in enumerate(keys):
+        seen = set()
+        for j in range(len(key) - n + 1):
+            gram = key[j:j + n]
+            if gram not in seen:
+                seen.add(gram)
+                index[gram].append(i)
+    return index
+
+
+class DepositMatcher:
+    """입금 키 목록 위의 n-gram 인덱스. 배정된 키는 다시 쓰지 않는다."""
+
+    def __init__(self, deposit_keys, gram_size=GRAM_SIZE):
+        self.keys = [str(k) for k in deposit_keys]
+        self.gram_size = gram_size
+        self.used = [False] * len(self.keys)
+        # 키 → 그 키인 입금 위치 목록 (오름차순)과 앞쪽 사용된 항목을 건너뛸 커서
+        self.position = defaultdict(list)
+        for i, key in enumerate(self.keys):
+            self.position[key].append(i)
+        self.position = dict(self.position)
+        self.position_cursor = dict.fromkeys(self.position, 0)
+        self.max_len = max((len(k) for k in self.keys), default=0)
+        self.char_index = _build_gram_index(self.keys, 1)
+        self.gram_index = _build_gram_index(self.keys, gram_size) if gram_size > 1 else self.char_index
+        # 포스팅 리스트 앞쪽의 이미 쓰인 항목은 영원히 건너뛰어도 된다
+        self.cursor = defaultdict(int)
+        self.free_cursor = 0
+
+    def _first_free(self):
+        while self.free_cursor < len(self.used) and self.used[self.free_cursor]:
+            self.free_cursor += 1
+        return self.free_cursor if self.free_cursor < len(self.used) else -1
+
+    def _first_container(self, site_key, limit):
+        """site_key 를 포함하는 미사용 입금 키 중 가장 앞선 위치 (limit 미만)."""
+        if not site_key:
+            found = self._first_free()
+            return found if 0 <= found < limit else -1
+
+        index = self.gram_index if len(site_key) >= self.gram_size else self.char_index
+        n = self.gram_size if len(site_key) >= self.gram_size else 1
+        best_gram, best_list = None, None
+        for j in range(len(site_key) - n + 1):
+            gram = site_key[j:j + n]
+            postings = index.get(gram)
+            if postings is None:
+                return -1
+            if best_list is None or len(postings) < len(best_list):
+                best_gram, best_list = gram, postings
+
+        start = self.cursor[best_gram]
+        while start < len(best_list) and self.used[best_list[start]]:
+            start += 1
+        self.cursor[best_gram] = start
+
+        keys, used = self.keys, self.used
+        for pos in range(start, len(best_list)):
+            i = best_list[pos]
+            if i >= limit:
+                break
+            if not used[i] and site_key in keys[i]:
+                return i
+        return -1
+
+    def _first_unused(self, key):
+        """key 인 미사용 입금 중 가장 앞선 위치 (없으면 -1)."""
+        positions = self.position.get(key)
+        if positions is None:
+            return -1
+        cursor = self.position_cursor[key]
+        while cursor < len(positions) and self.used[positions[cursor]]:
+            cursor += 1
+        self.position_cursor[key] = cursor
+        return positions[cursor] if cursor < len(positions) else -1
+
+    def _first_contained(self, site_key):
+        """site_key 의 부분 문자열인 미사용 입금 키 중 가장 앞선 위치."""
+        best = self._first_unused("")
+        position = self.position
+        length = len(site_key)
+        for i in range(length):
+            for j in range(i + 1, min(length, i + self.max_len) + 1):
+                key = site_key[i:j]
+                if key in position:
+                    k = self._first_unused(key)
+                    if k >= 0 and (best < 0 or k < best):
+                        best = k
+        return best
+
+    def match(self, site_key):
+        """site_key 에 배정할 입금 키 위치를 돌려주고 사용 처리한다. 없으면 -1."""
+        site_key = str(site_key)
+        best = self._first_contained(site_key)
+        limit = best if best >= 0 else len(self.keys)
+        found = self._first_container(site_key, limit)
+        if found >= 0:
+            best = found
+        if best >= 0:
+            self.used[best] = True
+        return best
+
+
+def match_deposits(site_keys, deposit_keys, gram_size=GRAM_SIZE):
+    """각 주문 키에 배정된 입금 키의 위치 목록 (-1 은 미매칭)."""
+    matcher = DepositMatcher(deposit_keys, gram_size=gram_size)
+    return [matcher.match(key) for key in site_keys]
+
+
+def match_amounts(order_amounts, deposit_amounts, tolerance=0):
+    """금액이 같거나 차이가 tolerance 이하인 주문·입금을 1:1 로 짝짓는다 → 주문마다 입금 위치 (-1 은 미매칭).
+
+    1) 같은 금액끼리 먼저: 금액별로 k번째 주문 ↔ k번째 입금 (원래 순서대로)
+    2) 남은 것끼리 tolerance 안에서 차이가 가장 작은 짝부터: 남은 주문·입금 금액을 한 줄로 정렬하면
+       남은 것 중 가장 가까운 (주문, 입금) 짝은 항상 줄에서 이웃해 있다. 이웃한 주문·입금 짝을 차이 순 힙에
+       넣고 하나씩 꺼내 배정하고, 배정된 둘을 줄에서 빼면서 새로 이웃이 된 양옆만 힙에 넣는다.
+       (차이가 같으면 금액이 작은 쪽 먼저) 전체 O((주문 + 입금) log (주문 + 입금)).
+       직원이 보고 확인하는 제안이라 짝의 수보다 가까운 짝을 우선한다.
+    0 이하·빈 금액은 짝짓지 않는다.
+    """
+    order_amounts = np.asarray(order_amounts, dtype=np.float64)
+    deposit_amounts = np.asarray(deposit_amounts, dtype=np.float64)
+    result = np.full(len(order_amounts), -1, dtype=np.int64)
+    order_pos = np.flatnonzero(order_amounts > 0)
+    deposit_pos = np.flatnonzero(deposit_amounts > 0)
+    if not len(order_pos) or not len(deposit_pos):
+        return result
+
+    # 1) 같은 금액: (금액, 금액 안에서 몇 번째) 로 맞붙인다
+    orders = pd.DataFrame({"amount": order_amounts[order_pos], "order": order_pos})
+    deposits = pd.DataFrame({"amount": deposit_amounts[deposit_pos], "deposit": deposit_pos})
+    orders["rank"] = orders.groupby("amount", sort=False).cumcount()
+    deposits["rank"] = deposits.groupby("amount", sort=False).cumcount()
+    exact = orders.merge(deposits, on=["amount", "rank"])
+    result[exact["order"].to_numpy()] = exact["deposit"].to_numpy()
+    if tolerance <= 0:
+        return result
+
+    # 2) 허용 오차 안: 남은 주문·입금을 금액순 한 줄로 (같은 금액에는 주문·입금이 함께 남지 않는다)
+    order_pos = order_pos[result[order_pos] < 0]
+    used = np.zeros(len(deposit_amounts), dtype=bool)
+    used[exact["deposit"].to_numpy()] = True
+    deposit_pos = deposit_pos[~used[deposit_pos]]
+    if not len(order_pos) or not len(deposit_pos):
+        return result
+    amounts = np.concatenate([order_amounts[order_pos], deposit_amounts[deposit_pos]])
+    line = np.argsort(amounts, kind="stable")
+    amounts = amounts[line]
+    is_deposit = line >= len(order_pos)
+    source = np.concatenate([order_pos, deposit_pos])[line]
+
+    gaps = np.diff(amounts)
+    pairs = np.flatnonzero((is_deposit[:-1] != is_deposit[1:]) & (gaps <= tolerance))
+    heap = list(zip(gaps[pairs].tolist(), pairs.tolist(), (pairs + 1).tolist()))
+    heapq.heapify(heap)
+
+    n = len(amounts)
+    left, right = list(range(-1, n - 1)), list(range(1, n + 1))
+    alive = [True] * n
+    amounts, is_deposit, source = amounts.tolist(), is_deposit.tolist(), source.tolist()
+    while heap:
+        _, i, j = heapq.heappop(heap)
+        if not (alive[i] and alive[j]):  # 둘 다 살아 있으면 사이에 낀 것이 없으므로 아직 이웃이다
+            continue
+        order, deposit = (source[j], source[i]) if is_deposit[i] else (source[i], source[j])
+        result[order] = deposit
+        alive[i] = alive[j] = False
+        before, after = left[i], right[j]
+        if before >= 0:
+            right[before] = after
+        if after < n:
+            left[after] = before
+        if before >= 0 and after < n and is_deposit[before] != is_deposit[after]:
+            gap = amounts[after] - amounts[before]
+            if gap <= tolerance:
+                heapq.heappush(heap, (gap, before, after))
+    return result
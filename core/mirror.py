@@ -0,0 +1,231 @@
+# 🪞 구글 시트 → 로컬 Parquet 미러 (증분 동기화)
+#
+# 출하/리퍼 시트는 대부분 아래에 행이 추가되는 식으로 자라므로 매번 전체를 받지 않는다.
+#   1. 미러 이후의 새 행(tail)과 최근 블록 몇 개, 헤더 행, 그보다 앞쪽의 점검 블록을 batchGet 한 번으로 받는다
+#   2. 최근 블록은 블록별 체크섬으로 비교해 바뀐 블록만 교체한다 (상태 갱신 반영)
+#   3. 앞쪽 구간은 매번 두 가지를 체크섬으로 확인한다
+#      - 최근 구간 바로 위 블록 (앞쪽에서 행이 지워지거나 끼어들면 이 블록이 밀려서 바로 드러난다)
+#      - 돌아가며 고르는 블록들 (RECHECK_CYCLE 번의 동기화마다 앞쪽 전체를 한 바퀴 본다)
+#      하나라도 다르면 전체 동기화한다. 그래서 오래된 행을 고친 것도 RECHECK_CYCLE 번 안에 반영된다.
+#   4. 헤더가 바뀌었거나 최근 구간 행 수가 줄었거나 헤더보다 긴 행이 들어왔으면 전체 동기화
+#      (전체 동기화는 가장 긴 행에 맞춰 이름 없는 열을 늘린다. 칸을 잘라 버리지 않는다)
+# 원본 값(FORMATTED_VALUE 문자열)을 그대로 저장하고, 읽을 때 숫자 변환 + 시트 스키마(열 타입) 변환을 한 번 한다.
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from core.sheets import a1_sheet_range, numericise_frame
+
+MIRROR_DIR = Path(os.environ.get("MURRAY_MIRROR_DIR", Path(__file__).resolve().parent.parent / ".mirror"))
+
+BLOCK_ROWS = 500
+RECHECK_BLOCKS = 4
+RECHECK_CYCLE = 6
+
+log = logging.getLogger(__name__)
+
+
+def _block_hash(rows):
+    digest = hashlib.blake2b(digest_size=16)
+    for row in rows:
+        # 뒤쪽 빈 칸은 API 응답마다 생략될 수 있으므로 비교에서 뺀다
+        cells = list(row)
+        while cells and cells[-1] == "":
+            cells.pop()
+        digest.update("\x1f".join(cells).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def _block_hashes(rows):
+    return [_block_hash(rows[i:i + BLOCK_ROWS]) for i in range(0, len(rows), BLOCK_ROWS)]
+
+
+class SheetMirror:
+    """워크시트 하나의 로컬 미러. sync() 가 최신 DataFrame 을 돌려준다."""
+
+    def __init__(self, name, directory=MIRROR_DIR, schema=None):
+        self.name = name
+        self.schema = schema
+        self.directory = Path(directory)
+        self.data_path = self.directory / f"{name}.parquet"
+        self.manifest_path = self.directory / f"{name}.json"
+        self.header = None
+        self.rows = None            # 원본 문자열 행 목록 (헤더 제외)
+        self.hashes = []
+        self.syncs = 0
+        self.cursor = 0             # 다음에 점검할 앞쪽 블록
+        self._frame = None
+        self.last_fetched_rows = 0  # 마지막 sync 에서 받아 온 행 수 (진단용)
+
+    # ---------- 로컬 저장소 ----------
+
+    def _load_local(self):
+        if self.rows is not None or not self.manifest_path.exists() or not self.data_path.exists():
+            return
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            table = pd.read_parquet(self.data_path)
+        except Exception:
+            return
+        self.header = manifest["header"]
+        self.hashes = manifest["hashes"]
+        self.syncs = manifest.get("syncs", 0)
+        self.cursor = manifest.get("cursor", 0)
+        self.rows = table.to_numpy(dtype=object).tolist()
+
+    def _save_local(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        width = len(self.header)
+        table = pd.DataFrame(self.rows, columns=[f"c{i}" for i in range(width)], dtype=str)
+        tmp_data = self.data_path.with_suffix(".parquet.tmp")
+        table.to_parquet(tmp_data, index=False)
+        os.replace(tmp_data, self.data_path)
+
+        tmp_manifest = self.manifest_path.with_suffix(".json.tmp")
+        tmp_manifest.write_text(json.dumps({
+            "header": self.header,
+            "hashes": self.hashes,
+            "syncs": self.syncs,
+            "cursor": self.cursor,
+            "rows": len(self.rows),
+        }, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_manifest, self.manifest_path)
+
+    def _pad(self, rows):
+        """헤더 너비까지 뒤를 "" 로 채운다 (더 긴 행은 그대로 둔다. 자르지 않는다)."""
+        width = len(self.header)
+        return [list(row) + [""] * (width - len(row)) for row in rows]
+
+    # ---------- 동기화 ----------
+
+    def _full_sync(self, worksheet):
+        values = worksheet.get_all_values()
+        width = max((len(row) for row in values), default=0)
+        header = (list(values[0]) + [""] * (width - len(values[0]))) if values else []
+        if values and width > len(values[0]):
+            wide = sum(len(row) > len(values[0]) for row in values[1:])
+            log.warning("%s: 헤더(%d열)보다 긴 행 %d개 → 이름 없는 열 %d개로 받음",
+                        self.name, len(values[0]), wide, width - len(values[0]))
+        old_header, old_hashes, old_count = self.header, self.hashes, len(self.rows or [])
+        self.header = header
+        self.rows = self._pad(values[1:]) if values else []
+        self.hashes = _block_hashes(self.rows)
+        self.last_fetched_rows = len(values)
+        return (header, self.hashes, len(self.rows)) != (old_header, old_hashes, old_count)
+
+    def _checked_blocks(self, older):
+        """이번에 확인할 앞쪽 블록 번호 (최근 구간 바로 위 블록 + 돌아가며 고른 블록들)."""
+        if older == 0:
+            return []
+        count = -(-older // RECHECK_CYCLE)
+        start = self.cursor if self.cursor < older else 0
+        self.cursor = start + count if start + count < older else 0
+        return sorted({older - 1, *range(start, min(start + count, older))})
+
+    def _incremental_sync(self, worksheet):
+        known = len(self.rows)
+        older = max(0, len(self.hashes) - RECHECK_BLOCKS)
+        recheck_start = older * BLOCK_ROWS
+        checked = self._checked_blocks(older)
+        # 시트 행 번호: 1 = 헤더, 데이터 i 번째 행 = i + 2
+        first_row, tail_row = recheck_start + 2, known + 2
+        last_row = max(worksheet.row_count, tail_row)
+        sheet = a1_sheet_range(worksheet.title)
+        ranges = [f"{sheet}!1:1"]
+        ranges += [f"{sheet}!{b * BLOCK_ROWS + 2}:{(b + 1) * BLOCK_ROWS + 1}" for b in checked]
+        if tail_row > first_row:
+            ranges.append(f"{sheet}!{first_row}:{tail_row - 1}")
+        ranges.append(f"{sheet}!{tail_row}:{last_row}")
+
+        value_ranges = worksheet.spreadsheet.values_batch_get(ranges).get("valueRanges", [])
+        values = [vr.get("values", []) for vr in value_ranges]
+        if len(values) != len(ranges):
+            return self._full_sync(worksheet)
+        header, blocks, tail = values[0], values[1:1 + len(checked)], values[-1]
+        recent = values[1 + len(checked)] if tail_row > first_row else []
+        self.last_fetched_rows = 1 + sum(map(len, blocks)) + len(recent) + len(tail)
+
+        header = header[0] if header else []
+        if self._pad([header])[0] != self.header:
+            return self._full_sync(worksheet)
+        width = len(self.header)
+        if any(len(row) > width for part in (*blocks, recent, tail) for row in part):
+            # 헤더보다 긴 행 → 열을 늘려야 하므로 전체 동기화
+            return self._full_sync(worksheet)
+        if any(_block_hash(self._pad(rows)) != self.hashes[b] for b, rows in zip(checked, blocks)):
+            # 앞쪽 행이 고쳐졌거나 지워졌거나 끼어듦 → 전체 동기화
+            return self._full_sync(worksheet)
+        if len(recent) < known - recheck_start:
+            # 최근 구간에서 행이 지워짐 → 행 위치가 어긋났으므로 전체 동기화
+            return self._full_sync(worksheet)
+
+        changed = False
+        recent = self._pad(recent)
+        for offset in range(0, len(recent), BLOCK_ROWS):
+            block = recent[offset:offset + BLOCK_ROWS]
+            index = (recheck_start + offset) // BLOCK_ROWS
+            block_hash = _block_hash(block)
+            if self.hashes[index] != block_hash:
+                self.rows[recheck_start + offset:recheck_start + offset + len(block)] = block
+                self.hashes[index] = block_hash
+                changed = True
+
+        if tail:
+            self.rows.extend(self._pad(tail))
+            # 마지막 블록이 덜 찼을 수 있으니 그 블록부터 다시 계산
+            start_block = known // BLOCK_ROWS
+            self.hashes[start_block:] = _block_hashes(self.rows[start_block * BLOCK_ROWS:])
+            changed = True
+        return changed
+
+    def sync(self, worksheet, full=False):
+        """워크시트와 미러를 맞추고 get_all_records() 와 같은 모양의 DataFrame 을 돌려준다."""
+        self._load_local()
+        self.syncs += 1
+        if full or self.rows is None:
+            changed = self._full_sync(worksheet)
+        else:
+            changed = self._incremental_sync(worksheet)
+
+        if changed or not self.data_path.exists():
+            self._save_local()
+            self._frame = None
+        if self._frame is None:
+            self._frame = self.frame()
+        return self._frame
+
+    def local_frame(self):
+        """네트워크 없이 디스크 미러만으로 만든 DataFrame (미러가 없으면 None)."""
+        self._load_local()
+        if self.rows is None:
+            return None
+        if self._frame is None:
+            self._frame = self.frame()
+        return self._frame
+
+    def frame(self):
+        """미러 내용 → DataFrame (빈 헤더 열은 get_all_records 처럼 이름이 "" 인 열, schema 가 있으면 타입 변환까지)."""
+        if not self.header:
+            return pd.DataFrame()
+        df = numericise_frame(pd.DataFrame(self.rows, columns=self.header, dtype=object))
+        return df if self.schema is None else self.schema.load(df)
+
+
+_mirrors = {}
+
+
+def get_mirror(name, schema=None):
+    """프로세스 안에서 이름마다 하나의 SheetMirror 를 재사용한다 (schema 가 바뀌면 만들어 둔 DataFrame 은 버림)."""
+    mirror = _mirrors.get(name)
+    if mirror is None:
+        mirror = _mirrors[name] = SheetMirror(name, schema=schema)
+    elif mirror.schema is not schema:
+        mirror.schema = schema
+        mirror._frame = None
+    return mirror
+
@@ -0,0 +1,112 @@
+# 🔢 금액·수량 문자열 → 숫자 (모든 페이지 공용)
+#
+# "12,000원", "₩ 1,500", "-3,000", "(3,000)", "△500", "1,000-" 같은 시트/엑셀 표기를 읽는다.
+# 열 전체를 Arrow 문자열 커널로 한 번에 처리한다 (백만 셀 기준 1초 이내).
+# 빈 칸은 blank, 읽지 못한 값은 unparsed 로 세어 화면에 알린다.
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# 괄호/부호 + 통화 기호 + 숫자(천 단위 쉼표 허용) + 단위 + 뒤 부호 (RE2 문법, 캡처 없음)
+_NUMBER_PATTERN = (
+    r"^\(?\s*[-+△▲]?\s*(?:KRW|[₩￦$])?\s*"
+    r"(?:\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?|\.\d+)"
+    r"\s*(?:원|KRW)?\s*-?\s*\)?$"
+)
+# 형식 검사를 통과한 값에서 숫자만 남기려고 지우는 표기
+_DECORATIONS = (",", "원", "KRW", "₩", "￦", "$", " ", "\t", "(", ")", "△", "▲", "+", "-")
+_NEGATIVE_FIRST = pa.array(["(", "-", "△", "▲"])
+_BLANK_TEXT = pa.array(["", "-"])
+SAMPLE_LIMIT = 5
+
+
+class NumericReport:
+    """한 열을 숫자로 읽은 결과 요약: 빈 칸 수, 읽지 못한 값 수, 읽지 못한 값 예시."""
+
+    __slots__ = ("blank", "unparsed", "samples")
+
+    def __init__(self, blank, unparsed, samples):
+        self.blank = blank
+        self.unparsed = unparsed
+        self.samples = samples
+
+
+def _data_bytes(array):
+    buffer = array.buffers()[2]
+    return buffer.to_pybytes() if buffer is not None else b""
+
+
+def _parse_text(text):
+    """문자열 배열 → (float 배열, 빈 칸 여부). 읽지 못한 값은 NaN.
+
+    셀마다 파이썬 정규식을 돌리지 않고 Arrow 문자열 커널(RE2, 리터럴 치환)로 열 전체를 한 번에 처리한다.
+    """
+    text = pc.utf8_trim_whitespace(text if isinstance(text, pa.Array) else pa.array(text, type=pa.string()))
+    blank = pc.is_in(text, value_set=_BLANK_TEXT)
+    first, last = pc.utf8_slice_codeunits(text, 0, 1), pc.utf8_slice_codeunits(text, -1)
+    valid = pc.and_(
+        pc.match_substring_regex(text, _NUMBER_PATTERN),
+        pc.equal(pc.equal(first, "("), pc.equal(last, ")")),
+    )
+    negative = pc.or_(pc.is_in(first, value_set=_NEGATIVE_FIRST), pc.ends_with(text, "-"))
+
+    # 열 전체 버퍼에 그 표기가 있을 때만 치환한다 (대부분 쉼표·"원" 정도만 실제로 돈다)
+    number = pc.if_else(valid, text, pa.scalar(None, pa.string()))
+    data = _data_bytes(number)
+    for token in _DECORATIONS:
+        if token.encode("utf-8") in data:
+            number = pc.replace_substring(number, token, "")
+            data = _data_bytes(number)
+    numbers = pc.cast(number, pa.float64()).to_numpy(zero_copy_only=False)
+    negative = pc.fill_null(negative, False).to_numpy(zero_copy_only=False)
+    return np.where(negative, -numbers, numbers), blank.to_numpy(zero_copy_only=False)
+
+
+def parse_numbers(values):
+    """금액/수량 열 → (float Series, NumericReport). 빈 칸·읽지 못한 값은 NaN."""
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        numbers = series.astype(np.float64)
+        return numbers, NumericReport(int(numbers.isna().sum()), 0, [])
+
+    cells = series.to_numpy(dtype=object)
+    numbers = np.full(len(cells), np.nan)
+    blank = np.zeros(len(cells), dtype=bool)
+    try:
+        # 문자열(+빈 칸)만 있는 열은 바로 Arrow 로 (가장 흔한 경우)
+        text = pa.array(cells, type=pa.string(), from_pandas=True)
+        is_text = ~pc.is_null(text).to_numpy(zero_copy_only=False)
+        numbers[is_text], blank[is_text] = _parse_text(text.filter(pa.array(is_text)))
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # 숫자·문자 섞인 열 (numericise_frame 결과 등)
+        is_text = np.fromiter((isinstance(v, str) for v in cells), dtype=bool, count=len(cells))
+        if is_text.any():
+            numbers[is_text], blank[is_text] = _parse_text(cells[is_text].tolist())
+        other = ~is_text
+        numbers[other] = pd.to_numeric(pd.Series(cells[other], dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+
+    blank |= pd.isna(cells)
+    failed = np.isnan(numbers) & ~blank
+    samples = list(dict.fromkeys(str(v) for v in cells[failed][:SAMPLE_LIMIT * 20]))[:SAMPLE_LIMIT]
+    report = NumericReport(int(blank.sum()), int(failed.sum()), samples)
+    return pd.Series(numbers, index=series.index, name=series.name), report
+
+
+def to_amounts(values, fill=0):
+    """parse_numbers + 빈 칸·읽지 못한 값을 fill 로 채움. 모두 정수면 int64 Series 로 돌려준다."""
+    numbers, report = parse_numbers(values)
+    numbers = numbers.fillna(fill)
+    whole = numbers.to_numpy()
+    if np.isfinite(whole).all() and (whole == np.round(whole)).all():
+        numbers = numbers.astype(np.int64)
+    return numbers, report
+
+
+def coerce_columns(df, columns, fill=0):
+    """df 의 금액/수량 열들을 제자리에서 숫자로 바꾸고 {열 이름: NumericReport} 를 돌려준다 (없는 열은 건너뜀)."""
+    reports = {}
+    for col in columns:
+        if col in df.columns:
+            df[col], reports[col] = to_amounts(df[col], fill=fill)
+    return reports
@@ -0,0 +1,256 @@
+# ⏱️ 단계별 실행 시간 기록
+#
+# 페이지는 start_run("페이지 이름") 으로 한 번의 실행을 열고, 구간마다 with stage("fetch"): 로 감싼다.
+# 꺼져 있으면 stage() 는 공용 no-op 객체를 돌려주므로 비용은 함수 호출 한 번 정도다.
+#
+# MURRAY_PROFILE=1       : 시간·행 수 기록
+# MURRAY_PROFILE=memory  : + 단계별 최대 메모리 (tracemalloc, 느려짐. 프로세스 전체 할당 기준)
+# MURRAY_PROFILE_LOG     : JSON lines 로그 파일 (기본 <저장소>/.profile/stages.jsonl)
+#
+# 로그는 LOG_FLUSH_RECORDS 개 또는 LOG_FLUSH_SECONDS 초마다 모아서 쓰고 (종료 시에도),
+# 파일이 MURRAY_PROFILE_LOG_MAX_MB (기본 20) 를 넘으면 stages.jsonl.1 … .LOG_BACKUPS 로 돌린다.
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from pathlib import Path
+
+STAGES = ("fetch", "parse", "transform", "match", "aggregate", "render", "export")
+MAX_RECORDS = 20_000
+
+PROFILE_LOG = Path(os.environ.get("MURRAY_PROFILE_LOG", Path(__file__).resolve().parent.parent / ".profile" / "stages.jsonl"))
+LOG_MAX_BYTES = int(float(os.environ.get("MURRAY_PROFILE_LOG_MAX_MB", "20")) * 1024 * 1024)
+LOG_BACKUPS = 2
+LOG_FLUSH_RECORDS = 200
+LOG_FLUSH_SECONDS = 5.0
+
+_records = deque(maxlen=MAX_RECORDS)
+_write_lock = threading.Lock()
+_pending = []
+_last_flush = time.monotonic()
+_run_ids = itertools.count(1)
+_run = contextvars.ContextVar("profile_run", default=(None, None))
+_open_stages = contextvars.ContextVar("profile_stack", default=())
+
+_mode = os.environ.get("MURRAY_PROFILE", "").strip().lower()
+_enabled = _mode not in ("", "0", "false", "off")
+_track_memory = _mode == "memory"
+
+
+def is_enabled():
+    return _enabled
+
+
+def is_tracking_memory():
+    return _track_memory
+
+
+def set_enabled(enabled, track_memory=None):
+    """실행 중에 켜고 끈다. 프로세스 전체(모든 세션)에 적용되므로 스크립트·벤치마크에서만 쓴다."""
+    global _enabled, _track_memory
+    _enabled = bool(enabled)
+    if track_memory is not None:
+        _track_memory = bool(track_memory)
+    if _enabled and _track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif not (_enabled and _track_memory) and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def start_run(page):
+    """이번 스크립트 실행에 (실행 번호, 페이지 이름) 을 붙인다. 이후 stage() 기록에 함께 남는다."""
+    if _enabled:
+        _run.set((f"{os.getpid()}-{next(_run_ids)}", page))
+
+
+class _NoopStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NOOP = _NoopStage()
+
+
+class _Stage:
+    __slots__ = ("name", "rows", "_started", "_memory_start", "_inner_peak")
+
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+        self._inner_peak = 0
+
+    def __enter__(self):
+        if _track_memory and tracemalloc.is_tracing():
+            stack = _open_stages.get()
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # 바깥 단계의 지금까지 최대값을 넘겨 두고 최대값 기록을 새로 시작한다
+                stack[-1]._inner_peak = max(stack[-1]._inner_peak, peak)
+            tracemalloc.reset_peak()
+            self._memory_start = current
+            _open_stages.set(stack + (self,))
+        else:
+            self._memory_start = None
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self._started
+        peak_bytes = None
+        if self._memory_start is not None and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], self._inner_peak)
+            peak_bytes = max(0, peak - self._memory_start)
+            stack = _open_stages.get()[:-1]
+            _open_stages.set(stack)
+            if stack:
+                stack[-1]._inner_peak = max(stack[-1]._inner_peak, peak)
+        run_id, page = _run.get()
+        _record({
+            "ts": time.time(),
+            "run": run_id,
+            "page": page,
+            "stage": self.name,
+            "ms": round(elapsed * 1000, 3),
+            "rows": self.rows,
+            "peak_bytes": peak_bytes,
+            "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+
+def stage(name, rows=None):
+    """with stage("parse") as s: ...; s.rows = len(df)  — 꺼져 있으면 아무것도 하지 않는다."""
+    if not _enabled:
+        return _NOOP
+    return _Stage(name, rows)
+
+
+def _record(record):
+    _records.append(record)
+    line = json.dumps(record, ensure_ascii=False)
+    with _write_lock:
+        _pending.append(line)
+        if len(_pending) >= LOG_FLUSH_RECORDS or time.monotonic() - _last_flush >= LOG_FLUSH_SECONDS:
+            _flush_locked()
+
+
+def _backup(index):
+    return PROFILE_LOG.with_name(f"{PROFILE_LOG.name}.{index}")
+
+
+def _rotate_locked():
+    _backup(LOG_BACKUPS).unlink(missing_ok=True)
+    for index in range(LOG_BACKUPS - 1, 0, -1):
+        if _backup(index).exists():
+            _backup(index).replace(_backup(index + 1))
+    PROFILE_LOG.replace(_backup(1))
+
+
+def _flush_locked():
+    global _last_flush
+    _last_flush = time.monotonic()
+    if not _pending:
+        return
+    lines = "".join(line + "\n" for line in _pending)
+    _pending.clear()
+    try:
+        PROFILE_LOG.parent.mkdir(parents=True, exist_ok=True)
+        with PROFILE_LOG.open("a", encoding="utf-8") as fh:
+            fh.write(lines)
+            size = fh.tell()
+        if size > LOG_MAX_BYTES:
+            _rotate_locked()
+    except OSError:
+        pass
+
+
+def flush():
+    """모아 둔 기록을 로그 파일에 쓴다."""
+    with _write_lock:
+        _flush_locked()
+
+
+atexit.register(flush)
+
+
+def recent_records():
+    """이 프로세스에서 기록한 최근 단계 기록 (오래된 것부터)."""
+    return list(_records)
+
+
+def load_log(limit=MAX_RECORDS):
+    """로그 파일(돌려 둔 이전 파일 포함)의 마지막 limit 줄 (다른 프로세스·재시작 이전 기록 포함)."""
+    flush()
+    lines = deque(maxlen=limit)
+    for path in [_backup(index) for index in range(LOG_BACKUPS, 0, -1)] + [PROFILE_LOG]:
+        try:
+            with path.open(encoding="utf-8") as fh:
+                lines.extend(fh)
+        except FileNotFoundError:
+            continue
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+
+def clear():
+    _records.clear()
+    with _write_lock:
+        _pending.clear()
+        for path in [PROFILE_LOG] + [_backup(index) for index in range(1, LOG_BACKUPS + 1)]:
+            path.unlink(missing_ok=True)
+
+
+if _enabled and _track_memory:
+    tracemalloc.start()
+
+
+def summarize(records, recent_runs=50):
+    """페이지·단계별 p50/p95 (ms). 한 실행에서 같은 단계가 여러 번 나오면 합쳐서 한 번으로 센다.
+
+    recent_runs : 페이지마다 최근 몇 번의 실행만 볼지
+    """
+    import pandas as pd
+
+    columns = ["페이지", "단계", "실행 수", "p50 (ms)", "p95 (ms)", "최대 (ms)", "행 수 (중앙값)", "최대 메모리 (MB)"]
+    frame = pd.DataFrame.from_records(records, columns=["ts", "run", "page", "stage", "ms", "rows", "peak_bytes", "error"])
+    frame = frame[frame["run"].notna()]
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    per_run = frame.groupby(["page", "run", "stage"], sort=False).agg(
+        ts=("ts", "min"), ms=("ms", "sum"), rows=("rows", "max"), peak_bytes=("peak_bytes", "max"),
+    ).reset_index()
+    started = per_run.groupby(["page", "run"])["ts"].min()
+    keep = started.groupby(level="page", group_keys=False).nlargest(recent_runs).index
+    per_run = per_run.set_index(["page", "run"]).loc[keep].reset_index()
+
+    grouped = per_run.groupby(["page", "stage"])
+    summary = pd.DataFrame({
+        "실행 수": grouped["run"].nunique(),
+        "p50 (ms)": grouped["ms"].quantile(0.5),
+        "p95 (ms)": grouped["ms"].quantile(0.95),
+        "최대 (ms)": grouped["ms"].max(),
+        "행 수 (중앙값)": grouped["rows"].median(),
+        "최대 메모리 (MB)": grouped["peak_bytes"].max() / 1024 / 1024,
+    }).reset_index().rename(columns={"page": "페이지", "stage": "단계"})
+    order = {name: i for i, name in enumerate(STAGES)}
+    summary = summary.sort_values(["페이지", "단계"], key=lambda col: col.map(order).fillna(len(order)) if col.name == "단계" else col)
+    return summary[columns].reset_index(drop=True)
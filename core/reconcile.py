@@ -0,0 +1,236 @@
+# 💰 주문내역 ↔ 입금내역 정산 파이프라인
+#
+# 💰 입금자 정산 매칭 페이지와 배치 CLI(core/batch.py)가 같은 로직을 쓴다.
+import io
+
+import numpy as np
+import pandas as pd
+
+from core.cache import LRUCache
+from core.matching import match_amounts, match_deposits
+from core.numeric import to_amounts
+from core.xlsx_stream import STYLE_BOLD, STYLE_HIGHLIGHT, STYLE_NONE, STYLE_RED, write_xlsx
+
+RESULT_COLUMNS = ["주문자", "입금자(사이트)", "입금자(실제)", "총 구매금액", "통장입금", "차이"]
+# 금액 2차 매칭을 켰을 때만 붙는 열: 어떻게 짝지어졌는지
+MATCH_COLUMN = "매칭"
+MATCH_BY_NAME = "이름"
+MATCH_BY_AMOUNT = "금액"
+
+SHEET_B2B = "B2B"
+SHEET_NON_B2B = "B2B 이외"
+SHEET_MORE_PAID = "B2B_더 입금된 건들"
+SHEET_LESS_PAID = "B2B_덜 입금된 건들"
+
+# 업로드 파일 쌍(내용 해시) → 정산 결과 / 결과 엑셀
+_results = LRUCache(256 * 1024 * 1024, max_entries=32)
+
+
+def _find_column(columns, *keywords):
+    return [col for col in columns if any(k in col for k in keywords)][0]
+
+
+def make_key(series):
+    """입금자 이름 → 공백 제거된 입금자키."""
+    return series.astype(str).str.replace(" ", "").str.strip()
+
+
+def order_rows(order_df, reports=None):
+    """주문내역 컬럼 자동 매핑 + 금액 숫자 변환 + 입금자키 (행 단위). reports 에 금액 읽기 결과를 남긴다."""
+    order_columns = order_df.columns
+    order_df = order_df.rename(columns={
+        _find_column(order_columns, "입금자"): "입금자(사이트)",
+        _find_column(order_columns, "주문자", "회원명"): "주문자",
+        _find_column(order_columns, "결제", "구매금액"): "총 구매금액"
+    })
+
+    order_df["총 구매금액"], report = to_amounts(order_df["총 구매금액"])
+    if reports is not None:
+        reports["주문내역 · 총 구매금액"] = report
+    order_df["입금자키"] = make_key(order_df["입금자(사이트)"])
+    return order_df
+
+
+def group_orders(rows):
+    return rows.groupby("입금자키", as_index=False).agg({
+        "주문자": "first",
+        "입금자(사이트)": "first",
+        "총 구매금액": "sum"
+    })
+
+
+def prepare_orders(order_df, reports=None):
+    """주문내역 컬럼 자동 매핑 후 입금자키 기준으로 묶는다. reports 에 금액 읽기 결과를 남긴다."""
+    return group_orders(order_rows(order_df, reports))
+
+
+def deposit_rows(deposit_df, reports=None):
+    """입금내역 컬럼 자동 매핑 + 금액 숫자 변환 + 입금자키 (행 단위). reports 에 금액 읽기 결과를 남긴다."""
+    deposit_columns = deposit_df.columns
+    deposit_df = deposit_df.rename(columns={
+        _find_column(deposit_columns, "내용", "입금자"): "입금자(실제)",
+        _find_column(deposit_columns, "금액"): "통장입금"
+    })
+
+    deposit_df["통장입금"], report = to_amounts(deposit_df["통장입금"])
+    if reports is not None:
+        reports["입금내역 · 통장입금"] = report
+    deposit_df["입금자키"] = make_key(deposit_df["입금자(실제)"])
+    return deposit_df
+
+
+def group_deposits(rows):
+    return rows.groupby("입금자키", as_index=False).agg({
+        "입금자(실제)": "first",
+        "통장입금": "sum"
+    })
+
+
+def prepare_deposits(deposit_df, reports=None):
+    """입금내역 컬럼 자동 매핑 후 입금자키 기준으로 묶는다. reports 에 금액 읽기 결과를 남긴다."""
+    return group_deposits(deposit_rows(deposit_df, reports))
+
+
+def pair_index(order_grouped, deposit_grouped):
+    """주문 묶음마다 배정된 입금 묶음의 위치 (없으면 -1)."""
+    return np.asarray(
+        match_deposits(order_grouped["입금자키"].tolist(), deposit_grouped["입금자키"].tolist()),
+        dtype=np.int64,
+    )
+
+
+def pair_by_amount(order_grouped, deposit_grouped, match_idx, tolerance=0):
+    """이름으로 짝이 없는 주문 묶음·입금 묶음끼리 금액(±tolerance)으로 한 번 더 맞춘다.
+
+    → (금액 매칭까지 더한 위치 배열, 금액으로 맞춘 주문 묶음 여부)
+    """
+    match_idx = match_idx.copy()
+    order_left = np.flatnonzero(match_idx < 0)
+    deposit_used = np.zeros(len(deposit_grouped), dtype=bool)
+    deposit_used[match_idx[match_idx >= 0]] = True
+    deposit_left = np.flatnonzero(~deposit_used)
+
+    found = match_amounts(
+        order_grouped["총 구매금액"].to_numpy()[order_left],
+        deposit_grouped["통장입금"].to_numpy()[deposit_left],
+        tolerance,
+    )
+    by_amount = np.zeros(len(order_grouped), dtype=bool)
+    hit = found >= 0
+    match_idx[order_left[hit]] = deposit_left[found[hit]]
+    by_amount[order_left[hit]] = True
+    return match_idx, by_amount
+
+
+def match_grouped(order_grouped, deposit_grouped, match_idx=None, by_amount=None):
+    """묶인 주문/입금을 매칭해 정산표(result_df)를 만든다. match_idx 는 pair_index 결과 (없으면 계산).
+
+    by_amount(pair_by_amount 결과)를 주면 "매칭" 열(이름/금액)을 덧붙인다.
+    """
+    if match_idx is None:
+        match_idx = pair_index(order_grouped, deposit_grouped)
+    hit = match_idx >= 0
+    take_idx = np.where(hit, match_idx, 0)
+
+    matched_part = pd.DataFrame({
+        "주문자": order_grouped["주문자"].to_numpy(dtype=object),
+        "입금자(사이트)": order_grouped["입금자(사이트)"].to_numpy(dtype=object),
+        "입금자(실제)": np.where(hit, deposit_grouped["입금자(실제)"].to_numpy(dtype=object)[take_idx], "") if len(deposit_grouped) else "",
+        "총 구매금액": order_grouped["총 구매금액"].to_numpy(),
+        "통장입금": np.where(hit, deposit_grouped["통장입금"].to_numpy()[take_idx], 0) if len(deposit_grouped) else 0,
+    })
+
+    used_mask = np.zeros(len(deposit_grouped), dtype=bool)
+    used_mask[match_idx[hit]] = True
+    unmatched = deposit_grouped[~used_mask]
+    unmatched_part = pd.DataFrame({
+        "주문자": "",
+        "입금자(사이트)": "",
+        "입금자(실제)": unmatched["입금자(실제)"].to_numpy(dtype=object),
+        "총 구매금액": 0,
+        "통장입금": unmatched["통장입금"].to_numpy(),
+    })
+
+    columns = RESULT_COLUMNS
+    if by_amount is not None:
+        matched_part[MATCH_COLUMN] = np.select([by_amount, hit], [MATCH_BY_AMOUNT, MATCH_BY_NAME], "")
+        unmatched_part[MATCH_COLUMN] = ""
+        columns = RESULT_COLUMNS + [MATCH_COLUMN]
+
+    result_df = pd.concat([matched_part, unmatched_part], ignore_index=True)
+    result_df["차이"] = result_df["통장입금"] - result_df["총 구매금액"]
+    return result_df[columns].sort_values(by="주문자")
+
+
+def split_sheets(result_df):
+    """정산표를 엑셀 네 개 시트로 나눈다 (시트 순서 유지)."""
+    non_b2b_mask = (result_df["주문자"] == "") & (result_df["입금자(사이트)"] == "")
+    df_b2b = result_df[~non_b2b_mask].copy()
+    df_non_b2b = result_df[non_b2b_mask].copy()
+    return {
+        SHEET_B2B: df_b2b,
+        SHEET_NON_B2B: df_non_b2b,
+        SHEET_MORE_PAID: df_b2b[df_b2b["차이"] > 0].copy(),
+        SHEET_LESS_PAID: df_b2b[df_b2b["차이"] < 0].copy(),
+    }
+
+
+def match_all(order_grouped, deposit_grouped, amount_tolerance=None):
+    """이름 매칭 (+ amount_tolerance 가 있으면 금액 2차 매칭) → (위치 배열, 정산표)."""
+    match_idx = pair_index(order_grouped, deposit_grouped)
+    by_amount = None
+    if amount_tolerance is not None:
+        match_idx, by_amount = pair_by_amount(order_grouped, deposit_grouped, match_idx, amount_tolerance)
+    return match_idx, match_grouped(order_grouped, deposit_grouped, match_idx, by_amount)
+
+
+def reconcile(order_df, deposit_df, amount_tolerance=None):
+    """원본 주문/입금 DataFrame → (정산표, 시트별 DataFrame, {금액 열: NumericReport}).
+
+    amount_tolerance(원)를 주면 이름으로 짝이 없는 주문·입금을 금액 차이 그 이하끼리 한 번 더 맞춘다 (0 = 같은 금액만).
+    """
+    reports = {}
+    _, result_df = match_all(prepare_orders(order_df, reports), prepare_deposits(deposit_df, reports), amount_tolerance)
+    return result_df, split_sheets(result_df), reports
+
+
+def highlight_styles(sheet_name, sheet_df):
+    """차이 강조 서식을 열 번호 → 스타일 번호 배열로 미리 계산한다.
+
+    - 차이 > 0: 노란 배경 + 굵게 / 차이 < 0: 빨간 굵은 글씨
+    - 더 입금 시트의 주문자는 굵게, 덜 입금 시트의 주문자는 빨간 글씨
+    """
+    diff = pd.to_numeric(sheet_df["차이"], errors="coerce").to_numpy(dtype=np.float64)
+    diff_styles = np.select([diff > 0, diff < 0], [STYLE_HIGHLIGHT, STYLE_RED], STYLE_NONE)
+    styles = {RESULT_COLUMNS.index("차이"): diff_styles}
+
+    if sheet_name == SHEET_MORE_PAID:
+        styles[0] = np.where(diff > 0, STYLE_BOLD, STYLE_NONE)
+    elif sheet_name == SHEET_LESS_PAID:
+        styles[0] = np.where(diff < 0, STYLE_RED, STYLE_NONE)
+    return styles
+
+
+def reconcile_cached(cache_key, order_df, deposit_df, amount_tolerance=None):
+    """같은 업로드 쌍이면 재실행 시 다시 매칭하지 않는다. cache_key 는 (주문 해시, 입금 해시)."""
+    return _results.get_or_compute(
+        ("result", cache_key, amount_tolerance), lambda: reconcile(order_df, deposit_df, amount_tolerance),
+    )
+
+
+def write_workbook(sheets, target):
+    """시트별 DataFrame 을 차이 강조 서식과 함께 엑셀로 저장한다 (스트리밍 작성)."""
+    write_xlsx(target, {
+        sheet_name: (sheet_df, highlight_styles(sheet_name, sheet_df))
+        for sheet_name, sheet_df in sheets.items()
+    })
+
+
+def workbook_bytes(sheets):
+    towrite = io.BytesIO()
+    write_workbook(sheets, towrite)
+    return towrite.getvalue()
+
+
+def workbook_bytes_cached(cache_key, sheets):
+    return _results.get_or_compute(("xlsx", cache_key), lambda: workbook_bytes(sheets))
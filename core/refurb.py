@@ -0,0 +1,55 @@
+# 🔁 리퍼 정산 분석: 전처리 + 집계 큐브 (스냅샷마다 한 번)
+from core.cache import LRUCache
+from core.cube import Cube
+from core import schema
+
+# 데이터 위치 (페이지와 예약 갱신이 같이 씀)
+SPREADSHEET_ID = "1O1eIiuYXjpTBclv-4_RYKvmJELglr7cGUfQ18eWUeVE"
+WORKSHEET_NAME = "배송및 정산대기중"
+SHEET_TTL = 600
+MIRROR = "refurb"
+
+AMOUNT = "정산 금액"
+AMOUNT_MANWON = "정산 금액(만원)"
+QUANTITY = "수량"
+DATE = "날짜"
+STATUS = "거래 상태"
+MODEL = "모델명"
+SITE = "사이트"
+
+DIMENSIONS = [STATUS, MODEL, SITE, DATE]
+
+# 빈 칸은 예전 fillna("") 처럼 "" 로 (필터 목록에 그대로 보임)
+SCHEMA = schema.SheetSchema("🔁 리퍼 정산", {
+    STATUS: schema.Column(schema.CATEGORY),
+    MODEL: schema.Column(schema.CATEGORY),
+    SITE: schema.Column(schema.CATEGORY),
+    DATE: schema.Column(schema.DATE, "%y-%m-%d"),
+    AMOUNT: schema.Column(schema.AMOUNT),
+    QUANTITY: schema.Column(schema.AMOUNT),
+}, blank="")
+
+_cubes = LRUCache(256 * 1024 * 1024, max_entries=8)
+
+
+def prepare_refurb(df):
+    """SCHEMA.load 로 읽은 시트 → (만원 열을 붙인 DataFrame, 금액/수량 읽기 결과). df 는 건드리지 않는다."""
+    reports = schema.numeric_reports(df)
+    if DATE in df.columns and AMOUNT in df.columns:
+        df = df.assign(**{AMOUNT_MANWON: df[AMOUNT] / 10000})
+    return df, reports
+
+
+def build_refurb_cube(df):
+    df, reports = prepare_refurb(df)
+    return Cube(df, DIMENSIONS, sums=[AMOUNT, QUANTITY], extremes=[AMOUNT]), reports
+
+
+def refurb_cube_cached(snapshot):
+    """스냅샷 버전마다 한 번만 정제·집계한다 → (Cube, 읽기 결과). 공유 객체이므로 수정 금지."""
+    return _cubes.get_or_compute(snapshot.version, lambda: build_refurb_cube(snapshot.data))
+
+
+def warm_snapshot(snapshot):
+    """예약 갱신에서 교체 전에 부르는 준비 작업."""
+    refurb_cube_cached(snapshot)
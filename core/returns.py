@@ -0,0 +1,60 @@
+# 📊 반품·교환 분석: 선택한 시트 병합 + 집계 큐브 (시트 스냅샷 조합마다 한 번)
+import numpy as np
+import pandas as pd
+
+from core.cache import LRUCache
+from core.cube import Cube
+from core import schema
+from core.google_api import use_credential
+
+# 데이터 위치 (페이지와 예약 갱신이 같이 씀)
+SHEET_URL = "https://docs.google.com/spreadsheets/d/1GZCJuWRcYQgCU7iWMW-fg6tUhJ0WXbcDPb4yKi7Tx_M/edit?usp=sharing"
+SPREADSHEET_ID = SHEET_URL.split("/d/")[1].split("/")[0]
+# 반품 시트는 예전부터 GOOGLE_CREDS 계정으로 읽었다 (없으면 기본 계정)
+CREDENTIAL = "GOOGLE_CREDS"
+use_credential(SPREADSHEET_ID, CREDENTIAL)
+DEFAULT_SHEETS = ["통합 요약"]
+SHEET_TTL = 600
+
+SHEET = "시트이름"
+METHOD = "처리방식"
+MODEL = "모델명"
+QUANTITY = "수량"
+
+DIMENSIONS = [SHEET, METHOD, MODEL]
+
+# 빈 값은 그대로 둔다 (처리방식 없는 시트는 필터에서 빈 값으로 보임)
+SCHEMA = schema.SheetSchema("📊 반품·교환", {
+    SHEET: schema.Column(schema.CATEGORY),
+    METHOD: schema.Column(schema.CATEGORY),
+    MODEL: schema.Column(schema.CATEGORY),
+    QUANTITY: schema.Column(schema.AMOUNT),
+})
+
+_cubes = LRUCache(256 * 1024 * 1024, max_entries=16)
+
+
+def build_returns_cube(names, snapshots):
+    """SCHEMA.load 로 읽은 시트들을 시트이름 열과 함께 이어 붙여 큐브로 묶는다 → (Cube, 시트별 수량 읽기 결과 합계)."""
+    frames = [s.data for s in snapshots]
+    merged = pd.concat(frames, ignore_index=True)
+    # 시트이름은 처음부터 범주형으로 (범주는 다른 열처럼 정렬 순서)
+    categories = sorted(set(names))
+    merged[SHEET] = pd.Categorical.from_codes(
+        np.repeat([categories.index(name) for name in names], [len(frame) for frame in frames]), categories=categories,
+    )
+    # 시트마다 범주가 달라 object 로 풀린 범주 열, 일부 시트에만 있는 열의 빈 칸만 다시 맞춘다
+    df, _ = SCHEMA.convert(merged)
+    reports = schema.merge_reports(schema.numeric_reports(frame) for frame in frames)
+    return Cube(df, DIMENSIONS, sums=[QUANTITY], extremes=[QUANTITY]), reports
+
+
+def returns_cube_cached(names, snapshots):
+    """(시트 이름, 스냅샷 버전) 조합이 같으면 만들어 둔 큐브를 재사용한다. 공유 객체이므로 수정 금지."""
+    key = tuple((name, s.version) for name, s in zip(names, snapshots))
+    return _cubes.get_or_compute(key, lambda: build_returns_cube(names, snapshots))
+
+
+def warm_snapshot(name, snapshot):
+    """예약 갱신에서 교체 전에 부르는 준비 작업: 기본 선택(시트 하나)의 큐브."""
+    returns_cube_cached([name], [snapshot])
@@ -0,0 +1,157 @@
+# 🔄 시트 예약 갱신 (서버 프로세스 안의 백그라운드 스레드 하나)
+#
+# 설정된 시트마다 자기 주기(페이지 TTL 보다 REFRESH_LEAD 초 앞서)로 다시 받아 오고,
+# 파생 데이터(정렬·집계·큐브)까지 만든 뒤 스냅샷을 교체한다 (core/sheets.py refresh).
+# 그래서 아침에 여러 명이 동시에 열어도 요청 경로에서는 이미 준비된 데이터만 읽는다.
+# API 오류가 나면 이전 스냅샷을 그대로 두고 지수 백오프로 다시 시도한다.
+#
+# MURRAY_REFRESH_SCHEDULER=0 이거나 데이터 소스가 원격(gspread)이 아니면 켜지 않는다 (페이지 TTL 캐시만 사용).
+# 페이지의 첫 로드와 예약 갱신이 겹치면 먼저 잠금을 잡은 쪽만 받아 오고 다른 쪽은 그 스냅샷을 쓴다 (core/sheets.py).
+import os
+import random
+import threading
+import time
+
+from core.datasource import get_data_source, refresh_worksheet, refresh_worksheet_titles
+
+REFRESH_LEAD = 30
+MIN_INTERVAL = 30
+BACKOFF_BASE = 15
+MAX_BACKOFF = 30 * 60
+JITTER = 0.1
+
+
+class RefreshJob:
+    """name 을 interval 초마다 refresh() 한다. 실패가 이어지면 BACKOFF_BASE 부터 두 배씩 (최대 MAX_BACKOFF) 쉰다."""
+
+    __slots__ = ("name", "interval", "refresh", "next_run", "failures", "last_error", "last_success", "last_seconds")
+
+    def __init__(self, name, interval, refresh):
+        self.name = name
+        self.interval = max(MIN_INTERVAL, interval)
+        self.refresh = refresh
+        self.next_run = 0.0
+        self.failures = 0
+        self.last_error = None
+        self.last_success = None
+        self.last_seconds = None
+
+    def backoff(self):
+        delay = min(BACKOFF_BASE * 2 ** (self.failures - 1), MAX_BACKOFF)
+        return delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def run(self, now):
+        started = time.perf_counter()
+        try:
+            self.refresh()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = e
+            self.next_run = now + self.backoff()
+        else:
+            self.failures = 0
+            self.last_error = None
+            self.last_success = time.time()
+            self.next_run = now + self.interval
+        self.last_seconds = time.perf_counter() - started
+
+
+class RefreshScheduler:
+    """jobs 를 차례대로 돌리는 데몬 스레드. 처음 시작하면 모든 job 을 바로 한 번 돌린다."""
+
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="sheet-refresh-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+
+    def run_pending(self):
+        """예정 시각이 지난 job 들을 돌리고 다음 예정 시각까지 남은 초를 돌려준다."""
+        for job in self.jobs:
+            if job.next_run <= time.monotonic():
+                job.run(time.monotonic())
+        if not self.jobs:
+            return MAX_BACKOFF
+        return max(0.0, min(job.next_run for job in self.jobs) - time.monotonic())
+
+    def _loop(self):
+        while not self._stopped:
+            self._wake.wait(self.run_pending())
+            self._wake.clear()
+
+    def status(self):
+        now = time.monotonic()
+        return [{
+            "이름": job.name,
+            "주기(초)": job.interval,
+            "다음 갱신까지(초)": round(max(0.0, job.next_run - now)),
+            "마지막 성공": job.last_success,
+            "소요(초)": None if job.last_seconds is None else round(job.last_seconds, 3),
+            "연속 실패": job.failures,
+            "마지막 오류": None if job.last_error is None else repr(job.last_error),
+        } for job in self.jobs]
+
+
+def default_jobs():
+    """페이지들이 읽는 시트 (각 페이지 TTL 보다 REFRESH_LEAD 초 먼저)."""
+    from core import refurb, returns, shipments
+
+    jobs = [
+        RefreshJob(
+            "📦 중국 출하리스트", shipments.SHEET_TTL - REFRESH_LEAD,
+            lambda: refresh_worksheet(
+                shipments.SPREADSHEET_ID, shipments.WORKSHEET_NAME,
+                mirror=shipments.MIRROR, warm=shipments.warm_snapshot, schema=shipments.SCHEMA,
+            ),
+        ),
+        RefreshJob(
+            "🔁 리퍼 정산 분석", refurb.SHEET_TTL - REFRESH_LEAD,
+            lambda: refresh_worksheet(
+                refurb.SPREADSHEET_ID, refurb.WORKSHEET_NAME,
+                mirror=refurb.MIRROR, warm=refurb.warm_snapshot, schema=refurb.SCHEMA,
+            ),
+        ),
+        RefreshJob(
+            "📊 반품·교환 분석 · 시트 목록", returns.SHEET_TTL - REFRESH_LEAD,
+            lambda: refresh_worksheet_titles(returns.SPREADSHEET_ID),
+        ),
+    ]
+    for name in returns.DEFAULT_SHEETS:
+        jobs.append(RefreshJob(
+            f"📊 반품·교환 분석 · {name}", returns.SHEET_TTL - REFRESH_LEAD,
+            lambda name=name: refresh_worksheet(
+                returns.SPREADSHEET_ID, name, warm=lambda s: returns.warm_snapshot(name, s), schema=returns.SCHEMA,
+            ),
+        ))
+    return jobs
+
+
+_scheduler = None
+_lock = threading.Lock()
+
+
+def start_refresh_scheduler():
+    """프로세스에 하나만 시작한다 (여러 페이지에서 불러도 됨). 꺼져 있거나 로컬·fake 백엔드면 None."""
+    global _scheduler
+    if os.environ.get("MURRAY_REFRESH_SCHEDULER", "1").strip().lower() in ("0", "false", "off"):
+        return None
+    if not get_data_source().remote:
+        return None
+    with _lock:
+        if _scheduler is None:
+            _scheduler = RefreshScheduler(default_jobs()).start()
+        return _scheduler
+
+
+def get_scheduler():
+    return _scheduler
@@ -0,0 +1,153 @@
+# 🧱 시트별 열 타입 (시트를 받아 올 때 한 번 적용)
+#
+# get_all_records() 결과는 파이썬 문자열이 반복되는 object 열이라 메모리를 많이 쓰고 groupby·필터도 느리다.
+# 시트마다 열 종류를 정해 두고, 데이터 소스가 시트를 읽을 때(core/datasource.py, core/mirror.py) 한 번에 바꾼다.
+# 그래서 캐시된 스냅샷에는 타입이 정해진 DataFrame 하나만 남는다 (원본 문자열 DataFrame 은 남지 않음).
+#   CATEGORY : 값 종류가 적은 열 (모델명·상태 등) → category
+#   TEXT     : 나머지 문자열 → Arrow 문자열 (string[pyarrow])
+#   AMOUNT   : 금액·수량 → 숫자 (core/numeric.py to_amounts, 빈 칸·읽지 못한 값은 0 + NumericReport)
+#   DATE     : 날짜 → datetime64 (읽지 못하면 NaT)
+# 스키마에 없는 열도 문자열이면 TEXT 로, 이미 숫자면 그대로 둔다 (예전처럼 fillna("") 로 object 가 되지 않음).
+# 금액 열 읽기 결과(NumericReport)는 DataFrame.attrs 에 담겨 스냅샷과 같이 다닌다 (numeric_reports()).
+# 변환 전/후 열별 메모리는 memory_reports() 로 볼 수 있다 (⏱️ 성능 모니터링 페이지).
+import threading
+
+import pandas as pd
+
+from core.numeric import SAMPLE_LIMIT, NumericReport, to_amounts
+
+TEXT = "text"
+CATEGORY = "category"
+AMOUNT = "amount"
+DATE = "date"
+
+TEXT_DTYPE = pd.StringDtype("pyarrow")
+REPORTS_ATTR = "numeric_reports"
+# object 열의 메모리는 이만큼만 세어 보고 행 수 비율로 늘린다 (전체를 세면 백만 행에 수백 ms)
+MEMORY_SAMPLE_ROWS = 20_000
+
+_memory = {}
+_memory_lock = threading.Lock()
+
+
+class Column:
+    """열 하나의 종류. format 은 DATE 의 날짜 형식 (없으면 추론)."""
+
+    __slots__ = ("kind", "format")
+
+    def __init__(self, kind, format=None):
+        self.kind = kind
+        self.format = format
+
+
+def _text(series, blank):
+    dtype = series.dtype
+    if not (isinstance(dtype, pd.StringDtype) and dtype.storage == "pyarrow"):
+        series = series.astype(TEXT_DTYPE)
+    return series.fillna(blank) if blank is not None else series
+
+
+def _category(series, blank):
+    if isinstance(series.dtype, pd.CategoricalDtype) and (blank is None or not series.isna().any()):
+        return series
+    return _text(series, blank).astype("category")
+
+
+def _is_text(series):
+    return series.dtype == object or pd.api.types.is_string_dtype(series.dtype)
+
+
+class SheetSchema:
+    """시트 하나의 열 타입. blank 를 주면 TEXT·CATEGORY 열의 빈 값을 그 값으로 채운다.
+
+    header 를 주면 열 이름을 먼저 그 함수로 정리한다 (예: 줄바꿈이 들어간 머리글).
+    """
+
+    def __init__(self, name, columns, blank=None, header=None):
+        self.name = name
+        self.columns = columns
+        self.blank = blank
+        self.header = header
+
+    def convert(self, raw_df):
+        """시트 원본 → (타입이 정해진 새 DataFrame, {금액 열: NumericReport}). raw_df 는 건드리지 않는다.
+
+        이미 타입이 맞는 열은 그대로 두므로, 타입이 정해진 시트들을 이어 붙인 결과에 다시 써도 된다.
+        """
+        reports = {}
+        typed = []
+        for i, name in enumerate(raw_df.columns):
+            series = raw_df.iloc[:, i]
+            spec = self.columns.get(name)
+            kind = spec.kind if spec is not None else (TEXT if _is_text(series) else None)
+            if kind == AMOUNT:
+                series, reports[name] = to_amounts(series)
+            elif kind == DATE:
+                if not pd.api.types.is_datetime64_any_dtype(series.dtype):
+                    series = pd.to_datetime(series, format=spec.format, errors="coerce")
+            elif kind == CATEGORY:
+                series = _category(series, self.blank)
+            elif kind == TEXT:
+                series = _text(series, self.blank)
+            typed.append(series)
+
+        df = pd.concat(typed, axis=1, ignore_index=True) if typed else pd.DataFrame(index=raw_df.index)
+        df.columns = raw_df.columns
+        return df, reports
+
+    def load(self, raw_df):
+        """데이터 소스용: 시트 원본 → 타입이 정해진 DataFrame (금액 열 읽기 결과는 attrs, 메모리 비교는 기록)."""
+        if self.header is not None:
+            raw_df = raw_df.set_axis([self.header(c) for c in raw_df.columns], axis=1)
+        df, reports = self.convert(raw_df)
+        df.attrs[REPORTS_ATTR] = reports
+        with _memory_lock:
+            _memory[self.name] = memory_report(raw_df, df)
+        return df
+
+
+def numeric_reports(df):
+    """SheetSchema.load 가 담아 둔 {금액 열: NumericReport} (없으면 빈 dict)."""
+    return df.attrs.get(REPORTS_ATTR, {})
+
+
+def merge_reports(reports_list):
+    """여러 시트의 {열: NumericReport} → 열마다 건수를 합친 하나 (예시는 앞에서부터 SAMPLE_LIMIT 개)."""
+    merged = {}
+    for reports in reports_list:
+        for name, report in reports.items():
+            if name not in merged:
+                merged[name] = NumericReport(report.blank, report.unparsed, list(report.samples))
+                continue
+            total = merged[name]
+            total.blank += report.blank
+            total.unparsed += report.unparsed
+            total.samples = list(dict.fromkeys(total.samples + report.samples))[:SAMPLE_LIMIT]
+    return merged
+
+
+def column_bytes(series):
+    """열 하나의 메모리 (bytes). 긴 object 열은 표본으로 추정한다."""
+    if series.dtype != object or len(series) <= MEMORY_SAMPLE_ROWS:
+        return int(series.memory_usage(index=False, deep=True))
+    sample = series.iloc[::len(series) // MEMORY_SAMPLE_ROWS]
+    return int(sample.memory_usage(index=False, deep=True) * len(series) / len(sample))
+
+
+def memory_report(raw_df, df):
+    """열별 변환 전/후 메모리 (MB) 와 dtype."""
+    report = pd.DataFrame({
+        "열": [str(c) for c in df.columns],
+        "원본 dtype": [str(t) for t in raw_df.dtypes],
+        "dtype": [str(t) for t in df.dtypes],
+        "원본 (MB)": [column_bytes(raw_df.iloc[:, i]) / 1024 / 1024 for i in range(raw_df.shape[1])],
+        "변환 후 (MB)": [column_bytes(df.iloc[:, i]) / 1024 / 1024 for i in range(df.shape[1])],
+    })
+    report["배율"] = report["원본 (MB)"] / report["변환 후 (MB)"].where(report["변환 후 (MB)"] > 0)
+    return report
+
+
+def memory_reports():
+    """스키마 이름 → 마지막으로 적용한 스냅샷의 memory_report."""
+    with _memory_lock:
+        return dict(_memory)
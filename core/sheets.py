@@ -0,0 +1,356 @@
+# 📄 구글 시트 데이터 접근 (프로세스 공용 TTL 캐시)
+#
+# 모든 세션·재실행이 같은 스냅샷을 나눠 쓴다.
+#   - 처음 요청: 동기로 받아 온다 (동시에 들어온 요청은 한 번의 fetch 를 기다림)
+#   - TTL 이내: 캐시된 스냅샷을 그대로 돌려준다
+#   - TTL 경과: 일단 이전 스냅샷을 돌려주고 백그라운드에서 다시 받아 온다
+#     (stale-while-revalidate). 실패하면 이전 스냅샷을 계속 쓴다.
+#   - force=True: "지금 새로고침" — 동기로 다시 받아 온다
+#   - refresh(): 예약 갱신(core/scheduler.py) — 받아 온 데이터의 파생 결과까지 만든 뒤에 교체한다
+# 받아 오기는 항목 잠금 안에서 한다. 잠금을 기다리는 동안 다른 쪽(페이지의 첫 로드·예약 갱신·백그라운드
+# 갱신)이 이미 받아 왔으면 그 스냅샷을 쓰고 다시 받지 않는다 (같은 시트를 두 번 받지 않게).
+# 스냅샷과 그 파생 데이터(큐브·정렬본)는 버전마다 하나씩만 만들어 모든 세션이 읽기 전용으로 같이 쓴다.
+# 세션별 필터는 복사본이 아니라 행 위치 뷰(core/views.py)로 들고 다닌다.
+# 공유 DataFrame 에서 잘라 낸 조각을 누가 고쳐도 원본에 번지지 않는 것은 pandas 3 의 copy-on-write 에 기댄다
+# (requirements.txt 에서 pandas>=3 으로 고정).
+import itertools
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+DEFAULT_TTL = 300
+# numericise_frame: 쉼표를 지운 뒤 Arrow 로 바로 바꾸는 모양 (int()/float() 와 결과가 같은 경우만, RE2 문법)
+_INT_PATTERN = r"^-?[0-9]{1,18}$"
+_FLOAT_PATTERN = r"^[+-]?(?:(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?|[0-9]+[eE][+-]?[0-9]+)$"
+# int()/float() 가 읽을 수 있으려면 숫자(유니코드 Nd) 나 "nan"·"inf" 의 n 이 있어야 한다
+_MAYBE_NUMBER_PATTERN = r"[\p{Nd}nN]"
+
+_versions = itertools.count(1)
+
+
+class Snapshot:
+    """한 번 받아 온 시트 데이터 (version 은 프로세스 안에서 유일). data 는 모든 세션이 공유하는 읽기 전용 객체다."""
+
+    __slots__ = ("key", "data", "fetched_at", "version")
+
+    def __init__(self, key, data, fetched_at, version):
+        self.key = key
+        self.data = data
+        self.fetched_at = fetched_at
+        self.version = version
+
+
+class _Entry:
+    __slots__ = ("snapshot", "loaded_at", "lock", "refreshing", "last_error")
+
+    def __init__(self):
+        self.snapshot = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+        self.refreshing = False
+        self.last_error = None
+
+
+class SheetCache:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            return entry
+
+    def _load(self, key, entry, fetch):
+        data = fetch()
+        entry.snapshot = Snapshot(key, data, time.time(), next(_versions))
+        entry.loaded_at = time.monotonic()
+        entry.last_error = None
+
+    def _revalidate(self, key, entry, fetch):
+        with self._lock:
+            if entry.refreshing:
+                return
+            entry.refreshing = True
+        requested = time.monotonic()
+
+        def run():
+            try:
+                with entry.lock:
+                    if entry.loaded_at < requested:
+                        self._load(key, entry, fetch)
+            except Exception as e:
+                entry.last_error = e
+            finally:
+                entry.refreshing = False
+
+        threading.Thread(target=run, name=f"sheet-refresh-{key}", daemon=True).start()
+
+    def get(self, key, fetch, ttl=DEFAULT_TTL, force=False):
+        """key 의 스냅샷. fetch() 는 DataFrame(또는 임의의 값)을 돌려주는 함수."""
+        entry = self._entry(key)
+        if force or entry.snapshot is None:
+            stale_version = entry.snapshot.version if entry.snapshot is not None else None
+            with entry.lock:
+                # 기다리는 동안 다른 요청이 이미 받아 왔으면 그걸 쓴다
+                current = entry.snapshot
+                if current is None or (force and current.version == stale_version):
+                    self._load(key, entry, fetch)
+            return entry.snapshot
+
+        if time.monotonic() - entry.loaded_at > ttl:
+            self._revalidate(key, entry, fetch)
+        return entry.snapshot
+
+    def refresh(self, key, fetch, warm=None):
+        """지금 다시 받아 오고 warm(새 스냅샷) 으로 파생 데이터를 미리 만든 뒤에 교체한다.
+
+        교체 전까지 읽는 쪽은 이전 스냅샷을 그대로 쓴다. 실패하면 last_error 를 남기고
+        예외를 다시 던진다 (이전 스냅샷 유지). 잠금을 기다리는 동안 다른 쪽이 받아 왔으면 그 스냅샷을 돌려준다.
+        """
+        requested = time.monotonic()
+        entry = self._entry(key)
+        with entry.lock:
+            if entry.snapshot is not None and entry.loaded_at >= requested:
+                return entry.snapshot
+            try:
+                snapshot = Snapshot(key, fetch(), time.time(), next(_versions))
+                if warm is not None:
+                    warm(snapshot)
+            except Exception as e:
+                entry.last_error = e
+                raise
+            entry.snapshot = snapshot
+            entry.loaded_at = time.monotonic()
+            entry.last_error = None
+        return snapshot
+
+    def prime(self, key, data):
+        """아직 비어 있는 key 에 만료된 스냅샷을 넣어 둔다 (다음 get 에서 백그라운드 갱신)."""
+        entry = self._entry(key)
+        with entry.lock:
+            if entry.snapshot is None:
+                entry.snapshot = Snapshot(key, data, time.time(), next(_versions))
+                entry.loaded_at = float("-inf")
+        return entry.snapshot
+
+    def has(self, key):
+        entry = self._entries.get(key)
+        return entry is not None and entry.snapshot is not None
+
+    def get_many(self, keys, fetch_many, ttl=DEFAULT_TTL, force=False):
+        """여러 key 의 스냅샷 목록. 없는 것들은 fetch_many(keys) 한 번으로 같이 받아 온다.
+
+        fetch_many 는 key → 데이터 dict 를 돌려준다. TTL 이 지난 것들도
+        백그라운드 한 번의 호출로 묶어서 갱신한다.
+        """
+        keys = list(keys)
+        entries = {key: self._entry(key) for key in keys}
+        targets = [key for key in keys if force or entries[key].snapshot is None]
+        if targets:
+            stale_versions = {key: getattr(entries[key].snapshot, "version", None) for key in targets}
+            locks = [entries[key].lock for key in sorted(set(targets))]
+            for lock in locks:
+                lock.acquire()
+            try:
+                missing = [key for key in dict.fromkeys(targets)
+                           if entries[key].snapshot is None
+                           or (force and entries[key].snapshot.version == stale_versions[key])]
+                if missing:
+                    fetched = fetch_many(missing)
+                    absent = [key for key in missing if key not in fetched]
+                    if absent:
+                        raise KeyError(f"받아 오지 못한 시트: {absent}")
+                    self._install(entries, fetched)
+            finally:
+                for lock in reversed(locks):
+                    lock.release()
+
+        now = time.monotonic()
+        stale = [key for key in dict.fromkeys(keys) if key not in targets and now - entries[key].loaded_at > ttl]
+        if stale:
+            self._revalidate_many(stale, entries, fetch_many)
+        return [entries[key].snapshot for key in keys]
+
+    def _install(self, entries, fetched):
+        now_wall, now_mono = time.time(), time.monotonic()
+        for key, data in fetched.items():
+            entry = entries[key]
+            entry.snapshot = Snapshot(key, data, now_wall, next(_versions))
+            entry.loaded_at = now_mono
+            entry.last_error = None
+
+    def _revalidate_many(self, keys, entries, fetch_many):
+        with self._lock:
+            keys = [key for key in keys if not entries[key].refreshing]
+            for key in keys:
+                entries[key].refreshing = True
+        if not keys:
+            return
+        requested = time.monotonic()
+
+        def run():
+            locks = [entries[key].lock for key in sorted(keys)]
+            for lock in locks:
+                lock.acquire()
+            try:
+                stale = [key for key in keys if entries[key].loaded_at < requested]
+                if stale:
+                    self._install(entries, fetch_many(stale))
+            except Exception as e:
+                for key in keys:
+                    entries[key].last_error = e
+            finally:
+                for lock in reversed(locks):
+                    lock.release()
+                for key in keys:
+                    entries[key].refreshing = False
+
+        threading.Thread(target=run, name="sheet-refresh-batch", daemon=True).start()
+
+    def invalidate(self, key=None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def last_error(self, key):
+        entry = self._entries.get(key)
+        return entry.last_error if entry is not None else None
+
+
+_cache = SheetCache()
+
+
+def load_sheet(key, fetch, ttl=DEFAULT_TTL, force=False):
+    """프로세스 공용 캐시에서 시트 스냅샷을 가져온다."""
+    return _cache.get(key, fetch, ttl=ttl, force=force)
+
+
+def load_sheets(keys, fetch_many, ttl=DEFAULT_TTL, force=False):
+    """여러 시트를 한 번의 요청으로 묶어서 캐시에 채운다 (SheetCache.get_many)."""
+    return _cache.get_many(keys, fetch_many, ttl=ttl, force=force)
+
+
+def refresh_sheet(key, fetch, warm=None):
+    """예약 갱신용: 다시 받아 와서 파생 데이터까지 준비한 뒤 교체한다 (SheetCache.refresh)."""
+    return _cache.refresh(key, fetch, warm=warm)
+
+
+def a1_sheet_range(name):
+    """시트 이름 → 시트 전체를 가리키는 A1 범위 ('시트''이름')."""
+    return "'" + name.replace("'", "''") + "'"
+
+
+def numericise(value):
+    """gspread.utils.numericise (기본 옵션) 와 같은 규칙의 셀 하나: 쉼표를 지우고 int → float 순으로 읽어 본다.
+
+    "_" 가 들어간 값, 읽지 못한 값, 문자열이 아닌 값은 그대로 둔다 ("nan"·"inf" 는 float 으로 읽힌다).
+    """
+    if not isinstance(value, str) or "_" in value:
+        return value
+    cleaned = value.replace(",", "")
+    try:
+        return int(cleaned)
+    except ValueError:
+        try:
+            return float(cleaned)
+        except ValueError:
+            return value
+
+
+def _text_array(series):
+    """문자열 열 → Arrow 문자열 배열 (빈 값은 null). 문자열이 아닌 값이 섞여 있으면 None."""
+    try:
+        return pa.array(series.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def _mask(array):
+    return pc.fill_null(array, False).to_numpy(zero_copy_only=False)
+
+
+def numericise_frame(df):
+    """문자열 셀 중 숫자로 읽히는 것만 숫자로 바꾼다 (gspread numericise_all 의 열 단위 버전, 결과도 같다).
+
+    흔한 모양(쉼표 뺀 ASCII 정수·소수)은 Arrow 로 열 전체를 한 번에 바꾸고, 나머지 중 숫자일 수도 있는 값
+    (앞뒤 공백, "+5", "nan"·"inf", 전각 숫자, 아주 큰 정수 등)만 값 종류별로 numericise 를 돌린다.
+    열 전체가 숫자면 숫자 dtype, 문자가 섞여 있으면 object 열에 숫자와 문자열이 섞인다 (get_all_records() 의 DataFrame 과 같음).
+    """
+    for col in range(df.shape[1]):
+        series = df.iloc[:, col]
+        if series.dtype != object and not pd.api.types.is_string_dtype(series.dtype):
+            continue
+        cells = series.to_numpy(dtype=object)
+        text = _text_array(series)
+        if text is None:
+            # 숫자·문자가 이미 섞인 열: 문자열 셀만 하나씩
+            converted = [numericise(v) for v in cells]
+            if any(c is not v for c, v in zip(converted, cells)):
+                df.isetitem(col, pd.Series(converted, index=series.index, dtype=object).infer_objects())
+            continue
+
+        if pc.any(pc.match_substring(text, ",")).as_py():
+            text = pc.replace_substring(text, ",", "")
+        is_int = pc.match_substring_regex(text, _INT_PATTERN)
+        is_float = pc.and_not(pc.match_substring_regex(text, _FLOAT_PATTERN), is_int)
+        rest = pc.and_not(pc.match_substring_regex(text, _MAYBE_NUMBER_PATTERN), pc.or_(is_int, is_float))
+        is_int, is_float, rest = _mask(is_int), _mask(is_float), _mask(rest)
+        if not (is_int.any() or is_float.any() or rest.any()):
+            continue
+
+        values = cells.copy()
+        values[is_int] = pc.cast(text.filter(pa.array(is_int)), pa.int64()).to_numpy(zero_copy_only=False)
+        values[is_float] = pc.cast(text.filter(pa.array(is_float)), pa.float64()).to_numpy(zero_copy_only=False)
+        parsed = {}
+        if rest.any():
+            parsed = {v: numericise(v) for v in pd.unique(cells[rest])}
+            values[rest] = [parsed[v] for v in cells[rest]]
+        if is_int.any() or is_float.any() or any(not isinstance(v, str) for v in parsed.values()):
+            df.isetitem(col, pd.Series(values, index=series.index, dtype=object).infer_objects())
+    return df
+
+
+def records_frame(values):
+    """values(2차원 리스트, 첫 행은 헤더) → get_all_records() 와 같은 규칙의 DataFrame."""
+    if not values:
+        return pd.DataFrame()
+    width = max(len(row) for row in values)
+    header = [str(h) for h in values[0]] + [""] * (width - len(values[0]))
+    rows = [row + [""] * (width - len(row)) for row in values[1:]]
+    return numericise_frame(pd.DataFrame(rows, columns=header, dtype=object))
+
+
+def fetch_worksheets(spreadsheet, names):
+    """여러 워크시트를 values.batchGet 한 번으로 받아 이름 → DataFrame dict 로 돌려준다."""
+    if not names:
+        return {}
+    response = spreadsheet.values_batch_get([a1_sheet_range(name) for name in names])
+    value_ranges = response.get("valueRanges", [])
+    # 응답은 요청 순서대로 범위마다 하나. 모자라면 어느 시트가 빠졌는지 알 수 없으니 통째로 실패시킨다
+    if len(value_ranges) != len(names):
+        raise ValueError(f"batchGet 응답 범위 수가 다릅니다: 요청 {len(names)}개, 응답 {len(value_ranges)}개 ({', '.join(names)})")
+    return {name: records_frame(vr.get("values", [])) for name, vr in zip(names, value_ranges)}
+
+
+def prime_sheet(key, data):
+    return _cache.prime(key, data)
+
+
+def has_snapshot(key):
+    return _cache.has(key)
+
+
+def invalidate(key=None):
+    _cache.invalidate(key)
+
+
+def last_error(key):
+    return _cache.last_error(key)
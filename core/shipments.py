@@ -0,0 +1,333 @@
+# 📦 중국 출하리스트 파생 컬럼 (D-Day / 도착여부 / 상태표시)
+#
+# 행마다 apply 하던 계산을 datetime64 배열 연산과 "고유값마다 한 번" 라벨 계산으로 바꿨다.
+# 결과 라벨은 예전 classify_dday / status_emoji 와 같고, 범주형(category)으로 저장한다.
+# 스냅샷 버전 + 기준일 단위로 캐시하므로 클릭마다 다시 계산하지 않는다.
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+from core import schema
+from core.cache import LRUCache
+
+# 데이터 위치 (페이지와 예약 갱신이 같이 씀)
+SPREADSHEET_ID = "19xAdSPAXY-BYPylN5xRMf0d-sJ4u0RBGXpVJ5W82p04"
+WORKSHEET_NAME = "제품 발주 및 출하예정 차트"
+SHEET_TTL = 300
+MIRROR = "shipments"
+KST = ZoneInfo("Asia/Seoul")
+
+ETA_COLUMN = "회사도착 예상일(=ETA+1)"
+DATE_COLUMNS = ["출하예정일", "ETD배타는 날", "회사실제 도착일", ETA_COLUMN]
+
+
+def _clean_header(name):
+    """머리글 안의 줄바꿈·앞뒤 공백을 지운다 (시트 머리글이 여러 줄인 열이 있다)."""
+    return str(name).replace("\n", "").strip()
+
+
+# 날짜 외에 반복되는 값이 많은 열은 category (수량 열은 카드에 원문 그대로 보여 주므로 문자열로 둔다)
+SCHEMA = schema.SheetSchema("📦 중국 출하", {
+    **{col: schema.Column(schema.DATE) for col in DATE_COLUMNS},
+    "PRODUCT": schema.Column(schema.CATEGORY),
+    "모델명": schema.Column(schema.CATEGORY),
+    "상태": schema.Column(schema.CATEGORY),
+    "주문상세": schema.Column(schema.CATEGORY),
+}, header=_clean_header)
+
+ARRIVED = "도착 완료 ✅"
+NOT_ARRIVED = "미도착 🔴"
+
+# 내부용 파생 컬럼: ETA 의 날짜(자정) / 기준일까지 남은 일수
+ETA_DAY = "_eta_day"
+DAYS_TO_ETA = "_days_to_eta"
+
+# 캘린더: 보이는 달 앞뒤로 이 기간 안의 이벤트만 만든다
+CALENDAR_MARGIN_DAYS = 31
+ARRIVED_COLOR = "#2ECC71"
+PENDING_COLOR = "#E74C3C"
+
+_prepared = LRUCache(256 * 1024 * 1024, max_entries=8)
+_stores = LRUCache(256 * 1024 * 1024, max_entries=8)
+_events = LRUCache(64 * 1024 * 1024, max_entries=64)
+
+
+def status_emoji(status):
+    status = str(status).strip()
+    if status == "회사 도착": return "✅ 회사 도착"
+    if "지연" in status: return "⚠️ 지연됨"
+    if "생산" in status: return "⏳ 생산중"
+    return f"🔍 {status}"
+
+
+def _as_text(series):
+    """str(x) 와 같은 문자열 배열 (NaN·NA → 'nan')."""
+    return series.to_numpy(dtype=object, na_value=np.nan).astype(str)
+
+
+def _label_by_unique(values, label):
+    """고유값마다 label() 을 한 번만 불러 범주형 Series 로 만든다."""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    labels = [label(v) for v in uniques]
+    categories = pd.Index(labels).unique()
+    return pd.Categorical.from_codes(categories.get_indexer(labels)[codes], categories=categories)
+
+
+def dday_labels(days, arrived):
+    """days: ETA - 기준일 (일, NaN 허용), arrived: 도착 여부 bool 배열."""
+    missing = np.isnan(days)
+    whole = np.where(missing, 0, days).astype(np.int64)
+    # 경우: 0 = N/A, 1 = 지연(D+), 2 = Today, 3 = D-, 4 = 도착 완료(✅)
+    case = np.select(
+        [missing, (whole < 0) & ~arrived, whole == 0, whole > 0],
+        [0, 1, 2, 3],
+        4,
+    )
+    key = np.where((case == 1) | (case == 3), whole, 0)
+
+    def label(pair):
+        c, d = pair
+        if c == 0: return "N/A"
+        if c == 1: return f"D+{-d} ⚠️"
+        if c == 2: return "Today"
+        if c == 3: return f"D-{d}"
+        return "✅"
+
+    return _label_by_unique(pd.MultiIndex.from_arrays([case, key]), label)
+
+
+def prepare_shipments(df, today):
+    """SCHEMA.load 로 읽은 시트 → 파생 컬럼이 붙은 새 DataFrame (df 는 건드리지 않음)."""
+    # 얕은 복사: 원래 열은 공유하고 (copy-on-write) 파생 열만 이 DataFrame 에 붙는다
+    df = df.copy(deep=False)
+
+    status_text = np.char.strip(_as_text(df["상태"]))
+    arrived = status_text == "회사 도착"
+    df["도착여부"] = pd.Categorical.from_codes(np.where(arrived, 0, 1), categories=[ARRIVED, NOT_ARRIVED])
+
+    eta_day = df[ETA_COLUMN].dt.normalize()
+    days = ((eta_day - pd.Timestamp(today)) / pd.Timedelta(days=1)).to_numpy(dtype=np.float64, na_value=np.nan)
+    df[ETA_DAY] = eta_day
+    df[DAYS_TO_ETA] = days
+    df["D-Day"] = dday_labels(days, arrived)
+    df["상태표시"] = _label_by_unique(_as_text(df["상태"]), status_emoji)
+    return df
+
+
+def prepare_shipments_cached(snapshot, today):
+    """스냅샷 버전과 기준일이 같으면 이전 결과를 그대로 돌려준다 (공유 객체이므로 수정 금지)."""
+    return _prepared.get_or_compute((snapshot.version, today), lambda: prepare_shipments(snapshot.data, today))
+
+
+class ShipmentStore:
+    """ETA 날짜순으로 정렬해 둔 출하 스냅샷. 날짜 조건은 이진 탐색 구간 슬라이스로 답한다.
+
+    frame  : prepare_shipments 결과 전체 (원본 순서, 원본 표 보기용)
+    dated  : ETA 가 있는 행만 ETA 순으로 정렬 (같은 날은 원본 순서 유지), DatetimeIndex
+    daily  : 날짜별 전체/도착 완료/미도착/지연 건수
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        dated = frame[frame[ETA_DAY].notna()]
+        dated = dated.iloc[np.argsort(dated[ETA_DAY].to_numpy(), kind="stable")]
+        self.dated = dated.set_index(pd.DatetimeIndex(dated[ETA_DAY], name=None), drop=False)
+        self._days = self.dated.index.to_numpy()
+
+        arrived = (self.dated["도착여부"] == ARRIVED).to_numpy()
+        delayed = (self.dated[DAYS_TO_ETA].to_numpy() < 0) & ~arrived
+        self.daily = pd.DataFrame({
+            "전체": 1, "도착 완료": arrived.astype(np.int64),
+            "미도착": (~arrived).astype(np.int64), "지연": delayed.astype(np.int64),
+        }, index=self.dated.index).groupby(level=0, sort=True).sum()
+        # 누적합: 기준일 전/후 구간 합계를 O(log n) 으로 얻는다
+        self._daily_days = self.daily.index.to_numpy()
+        self._cumulative = np.vstack([np.zeros((1, 4), dtype=np.int64), self.daily.to_numpy().cumsum(axis=0)])
+
+    def __sizeof__(self):
+        return (
+            int(self.frame.memory_usage(index=True, deep=True).sum())
+            + int(self.dated.memory_usage(index=True, deep=True).sum())
+        )
+
+    def _bounds(self, start, end):
+        """[start, end] (날짜, 양 끝 포함) 에 해당하는 dated 의 위치 구간."""
+        lo = np.searchsorted(self._days, np.datetime64(pd.Timestamp(start).normalize()), side="left")
+        hi = np.searchsorted(self._days, np.datetime64(pd.Timestamp(end).normalize()), side="right")
+        return lo, hi
+
+    def on(self, day):
+        """ETA 가 그 날짜인 출하건."""
+        lo, hi = self._bounds(day, day)
+        return self.dated.iloc[lo:hi]
+
+    def between(self, start, end):
+        """ETA 가 start ~ end (양 끝 포함) 인 출하건, ETA 순."""
+        lo, hi = self._bounds(start, end)
+        return self.dated.iloc[lo:max(lo, hi)]
+
+    def window(self, start, end):
+        """[start, end) 시각 구간 (캘린더용)."""
+        lo = np.searchsorted(self._days, np.datetime64(pd.Timestamp(start)), side="left")
+        hi = np.searchsorted(self._days, np.datetime64(pd.Timestamp(end)), side="left")
+        return self.dated.iloc[lo:max(lo, hi)]
+
+    def day_summary(self, day):
+        """그 날짜의 (전체, 도착 완료, 미도착, 지연) 건수."""
+        i = np.searchsorted(self._daily_days, np.datetime64(pd.Timestamp(day).normalize()))
+        if i < len(self._daily_days) and self._daily_days[i] == np.datetime64(pd.Timestamp(day).normalize()):
+            return tuple(int(v) for v in self.daily.iloc[i])
+        return (0, 0, 0, 0)
+
+    def summary(self, today):
+        """상단 요약: 기준일 이후 전체 + 기준일 전 미도착 건의 (전체, 도착 완료, 미도착, 지연)."""
+        split = np.searchsorted(self._daily_days, np.datetime64(pd.Timestamp(today).normalize()))
+        before = self._cumulative[split]
+        after = self._cumulative[-1] - before
+        overdue = int(before[2])
+        return (int(after[0]) + overdue, int(after[1]), int(after[2]) + overdue, int(after[3]) + overdue)
+
+
+def shipment_store_cached(snapshot, today):
+    """스냅샷 버전 + 기준일마다 한 번만 정렬·집계한다 (공유 객체이므로 수정 금지)."""
+    return _stores.get_or_compute(
+        (snapshot.version, today), lambda: ShipmentStore(prepare_shipments_cached(snapshot, today)),
+    )
+
+
+def calendar_months(df, today):
+    """캘린더 기준 월 선택지 ('YYYY-MM', 데이터의 첫 ETA 달 ~ 마지막 ETA 달, 기준일 달 포함)."""
+    eta = df[ETA_DAY].dropna()
+    first = min(eta.min(), pd.Timestamp(today)) if not eta.empty else pd.Timestamp(today)
+    last = max(eta.max(), pd.Timestamp(today)) if not eta.empty else pd.Timestamp(today)
+    return [str(p) for p in pd.period_range(first, last, freq="M")]
+
+
+def month_range(month):
+    """'YYYY-MM' → (그 달 1일, 다음 달 1일)."""
+    start = pd.Period(month, freq="M").to_timestamp()
+    return start, start + pd.offsets.MonthBegin(1)
+
+
+def calendar_events(df, start, end, aggregate=False):
+    """[start, end) 구간의 ETA 이벤트 목록. aggregate 면 같은 날 2건 이상은 요약 이벤트 하나로."""
+    window = df[(df[ETA_DAY] >= start) & (df[ETA_DAY] < end)]
+    if window.empty:
+        return []
+
+    day = window[ETA_DAY].dt.strftime("%Y-%m-%d")
+    status = window["상태표시"].astype(str)
+    arrived = status.str.contains("도착", regex=False)
+    frame = pd.DataFrame({
+        "title": window["PRODUCT"].astype(str) + " - " + status,
+        "start": day,
+        "end": day,
+        "color": np.where(arrived, ARRIVED_COLOR, PENDING_COLOR),
+        "id": day,
+    })
+    if not aggregate:
+        return frame.to_dict("records")
+
+    counts = day.map(day.value_counts())
+    singles = frame[counts.to_numpy() == 1]
+    grouped = pd.DataFrame({"day": day, "pending": ~arrived}).loc[counts.to_numpy() > 1].groupby("day", sort=True)["pending"].agg(["size", "sum"])
+    summary = pd.DataFrame({
+        "title": "📦 " + grouped["size"].astype(str) + "건 (미도착 " + grouped["sum"].astype(int).astype(str) + ")",
+        "start": grouped.index,
+        "end": grouped.index,
+        "color": np.where(grouped["sum"] > 0, PENDING_COLOR, ARRIVED_COLOR),
+        "id": grouped.index,
+    })
+    return pd.concat([singles, summary], ignore_index=True).to_dict("records")
+
+
+def calendar_events_cached(snapshot, today, df, start, end, aggregate=False):
+    """스냅샷 버전·구간·요약 여부가 같으면 만들어 둔 이벤트 목록을 재사용한다."""
+    key = (snapshot.version, today, start, end, aggregate)
+    return _events.get_or_compute(key, lambda: calendar_events(df, start, end, aggregate))
+
+
+# ---------- 예약 갱신 ----------
+
+def kst_today():
+    return datetime.now(KST).date()
+
+
+def warm_snapshot(snapshot):
+    """예약 갱신에서 교체 전에 부르는 준비 작업: 오늘 기준 정렬·집계 + 이번 달 기본 캘린더 이벤트."""
+    today = kst_today()
+    store = shipment_store_cached(snapshot, today)
+    view_start, view_end = month_range(today.strftime("%Y-%m"))
+    margin = pd.Timedelta(days=CALENDAR_MARGIN_DAYS)
+    start, end = view_start - margin, view_end + margin
+    calendar_events_cached(snapshot, today, store.window(start, end), start, end)
+
+
+# ---------- 카드 ----------
+
+def get_border_color(d_day):
+    if "D+" in d_day: return "#E74C3C"
+    if "D-DAY" in d_day or "Today" in d_day: return "#2ECC71"
+    if "D-1" in d_day or "D-2" in d_day: return "#F4D03F"
+    return "#3498DB"
+
+
+def _border_colors(d_day):
+    """D-Day 범주마다 한 번만 색을 계산해 행 전체로 펼친다."""
+    d_day = d_day.astype("category")
+    colors = [get_border_color(str(c)) for c in d_day.cat.categories]
+    return pd.Series(np.asarray(colors, dtype=object)[d_day.cat.codes.to_numpy()], index=d_day.index)
+
+
+def _field(df, col):
+    return pd.Series(_as_text(df[col]), index=df.index, dtype=object)
+
+
+def shipment_cards(df):
+    """날짜별 출하건 카드 HTML (행마다 한 줄짜리 문자열)."""
+    if df.empty:
+        return []
+    eta = df[ETA_COLUMN].dt.strftime("%Y-%m-%d").astype(object).fillna("N/A")
+    cards = (
+        "<div style='border:3px solid " + _border_colors(df["D-Day"])
+        + "; border-radius:14px; padding:20px; margin:10px; background-color:#fefefe;'>"
+        + "<h4>📦 " + _field(df, "PRODUCT") + "</h4>"
+        + "<div style='font-size:15px; margin-bottom:4px;'><b>모델명:</b> " + _field(df, "모델명") + "</div>"
+        + "<div style='font-size:16px; line-height:1.8;'>"
+        + "🔢 발주수량: " + _field(df, "발주수량") + "개<br>"
+        + "📝 주문상세: " + _field(df, "주문상세") + "<br>"
+        + "📦 상태: " + _field(df, "상태표시") + "<br>"
+        + "🗓 ETA+1: " + eta + "<br>"
+        + "🚚 도착여부: " + _field(df, "도착여부") + "<br>"
+        + "📆 D-Day: " + _field(df, "D-Day")
+        + "</div></div>"
+    )
+    return cards.tolist()
+
+
+_IMMINENT = {2: "🐢 D-2: 도착 임박", 1: "🐇 D-1: 매우 임박!", 0: "🚛 D-DAY: 오늘 도착!"}
+
+
+def upcoming_cards(df):
+    """7일 이내 출하건용 큰 카드 HTML."""
+    if df.empty:
+        return []
+    days = df[DAYS_TO_ETA].astype(int)
+    display = days.map(_IMMINENT).astype(object)
+    display = display.where(display.notna(), "🗖 D-Day: " + _field(df, "D-Day"))
+    cards = (
+        "<div style='border:3px solid " + _border_colors(df["D-Day"])
+        + "; border-radius:14px; padding:26px; margin-bottom:22px; background-color:#fefefe;'>"
+        + "<h3>📦 " + _field(df, "PRODUCT") + "</h3>"
+        + "<div style='font-size:20px; font-weight:bold;'>" + display + "</div>"
+        + "<div style='line-height:2.1; font-size:18px; margin-top:16px;'>"
+        + "🔢 발주수량: " + _field(df, "발주수량") + "개<br>"
+        + "📝 주문상세: " + _field(df, "주문상세") + "<br>"
+        + "📦 상태: " + _field(df, "상태표시") + "<br>"
+        + "🗓 ETA+1: " + df[ETA_COLUMN].dt.strftime("%Y-%m-%d").astype(object)
+        + "<br>🚚 도착여부: " + _field(df, "도착여부")
+        + "</div></div>"
+    )
+    return cards.tolist()
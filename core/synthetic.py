@@ -0,0 +1,170 @@
+# 🧪 벤치마크용 가짜 데이터 (페이지별 시트/엑셀 모양 그대로)
+#
+# 구글 시트에서 받은 값처럼 모두 문자열이고, "12,000원" · "₩12,000" · 빈 칸 · 읽을 수 없는 값이 섞여 있다.
+# 같은 (행 수, seed) 면 항상 같은 데이터가 나온다. 백만 행도 numpy 로 몇 초 안에 만든다.
+import io
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from core.xlsx_stream import write_xlsx
+
+_SURNAMES = np.array(list("김이박최정강조윤장임한오서신권황안송류홍전고문양손배백허남심노하곽성차주우구민유나진지엄채원천방공현함변염여추도소석선설마길연위표명기반라왕금옥육인맹제모탁국어은편용예경봉사부가복태목형피두감호음빈동온좌상갈"))
+_GIVEN = np.array(list("민서지현수영준우진호은하윤성재예원유경혜정희동승태연주아도시채건혁규상석훈지나미소다빈율람찬솔별"))
+_COMPANY_SUFFIXES = np.array(["상사", "무역", "유통", "전자", "테크", "컴퍼니", "몰", "스토어"])
+_MODELS = np.array([f"{prefix}-{number}" for prefix in ("MX", "LG", "SN", "RP", "KT") for number in range(100, 140)])
+_SITES = np.array(["쿠팡", "11번가", "G마켓", "옥션", "스마트스토어", "위메프", "티몬"])
+_REFURB_STATUSES = np.array(["정산완료", "정산대기", "배송중", "반품요청", "취소"])
+_SHIPMENT_STATUSES = np.array(["회사 도착", "생산중", "배송중", "지연", "선적 완료", "통관중", ""])
+_RETURN_METHODS = np.array(["반품", "교환", "수리", "폐기", "재판매"])
+RETURN_SHEETS = ["통합 요약", "1월", "2월", "3월"]
+
+
+def _rng(seed):
+    return np.random.default_rng(seed)
+
+
+def korean_names(n, seed=0):
+    """'김민서' 같은 이름 n 개. 8% 정도는 '(주)성진무역' 처럼 업체 이름."""
+    rng = _rng(seed)
+    names = (
+        rng.choice(_SURNAMES, n).astype(object)
+        + rng.choice(_GIVEN, n).astype(object)
+        + rng.choice(_GIVEN, n).astype(object)
+    )
+    company = rng.random(n) < 0.08
+    names[company] = "(주)" + names[company] + rng.choice(_COMPANY_SUFFIXES, int(company.sum())).astype(object)
+    return names
+
+
+def _amount_text(amounts, rng, noise=0.02, currency=True):
+    """정수 → '12,000원' / '12000' / '₩12,000' 표기 섞기 (currency=False 면 숫자만). noise 비율은 빈 칸·'미정'."""
+    # 서로 다른 값만 문자열로 만들고 펼친다 (금액 종류는 많아야 수천 개)
+    values, inverse = np.unique(amounts, return_inverse=True)
+    plain = values.astype(str).astype(object)[inverse]
+    if currency:
+        commas = np.array([f"{v:,}" for v in values.tolist()], dtype=object)[inverse]
+        style = rng.integers(0, 4, len(amounts))
+        text = np.select([style == 0, style == 1, style == 2], [plain, commas + "원", "₩" + commas], commas)
+    else:
+        text = plain
+    broken = rng.random(len(amounts)) < noise
+    text[broken] = rng.choice(np.array(["", "미정", "-"], dtype=object), int(broken.sum()))
+    return text
+
+
+def _date_text(rng, n, start, days, fmt, blank=0.0):
+    labels = pd.date_range(start, periods=days, freq="D").strftime(fmt).to_numpy(dtype=object)
+    text = labels[rng.integers(0, days, n)]
+    text[rng.random(n) < blank] = ""
+    return text
+
+
+# ---------- 💰 입금자 정산 매칭 ----------
+
+def order_frame(n, seed=0):
+    """사이트 주문내역: 주문번호 · 주문자 · 입금자명 · 결제금액 (입금자 한 명이 여러 번 주문하기도 함)."""
+    rng = _rng(seed)
+    buyers = korean_names(max(n * 2 // 3, 1), seed)
+    who = rng.integers(0, len(buyers), n)
+    payer = buyers[who].copy()
+    # 15% 는 주문자와 다른 사람이 입금 (가족·회사 명의)
+    other = rng.random(n) < 0.15
+    payer[other] = korean_names(int(other.sum()), seed + 1)
+    amounts = rng.integers(1, 500, n) * 1000
+    return pd.DataFrame({
+        "주문번호": np.char.add("ORD", np.arange(1, n + 1).astype(str)),
+        "주문자": buyers[who],
+        "입금자명": payer,
+        "결제금액": _amount_text(amounts, rng),
+    })
+
+
+def deposit_frame(orders, seed=0):
+    """orders 의 입금자 중 90% 가 입금 (일부는 금액이 다르거나 이름 뒤에 메모가 붙음) + 모르는 입금 10%."""
+    rng = _rng(seed + 7)
+    grouped = orders.assign(금액=pd.to_numeric(orders["결제금액"].str.replace(r"[^\d]", "", regex=True), errors="coerce").fillna(0))
+    grouped = grouped.groupby("입금자명", sort=False)["금액"].sum()
+    paid = grouped[rng.random(len(grouped)) < 0.9]
+    names = paid.index.to_numpy(dtype=object)
+    amounts = paid.to_numpy(dtype=np.int64)
+
+    off = rng.random(len(amounts)) < 0.1
+    amounts[off] += rng.integers(-5, 6, int(off.sum())) * 1000
+    memo = rng.random(len(names)) < 0.1
+    names[memo] = names[memo] + rng.choice(np.array(["(입금)", " 님", "_주문"], dtype=object), int(memo.sum()))
+
+    strangers = max(len(names) // 9, 1)
+    names = np.concatenate([names, korean_names(strangers, seed + 11)])
+    amounts = np.concatenate([amounts, rng.integers(1, 300, strangers) * 1000])
+    order = rng.permutation(len(names))
+    names, amounts = names[order], np.abs(amounts[order])
+    return pd.DataFrame({
+        "거래일시": _date_text(rng, len(names), "2026-01-01", 90, "%Y-%m-%d %H:%M"),
+        "내용": names,
+        "입금액": _amount_text(amounts, rng, noise=0.005),
+        "잔액": np.cumsum(amounts),
+    })
+
+
+def workbook(df, sheet_name="Sheet1"):
+    """DataFrame → xlsx bytes (업로드 파일 대신)."""
+    target = io.BytesIO()
+    write_xlsx(target, {sheet_name: (df, {})})
+    return target.getvalue()
+
+
+# ---------- 📦 중국 출하리스트 ----------
+
+def shipment_frame(n, seed=0, today=None):
+    """출하 시트 원본 (열 이름의 줄바꿈 포함). ETA 는 기준일 앞뒤 120일에 흩어 둔다."""
+    rng = _rng(seed)
+    today = pd.Timestamp(today or date.today())
+    start = today - pd.Timedelta(days=120)
+    return pd.DataFrame({
+        "PRODUCT": np.char.add("P", rng.integers(10000, 99999, n).astype(str)),
+        "모델명": rng.choice(_MODELS, n),
+        "발주수량": rng.integers(1, 500, n).astype(str),
+        "주문상세": rng.choice(np.array(["", "AS 부품 포함", "샘플", "긴급"]), n),
+        "AS불량건 요청수량": rng.integers(0, 5, n).astype(str),
+        "실제 출하 수량": rng.integers(1, 500, n).astype(str),
+        "상태": rng.choice(_SHIPMENT_STATUSES, n),
+        "출하예정일": _date_text(rng, n, start, 240, "%Y-%m-%d", blank=0.05),
+        "ETD배타는 날": _date_text(rng, n, start, 240, "%Y-%m-%d", blank=0.1),
+        "회사실제 도착일": _date_text(rng, n, start, 240, "%Y-%m-%d", blank=0.7),
+        "회사도착 예상일\n(=ETA+1)": _date_text(rng, n, start, 240, "%Y-%m-%d", blank=0.05),
+    })
+
+
+# ---------- 🔁 리퍼 정산 분석 ----------
+
+def refurb_frame(n, seed=0):
+    rng = _rng(seed)
+    return pd.DataFrame({
+        "날짜": _date_text(rng, n, "2025-01-01", 365, "%y-%m-%d", blank=0.01),
+        "모델명": rng.choice(_MODELS, n),
+        "사이트": rng.choice(_SITES, n),
+        "거래 상태": rng.choice(_REFURB_STATUSES, n),
+        "주문자": korean_names(n, seed),
+        "정산 금액": _amount_text(rng.integers(5, 900, n) * 1000, rng),
+        "수량": _amount_text(rng.integers(1, 5, n), rng, noise=0.01, currency=False),
+    })
+
+
+# ---------- 📊 반품·교환 분석 ----------
+
+def returns_frames(n, seed=0, sheets=RETURN_SHEETS):
+    """시트 이름 → 시트 원본. 전체 n 행을 시트들에 나눠 담는다."""
+    rng = _rng(seed)
+    sizes = np.diff(np.linspace(0, n, len(sheets) + 1).astype(int))
+    return {
+        name: pd.DataFrame({
+            "접수일": _date_text(rng, size, "2025-01-01", 365, "%Y-%m-%d"),
+            "모델명": rng.choice(_MODELS, size),
+            "처리방식": rng.choice(_RETURN_METHODS, size),
+            "수량": _amount_text(rng.integers(1, 20, size), rng, noise=0.01, currency=False),
+            "고객명": korean_names(size, seed + i),
+        })
+        for i, (name, size) in enumerate(zip(sheets, sizes))
+    }
@@ -0,0 +1,105 @@
+# 🔎 공유 DataFrame 위의 행 뷰 (세션마다 행 위치만 들고 있는다)
+#
+# 스냅샷·큐브의 DataFrame 은 모든 세션이 같이 쓰는 읽기 전용 객체다. 필터 결과를 df[mask] 로
+# 매번 복사하지 않고 (공유 DataFrame, 행 위치 배열) 만 들고 다니다가, 실제로 보여 줄 쪽·내보낼
+# 때만 그 행들을 꺼낸다. 세션이 늘어도 세션마다 늘어나는 메모리는 위치 배열(행당 4바이트) 뿐이다.
+import numpy as np
+import pandas as pd
+
+# 한 번에 꺼내 보여 줄 행 수 (카드 한 쪽 / 표 한 쪽). 벤치마크도 같은 값으로 재므로 여기 둔다
+CARD_PAGE_SIZES = [12, 24, 48, 96]
+TABLE_PAGE_SIZE = 100
+
+
+def _position_dtype(n):
+    return np.int32 if n < 2 ** 31 else np.int64
+
+
+def positions_of(mask):
+    """bool 마스크 → True 인 행 위치 (int32, 20억 행이 넘으면 int64)."""
+    return np.flatnonzero(mask).astype(_position_dtype(len(mask)), copy=False)
+
+
+class RowView:
+    """frame 의 positions 행 (None 이면 전체 행을 원래 순서로). frame 은 공유 객체이므로 수정 금지."""
+
+    __slots__ = ("frame", "positions")
+
+    def __init__(self, frame, positions=None):
+        self.frame = frame
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.frame) if self.positions is None else len(self.positions)
+
+    def __sizeof__(self):
+        return 0 if self.positions is None else self.positions.nbytes
+
+    @property
+    def empty(self):
+        return len(self) == 0
+
+    @property
+    def columns(self):
+        return self.frame.columns
+
+    def series(self, name):
+        """이 뷰의 행들에 해당하는 name 열."""
+        series = self.frame[name]
+        return series if self.positions is None else series.iloc[self.positions]
+
+    def column(self, name):
+        """이 뷰의 행들에 해당하는 name 열 값 (numpy 배열)."""
+        return self.series(name).to_numpy()
+
+    def where(self, mask):
+        """mask(이 뷰의 행 수만큼의 bool 배열)가 True 인 행만."""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.all():
+            return self
+        selected = positions_of(mask)
+        return RowView(self.frame, selected if self.positions is None else self.positions[selected])
+
+    def isin(self, name, values):
+        """name 열 값이 values 중 하나인 행만."""
+        return self.where(self.series(name).isin(values).to_numpy())
+
+    def search(self, query, names=None):
+        """names 열(기본: 전체) 중 하나라도 query 를 포함하는 행만 (대소문자 무시, 문자열·범주형 열만 본다)."""
+        mask = np.zeros(len(self), dtype=bool)
+        for name in names if names is not None else self.columns:
+            series = self.series(name)
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                # 범주 목록에서 먼저 찾고 코드로 펼친다
+                categories = series.cat.categories.astype(str)
+                hit = np.flatnonzero(categories.str.contains(query, case=False, regex=False))
+                mask |= np.isin(series.cat.codes.to_numpy(), hit)
+            elif pd.api.types.is_string_dtype(series.dtype):
+                text = series if series.dtype != object else series.astype(str)
+                mask |= text.str.contains(query, case=False, regex=False, na=False).to_numpy(dtype=bool)
+        return self.where(mask)
+
+    def sort(self, name, descending=False):
+        """name 열 기준으로 정렬한 뷰 (같은 값은 원래 순서, 빈 값은 맨 뒤)."""
+        series = self.series(name).reset_index(drop=True)
+        try:
+            ordered = series.sort_values(ascending=not descending, kind="stable", na_position="last")
+        except TypeError:
+            # 숫자·문자가 섞인 열은 문자열로 비교
+            ordered = series.astype(str).sort_values(ascending=not descending, kind="stable")
+        positions = self.positions
+        if positions is None:
+            positions = np.arange(len(self.frame), dtype=_position_dtype(len(self.frame)))
+        return RowView(self.frame, positions[ordered.index.to_numpy()])
+
+    def slice(self, start, stop):
+        """start ~ stop 번째 행만 DataFrame 으로 (한 쪽 표시용)."""
+        if self.positions is None:
+            return self.frame.iloc[start:stop]
+        return self.frame.iloc[self.positions[start:stop]]
+
+    def to_frame(self):
+        """전체 행 DataFrame. 필터가 없으면 공유 DataFrame 을 그대로 준다 (복사 없음)."""
+        if self.positions is None:
+            return self.frame
+        return self.frame.iloc[self.positions]
@@ -0,0 +1,90 @@
+# 🧩 페이지 공용 Streamlit 위젯
+import math
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import streamlit as st
+
+from core.cache import LRUCache
+from core.views import CARD_PAGE_SIZES, TABLE_PAGE_SIZE
+
+KST = ZoneInfo("Asia/Seoul")
+
+NO_SORT = "(원래 순서)"
+
+# (데이터 키, 열, 검색어, 정렬) → 검색·정렬한 RowView (행 위치만, 세션끼리 공유)
+_arranged = LRUCache(128 * 1024 * 1024, max_entries=64)
+
+
+def refresh_button(key="sheet_refresh"):
+    """사이드바 "지금 새로고침" 버튼. 눌린 재실행에서만 True."""
+    return st.sidebar.button("🔄 지금 새로고침", key=key, help="캐시를 무시하고 구글 시트에서 다시 불러옵니다.")
+
+
+def snapshot_caption(*snapshots):
+    """사이드바에 가장 오래된 스냅샷의 동기화 시각을 표시한다."""
+    fetched = [s.fetched_at for s in snapshots if s is not None]
+    if not fetched:
+        return
+    stamp = datetime.fromtimestamp(min(fetched), KST).strftime("%Y-%m-%d %H:%M:%S")
+    st.sidebar.caption(f"🕒 마지막 동기화: {stamp} (KST)")
+
+
+def paginate(total, page_size, key, label="페이지"):
+    """(시작, 끝) 행 범위. 한 쪽을 넘으면 쪽 번호 입력을 보여 준다."""
+    pages = max(1, math.ceil(total / page_size))
+    if pages == 1:
+        return 0, total
+    page = st.number_input(f"{label} (총 {pages}쪽 · {total:,}건)", min_value=1, max_value=pages, value=1, step=1, key=key)
+    start = (int(page) - 1) * page_size
+    return start, min(start + page_size, total)
+
+
+def card_grid(rows, build_cards, key, columns=3, page_size=CARD_PAGE_SIZES[1]):
+    """현재 쪽의 행만 카드 HTML 로 만들어 한 번의 markdown 으로 보낸다. rows 는 RowView (core/views.py)."""
+    start, stop = paginate(len(rows), page_size, key)
+    cards = build_cards(rows.slice(start, stop))
+    if not cards:
+        return
+    st.markdown(
+        f"<div style='display:grid; grid-template-columns:repeat({columns}, minmax(0, 1fr));'>"
+        + "".join(cards) + "</div>",
+        unsafe_allow_html=True,
+    )
+
+
+def paged_table(rows, key, cache_key=None, columns=None, page_size=TABLE_PAGE_SIZE):
+    """RowView(core/views.py)를 한 쪽씩 보여 주는 표.
+
+    검색(문자열·범주형 열)·정렬은 서버에서 행 위치로만 처리하고, 보이는 쪽의 행만 꺼내 보낸다.
+    cache_key(데이터 버전·필터 상태)를 주면 같은 검색·정렬 결과를 재실행·세션끼리 재사용한다.
+    """
+    names = list(columns) if columns is not None else list(rows.columns)
+    search_col, sort_col, order_col = st.columns([3, 2, 1])
+    query = search_col.text_input("🔍 검색", key=f"{key}_query", placeholder="문자열 열에서 찾기").strip()
+    sort_by = sort_col.selectbox("↕️ 정렬", [NO_SORT] + names, key=f"{key}_sort")
+    descending = order_col.toggle("내림차순", key=f"{key}_descending", disabled=sort_by == NO_SORT)
+
+    if query or sort_by != NO_SORT:
+        def arrange():
+            arranged = rows.search(query, names) if query else rows
+            return arranged.sort(sort_by, descending) if sort_by != NO_SORT else arranged
+
+        if cache_key is None:
+            rows = arrange()
+        else:
+            rows = _arranged.get_or_compute((cache_key, tuple(names), query, sort_by, descending), arrange)
+
+    # 검색으로 행 수가 바뀌면 쪽 번호는 처음부터 (이전 쪽 번호가 범위를 넘지 않도록)
+    start, stop = paginate(len(rows), page_size, key=f"{key}_page_{len(rows)}")
+    page = rows.slice(start, stop)
+    st.dataframe(page[names] if columns is not None else page, use_container_width=True)
+    return rows
+
+
+def numeric_warnings(reports, fill=0):
+    """숫자로 읽지 못한 금액/수량 값이 있으면 열마다 경고를 띄운다 (core.numeric 결과)."""
+    for label, report in reports.items():
+        if report.unparsed:
+            examples = ", ".join(f"'{v}'" for v in report.samples)
+            st.warning(f"⚠️ '{label}' 값 {report.unparsed:,}개를 숫자로 읽지 못해 {fill}(으)로 처리했습니다. (예: {examples})")
@@ -0,0 +1,264 @@
+# 📝 스트리밍 xlsx 작성기
+#
+# openpyxl/xlsxwriter 처럼 셀마다 파이썬 객체를 만들지 않고, 열 단위로 셀 XML 을
+# 한 번에 만들어 zip 스트림에 행 묶음(chunk) 단위로 흘려 쓴다.
+# 서식은 아래 고정 스타일 번호로만 지정한다 (정산 결과 강조용).
+# 정수는 str(int) 로 써서 2**53 을 넘는 주문·계좌번호도 그대로 남고, 날짜·시각은 openpyxl 처럼
+# 엑셀 일련번호 + 날짜 서식 셀로 쓴다 (datetime 은 yyyy-mm-dd h:mm:ss, date 는 yyyy-mm-dd).
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+STYLE_NONE = 0
+STYLE_BOLD = 1          # 굵게
+STYLE_RED = 2           # 빨간 굵은 글씨
+STYLE_HIGHLIGHT = 3     # 노란 배경 + 굵게
+
+CHUNK_ROWS = 50_000
+
+_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# 스타일 번호 + 아래 오프셋 = 같은 글꼴·채우기에 날짜 서식을 붙인 cellXfs 번호
+_DATETIME_OFFSET = 4
+_DATE_OFFSET = 8
+_EXCEL_EPOCH = np.datetime64("1899-12-30", "ns")
+_DAY = np.timedelta64(1, "D")
+
+# (numFmtId, fontId, fillId): 서식 없음 / 굵게 / 빨간 굵게 / 노란 배경 굵게
+_FONT_FILLS = [(0, 0), (1, 0), (2, 0), (1, 2)]
+_CELL_XFS = "".join(
+    f'<xf numFmtId="{fmt}" fontId="{font}" fillId="{fill}" borderId="0" xfId="0"'
+    + (' applyNumberFormat="1"' if fmt else "") + (' applyFont="1"' if font else "") + (' applyFill="1"' if fill else "")
+    + "/>"
+    for fmt in (0, 164, 165) for font, fill in _FONT_FILLS
+)
+
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<styleSheet xmlns="{_NS}">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="yyyy-mm-dd h:mm:ss"/>'
+    '<numFmt numFmtId="165" formatCode="yyyy-mm-dd"/>'
+    '</numFmts>'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><color rgb="00FF0000"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="00FFFF00"/><bgColor rgb="00FFFF00"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    f'<cellXfs count="{3 * len(_FONT_FILLS)}">{_CELL_XFS}</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+_STYLE_ATTR = np.array([""] + [f' s="{i}"' for i in range(1, 3 * len(_FONT_FILLS))], dtype=object)
+
+
+def column_letter(index):
+    """0 → A, 25 → Z, 26 → AA"""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _escape_text(values):
+    text = [v if isinstance(v, str) else str(v) for v in values]
+    # 한 문자열로 합쳐 한 번에 치환한 뒤 다시 나눈다 (셀마다 치환 호출을 피함).
+    # 구분자 \x00 은 XML 에 쓸 수 없는 문자라 값에 없을 때만(= 검사를 통과했을 때만) 안전하다.
+    if _ILLEGAL_XML.search("".join(text)) is None:
+        joined = "\x00".join(text).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        return np.array(joined.split("\x00"), dtype=object) if text else np.array([], dtype=object)
+    return np.array([_ILLEGAL_XML.sub("", escape(v)) for v in text], dtype=object)
+
+
+def _format_floats(values):
+    text = pd.Series(np.asarray(values, dtype=np.float64).astype(str), dtype=object)
+    return text.str.removesuffix(".0").to_numpy(dtype=object, copy=True)
+
+
+def _format_numbers(values, dtype):
+    """숫자 셀 값. 정수는 float64 를 거치지 않고 str(int) 로 (2**53 을 넘어도 정확하게)."""
+    if pd.api.types.is_integer_dtype(dtype):
+        integer = np.uint64 if pd.api.types.is_unsigned_integer_dtype(dtype) else np.int64
+        return np.asarray(values).astype(integer).astype(str).astype(object)
+    text = _format_floats(values)
+    if not pd.api.types.is_float_dtype(dtype):
+        # object 열: 파이썬 int·numpy 정수만 골라 정확한 값으로 바꾼다
+        ints = np.flatnonzero(np.fromiter((isinstance(v, (int, np.integer)) for v in values), dtype=bool, count=len(values)))
+        text[ints] = [str(int(values[i])) for i in ints]
+    return text
+
+
+def _excel_dates(series, values, is_date):
+    """날짜·시각 셀 → (엑셀 일련번호 문자열, date 값인지). 시간대는 떼고 벽시계 시각으로 쓴다."""
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        stamps = series[is_date]
+        if stamps.dt.tz is not None:
+            stamps = stamps.dt.tz_localize(None)
+        stamps = stamps.to_numpy(dtype="datetime64[ns]")
+        date_only = np.zeros(len(stamps), dtype=bool)
+    else:
+        picked = values[is_date]
+        date_only = np.fromiter((not isinstance(v, datetime) for v in picked), dtype=bool, count=len(picked))
+        if any(getattr(v, "tzinfo", None) is not None for v in picked):
+            picked = [pd.Timestamp(v).tz_localize(None) if getattr(v, "tzinfo", None) else v for v in picked]
+        stamps = pd.to_datetime(picked).to_numpy(dtype="datetime64[ns]")
+    return _format_floats((stamps - _EXCEL_EPOCH) / _DAY), date_only
+
+
+def _cells_xml(series, refs, style_ids):
+    """한 열 chunk 의 셀 XML 배열. 빈 값은 서식이 없으면 셀을 생략한다."""
+    n = len(series)
+    out = np.full(n, "", dtype=object)
+    style_attr = _STYLE_ATTR[style_ids]
+    values = series.to_numpy(dtype=object)
+    present = series.notna().to_numpy()
+
+    is_date = np.zeros(n, dtype=bool)
+    if pd.api.types.is_bool_dtype(series.dtype):
+        is_num = np.zeros(n, dtype=bool)
+    elif pd.api.types.is_datetime64_any_dtype(series.dtype):
+        is_num = np.zeros(n, dtype=bool)
+        is_date = present.copy()
+    elif pd.api.types.is_numeric_dtype(series.dtype):
+        is_num = present.copy()
+    else:
+        is_num = np.fromiter(
+            (isinstance(v, (int, float, np.integer, np.floating)) and not isinstance(v, (bool, np.bool_)) for v in values),
+            dtype=bool, count=n,
+        ) & present
+        is_date = np.fromiter(
+            (isinstance(v, (date, np.datetime64)) for v in values), dtype=bool, count=n,
+        ) & present
+    if is_num.any():
+        finite = np.isfinite(np.asarray(values[is_num], dtype=np.float64))
+        num_idx = np.flatnonzero(is_num)[finite]
+        is_num[:] = False
+        is_num[num_idx] = True
+
+    is_text = present & ~is_num & ~is_date
+    if is_text.any():
+        text = _escape_text(values[is_text])
+        nonempty = text != ""
+        idx = np.flatnonzero(is_text)[nonempty]
+        is_text[:] = False
+        is_text[idx] = True
+        out[idx] = ('<c r="' + refs[idx] + '"' + style_attr[idx] + ' t="inlineStr"><is><t xml:space="preserve">'
+                    + text[nonempty] + "</t></is></c>")
+
+    if is_num.any():
+        out[is_num] = ('<c r="' + refs[is_num] + '"' + style_attr[is_num] + "><v>"
+                       + _format_numbers(values[is_num], series.dtype) + "</v></c>")
+
+    if is_date.any():
+        serials, date_only = _excel_dates(series, values, is_date)
+        date_attr = _STYLE_ATTR[style_ids[is_date] + np.where(date_only, _DATE_OFFSET, _DATETIME_OFFSET)]
+        out[is_date] = '<c r="' + refs[is_date] + '"' + date_attr + "><v>" + serials + "</v></c>"
+
+    blank_styled = ~(is_num | is_text | is_date) & (style_attr != "")
+    if blank_styled.any():
+        out[blank_styled] = '<c r="' + refs[blank_styled] + '"' + style_attr[blank_styled] + "/>"
+    return out
+
+
+def _sheet_chunks(df, styles):
+    columns = list(df.columns)
+    letters = [column_letter(i) for i in range(len(columns))]
+
+    header = "".join(
+        f'<c r="{letter}1" t="inlineStr"><is><t xml:space="preserve">{escape(str(name))}</t></is></c>'
+        for letter, name in zip(letters, columns)
+    )
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<worksheet xmlns="{_NS}"><sheetData><row r="1">{header}</row>'
+    )
+
+    for start in range(0, len(df), CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, len(df))
+        row_numbers = np.arange(start + 2, stop + 2).astype(str).astype(object)
+        rows = '<row r="' + row_numbers + '">'
+        for col, letter in enumerate(letters):
+            style_ids = styles.get(col)
+            if style_ids is None:
+                style_ids = np.zeros(stop - start, dtype=np.int64)
+            else:
+                style_ids = np.asarray(style_ids[start:stop], dtype=np.int64)
+            refs = letter + row_numbers
+            rows = rows + _cells_xml(df.iloc[start:stop, col], refs, style_ids)
+        yield "".join(rows + "</row>")
+
+    yield "</sheetData></worksheet>"
+
+
+def write_xlsx(target, sheets):
+    """시트 이름 → (DataFrame, {열 번호: 스타일 번호 배열}) 을 xlsx 로 쓴다.
+
+    target 은 파일 경로나 BytesIO. 메모리는 CHUNK_ROWS 행 분량만 쓴다.
+    """
+    names = list(sheets)
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(names) + 1)
+        )
+        zf.writestr("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f"{overrides}</Types>"
+        ))
+        zf.writestr("_rels/.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+
+        sheet_entries = "".join(
+            f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+            for i, name in enumerate(names, start=1)
+        )
+        zf.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{_NS}" xmlns:r="{_REL_NS}"><sheets>{sheet_entries}</sheets></workbook>'
+        ))
+        sheet_rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, len(names) + 1)
+        )
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'{sheet_rels}<Relationship Id="rId{len(names) + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+            "</Relationships>"
+        ))
+        zf.writestr("xl/styles.xml", _STYLES_XML)
+
+        for i, name in enumerate(names, start=1):
+            df, styles = sheets[name]
+            with zf.open(f"xl/worksheets/sheet{i}.xml", "w", force_zip64=True) as fh:
+                for chunk in _sheet_chunks(df, styles or {}):
+                    fh.write(chunk.encode("utf-8"))
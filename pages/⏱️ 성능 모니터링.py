@@ -0,0 +1,63 @@
+# ⏱️ 페이지별 단계 실행 시간 (core/profiling.py 기록)
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from core import profiling
+from core.scheduler import get_scheduler
+from core.schema import memory_reports
+from core.widgets import KST
+
+st.set_page_config(page_title="⏱️ 성능 모니터링", layout="wide")
+st.title("⏱️ 성능 모니터링")
+st.caption("fetch · parse · transform · match · aggregate · render · export 단계별 p50/p95 (실행마다 같은 단계는 합산)")
+
+# ⚙️ 기록 여부는 MURRAY_PROFILE 환경변수로만 정한다 (프로세스 전체 설정이라 페이지에서 바꾸지 않음)
+with st.sidebar:
+    if profiling.is_enabled():
+        st.caption("단계 기록: 켜짐" + (" · 최대 메모리 포함" if profiling.is_tracking_memory() else ""))
+    source = st.radio("기록 출처", ["이 프로세스", "로그 파일"], help=f"로그 파일: {profiling.PROFILE_LOG}")
+    recent_runs = st.slider("페이지별 최근 실행 수", min_value=5, max_value=500, value=50, step=5)
+    if st.button("🗑️ 기록 지우기"):
+        profiling.clear()
+
+if not profiling.is_enabled():
+    st.info("단계 기록이 꺼져 있습니다. MURRAY_PROFILE=1 (메모리까지는 MURRAY_PROFILE=memory) 로 앱을 실행하세요.")
+
+# 🔄 시트 예약 갱신 상태
+scheduler = get_scheduler()
+if scheduler is not None:
+    with st.expander("🔄 시트 예약 갱신"):
+        status = pd.DataFrame(scheduler.status())
+        status["마지막 성공"] = pd.to_datetime(status["마지막 성공"], unit="s", utc=True).dt.tz_convert(KST)
+        st.dataframe(status, use_container_width=True, hide_index=True)
+
+# 🧱 시트별 열 타입 변환 전/후 메모리 (core/schema.py, 마지막으로 변환한 스냅샷 기준)
+memory = memory_reports()
+if memory:
+    with st.expander("🧱 스냅샷 열별 메모리"):
+        for name, report in memory.items():
+            before, after = report["원본 (MB)"].sum(), report["변환 후 (MB)"].sum()
+            st.markdown(f"**{name}** · {before:,.1f} MB → {after:,.1f} MB")
+            st.dataframe(report.round(2), use_container_width=True, hide_index=True)
+
+records = profiling.recent_records() if source == "이 프로세스" else profiling.load_log()
+summary = profiling.summarize(records, recent_runs=recent_runs)
+if summary.empty:
+    st.warning("아직 기록된 실행이 없습니다. 다른 페이지를 열어 보세요.")
+    st.stop()
+
+# 📊 페이지·단계별 요약
+st.subheader("📊 단계별 요약")
+st.dataframe(summary, use_container_width=True, hide_index=True)
+
+# 📈 p50 / p95 막대
+for page in summary["페이지"].unique():
+    page_summary = summary[summary["페이지"] == page].melt(
+        id_vars="단계", value_vars=["p50 (ms)", "p95 (ms)"], var_name="지표", value_name="ms",
+    )
+    fig = px.bar(page_summary, x="단계", y="ms", color="지표", barmode="group", title=page)
+    st.plotly_chart(fig, use_container_width=True)
+
+# 📋 최근 기록 원본
+with st.expander("📋 최근 기록 (JSON lines)"):
+    st.dataframe(records[-500:][::-1], use_container_width=True)
@@ -1,11 +1,13 @@
 import streamlit as st 
-import pandas as pd
-import io
-from openpyxl.styles import PatternFill, Font
-from openpyxl import load_workbook
+from core.ingest import read_upload
+from core.ledger import get_ledger, ledger_reconcile_cached
+from core.profiling import stage, start_run
+from core.reconcile import reconcile_cached, workbook_bytes_cached
+from core.widgets import numeric_warnings
 
 st.set_page_config(page_title="📊 계산서 자동 정리 프로그램", layout="centered")
 st.title("📊 계산서 자동 정리 프로그램")
+start_run("입금자 정산 매칭")
 
 st.markdown("### 📄 사이트 주문내역 엑셀 업로드")
 order_file = st.file_uploader("", type=["xls", "xlsx"], key="order", label_visibility="collapsed")
@@ -13,128 +15,70 @@ order_file = st.file_uploader("", type=["xls", "xlsx"], key="order", label_visib
 st.markdown("### 💰 계좌 입금내역 엑셀 업로드")
 deposit_file = st.file_uploader("", type=["xls", "xlsx"], key="deposit", label_visibility="collapsed")
 
-if order_file and deposit_file:
-    try:
-        # ✅ 주문내역 처리
-        order_df = pd.read_excel(order_file, engine="openpyxl")
-        order_columns = order_df.columns
-
-        # 자동 컬럼 이름 매핑
-        order_df = order_df.rename(columns={
-            [col for col in order_columns if '입금자' in col][0]: "입금자(사이트)",
-            [col for col in order_columns if '주문자' in col or '회원명' in col][0]: "주문자",
-            [col for col in order_columns if '결제' in col or '구매금액' in col][0]: "총 구매금액"
-        })
-
-        order_df["총 구매금액"] = pd.to_numeric(order_df["총 구매금액"], errors="coerce").fillna(0)
-        order_df["입금자키"] = order_df["입금자(사이트)"].astype(str).str.replace(" ", "").str.strip()
-
-        order_grouped = order_df.groupby("입금자키", as_index=False).agg({
-            "주문자": "first",
-            "입금자(사이트)": "first",
-            "총 구매금액": "sum"
-        })
-
-        # ✅ 입금내역 처리
-        deposit_df = pd.read_excel(deposit_file, engine="openpyxl")
-        deposit_columns = deposit_df.columns
-
-        deposit_df = deposit_df.rename(columns={
-            [col for col in deposit_columns if '내용' in col or '입금자' in col][0]: "입금자(실제)",
-            [col for col in deposit_columns if '금액' in col][0]: "통장입금"
-        })
-
-        deposit_df["통장입금"] = pd.to_numeric(deposit_df["통장입금"], errors="coerce").fillna(0)
-        deposit_df["입금자키"] = deposit_df["입금자(실제)"].astype(str).str.replace(" ", "").str.strip()
-
-        deposit_grouped = deposit_df.groupby("입금자키", as_index=False).agg({
-            "입금자(실제)": "first",
-            "통장입금": "sum"
-        })
-
-        # ✅ 병합 처리
-        matched_rows = []
-        used_deposit_keys = set()
+# 📒 누적 원장: 지난 업로드에서 남은 미결 주문·입금과 함께 맞추고, 이미 기록된 행은 건너뜀 (core/ledger.py)
+use_ledger = st.toggle("📒 누적 원장 사용", value=False, help="지난 업로드의 미결 항목(짝 없는 입금·더/덜 입금)과 함께 정산하고, 이미 원장에 있는 행은 건너뜁니다.")
 
-        for _, order_row in order_grouped.iterrows():
-            site_key = order_row["입금자키"]
-            matched = False
-            for _, deposit_row in deposit_grouped.iterrows():
-                deposit_key = deposit_row["입금자키"]
-                if (site_key in deposit_key or deposit_key in site_key) and deposit_key not in used_deposit_keys:
-                    matched_rows.append({
-                        "주문자": order_row["주문자"],
-                        "입금자(사이트)": order_row["입금자(사이트)"],
-                        "입금자(실제)": deposit_row["입금자(실제)"],
-                        "총 구매금액": order_row["총 구매금액"],
-                        "통장입금": deposit_row["통장입금"]
-                    })
-                    used_deposit_keys.add(deposit_key)
-                    matched = True
-                    break
-            if not matched:
-                matched_rows.append({
-                    "주문자": order_row["주문자"],
-                    "입금자(사이트)": order_row["입금자(사이트)"],
-                    "입금자(실제)": "",
-                    "총 구매금액": order_row["총 구매금액"],
-                    "통장입금": 0
-                })
+# 💡 이름이 안 맞는 주문·입금은 금액으로 한 번 더 (결과에 "매칭" 열: 이름/금액)
+amount_tolerance = None
+if st.toggle("💡 이름이 안 맞으면 금액으로 2차 매칭", value=False, help="이름으로 짝이 없는 주문과 입금 중 금액이 같은 것끼리 먼저, 그다음 허용 오차 안에서 차이가 가장 작은 것끼리 1:1 로 짝짓습니다."):
+    amount_tolerance = st.number_input("허용 오차 (원)", min_value=0, value=0, step=100)
 
-        unmatched = deposit_grouped[~deposit_grouped["입금자키"].isin(used_deposit_keys)]
-        for _, row in unmatched.iterrows():
-            matched_rows.append({
-                "주문자": "",
-                "입금자(사이트)": "",
-                "입금자(실제)": row["입금자(실제)"],
-                "총 구매금액": 0,
-                "통장입금": row["통장입금"]
-            })
-
-        # ✅ 최종 계산
-        result_df = pd.DataFrame(matched_rows)
-        result_df["차이"] = result_df["통장입금"] - result_df["총 구매금액"]
-        result_df = result_df[["주문자", "입금자(사이트)", "입금자(실제)", "총 구매금액", "통장입금", "차이"]].sort_values(by="주문자")
-
-        df_b2b = result_df[~((result_df["주문자"] == "") & (result_df["입금자(사이트)"] == ""))].copy()
-        df_non_b2b = result_df[(result_df["주문자"] == "") & (result_df["입금자(사이트)"] == "")].copy()
-        df_more_paid = df_b2b[df_b2b["차이"] > 0].copy()
-        df_less_paid = df_b2b[df_b2b["차이"] < 0].copy()
+if order_file and deposit_file:
+    try:
+        # ✅ 주문내역 / 입금내역 읽기 (같은 파일이면 캐시 사용)
+        with stage("parse") as timed:
+            order_df, order_hash = read_upload(order_file)
+            deposit_df, deposit_hash = read_upload(deposit_file)
+            timed.rows = len(order_df) + len(deposit_df)
+        cache_key = (order_hash, deposit_hash)
+
+        # ✅ 컬럼 매핑 → 입금자키 그룹화 → 매칭 → 차이 계산 (core/reconcile.py)
+        with stage("match") as timed:
+            if use_ledger:
+                result_df, sheets, reports, ledger_run = ledger_reconcile_cached(cache_key, order_df, deposit_df, amount_tolerance=amount_tolerance)
+                cache_key += ("ledger", ledger_run.run_id)
+            else:
+                result_df, sheets, reports = reconcile_cached(cache_key, order_df, deposit_df, amount_tolerance)
+                cache_key += (amount_tolerance,)
+            timed.rows = len(result_df)
+        numeric_warnings(reports)
+        if use_ledger:
+            st.info(
+                f"📒 새 주문 {ledger_run.new_orders:,}건 · 새 입금 {ledger_run.new_deposits:,}건 "
+                f"(이미 원장에 있어 건너뜀: 주문 {ledger_run.skipped_orders:,}건 · 입금 {ledger_run.skipped_deposits:,}건)  \n"
+                f"이월된 미결: 주문 {ledger_run.carried_orders:,}건 · 입금 {ledger_run.carried_deposits:,}건 / "
+                f"이번에 금액이 맞아 마감: 주문 {ledger_run.matched_orders:,}건 · 입금 {ledger_run.matched_deposits:,}건"
+            )
+            missing_ids = [name for name, found in (("주문내역 (주문번호)", ledger_run.order_id_columns),
+                                                    ("입금내역 (거래일시·잔액)", ledger_run.deposit_id_columns)) if not found]
+            if missing_ids:
+                st.warning(
+                    f"⚠️ {', '.join(missing_ids)}에 행을 구분할 열이 없어 행 전체 내용으로 원장과 비교했습니다. "
+                    "지난번 업로드 이후 금액·이름이 고쳐진 행은 새 행으로 한 번 더 기록됩니다."
+                )
 
         st.success("✅ 정산표가 성공적으로 생성되었습니다!")
-        st.dataframe(result_df, use_container_width=True)
+        with stage("render", rows=len(result_df)):
+            st.dataframe(result_df, use_container_width=True)
 
         # ✅ 엑셀로 저장 및 강조
-        towrite = io.BytesIO()
-        with pd.ExcelWriter(towrite, engine="openpyxl") as writer:
-            df_b2b.to_excel(writer, index=False, sheet_name="B2B")
-            df_non_b2b.to_excel(writer, index=False, sheet_name="B2B 이외")
-            df_more_paid.to_excel(writer, index=False, sheet_name="B2B_더 입금된 건들")
-            df_less_paid.to_excel(writer, index=False, sheet_name="B2B_덜 입금된 건들")
-
-            workbook = writer.book
-            yellow_fill = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
-            red_font = Font(color="FF0000", bold=True)
-            bold_font = Font(bold=True)
-
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                for row in sheet.iter_rows(min_row=2, max_row=sheet.max_row):
-                    diff = row[5].value
-                    if diff is None:
-                        continue
-                    if sheet_name == "B2B_더 입금된 건들" and diff > 0:
-                        row[0].font = bold_font
-                    elif sheet_name == "B2B_덜 입금된 건들" and diff < 0:
-                        row[0].font = red_font
-
-                    if diff > 0:
-                        row[5].fill = yellow_fill
-                        row[5].font = bold_font
-                    elif diff < 0:
-                        row[5].font = red_font
-
-        st.download_button("📥 정산 결과 다운로드", towrite.getvalue(), file_name="정산결과(강조완료).xlsx")
+        with stage("export", rows=len(result_df)):
+            workbook = workbook_bytes_cached(cache_key, sheets)
+        st.download_button("📥 정산 결과 다운로드", workbook, file_name="정산결과(강조완료).xlsx")
 
     except Exception as e:
         st.error(f"❌ 오류 발생: {e}")
+
+# 📒 원장 미결 항목 (손으로 정리한 건 마감 처리)
+if use_ledger:
+    with st.expander("📒 원장 미결 항목"):
+        ledger = get_ledger()
+        open_orders, open_deposits = ledger.open_items()
+        st.markdown(f"**미결 주문** {len(open_orders):,}명 · **미결 입금** {len(open_deposits):,}명")
+        st.dataframe(open_orders, use_container_width=True, hide_index=True)
+        st.dataframe(open_deposits, use_container_width=True, hide_index=True)
+        close_orders = st.multiselect("마감할 주문 입금자키", open_orders["입금자키"].tolist())
+        close_deposits = st.multiselect("마감할 입금 입금자키", open_deposits["입금자키"].tolist())
+        if (close_orders or close_deposits) and st.button("✅ 선택 항목 마감"):
+            closed_orders, closed_deposits = ledger.close(close_orders, close_deposits)
+            st.success(f"마감: 주문 {closed_orders:,}건 · 입금 {closed_deposits:,}건")
@@ -1,64 +1,68 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 import plotly.express as px
-import os
-import json
+from core.datasource import load_worksheet_titles, load_worksheets
+from core.figures import figure_cached
+from core.profiling import stage, start_run
+from core.returns import DEFAULT_SHEETS, SCHEMA, SHEET_TTL, SPREADSHEET_ID, returns_cube_cached
+from core.scheduler import start_refresh_scheduler
+from core.widgets import numeric_warnings, paged_table, refresh_button, snapshot_caption
 
-# 🔐 Railway 환경변수 기반 인증 처리
-service_account_info = json.loads(os.environ["GOOGLE_CREDS"])
-scoped_credentials = Credentials.from_service_account_info(
-    service_account_info,
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-)
-gc = gspread.authorize(scoped_credentials)
-
-# ✅ 고정된 시트 URL → sheet_id만 추출
-sheet_url = "https://docs.google.com/spreadsheets/d/1GZCJuWRcYQgCU7iWMW-fg6tUhJ0WXbcDPb4yKi7Tx_M/edit?usp=sharing"
-sheet_id = sheet_url.split("/d/")[1].split("/")[0]
+# ✅ 고정된 시트 (core/returns.py 의 SHEET_URL 에서 sheet_id 추출)
+sheet_id = SPREADSHEET_ID
 
 # 설정
 st.set_page_config(page_title="📊 고정 시트 대시보드", layout="wide")
 st.title("📊 구글 시트 대시보드")
+start_run("반품·교환 분석")
+start_refresh_scheduler()
 
 try:
-    # 구글 시트 열기
-    sh = gc.open_by_key(sheet_id)
-    sheet_names = [ws.title for ws in sh.worksheets()]
-    selected_sheets = st.multiselect("📄 병합할 시트를 선택하세요:", sheet_names, default=["통합 요약"])
-
-    # 시트 병합
-    df_list = []
-    for name in selected_sheets:
-        ws = sh.worksheet(name)
-        temp_df = pd.DataFrame(ws.get_all_records())
-        temp_df["시트이름"] = name
-        df_list.append(temp_df)
-
-    if df_list:
-        df = pd.concat(df_list, ignore_index=True)
-
-        # 🔍 필터 UI
-        with st.expander("🔍 필터 열기/닫기"):
-            if "처리방식" in df.columns:
-                처리방식_선택 = st.multiselect("처리방식 필터", df["처리방식"].unique(), default=df["처리방식"].unique())
-                df = df[df["처리방식"].isin(처리방식_선택)]
-
-            if "모델명" in df.columns:
-                고유모델명 = sorted(df["모델명"].dropna().unique())
+    # 구글 시트 열기 (시트 목록·시트별 데이터 모두 프로세스 공용 캐시)
+    force = refresh_button()
+
+    with stage("fetch"):
+        names_snapshot = load_worksheet_titles(sheet_id, ttl=SHEET_TTL, force=force)
+    sheet_names = names_snapshot.data
+    selected_sheets = st.multiselect("📄 병합할 시트를 선택하세요:", sheet_names, default=[name for name in DEFAULT_SHEETS if name in sheet_names])
+
+    # 시트 데이터 (캐시에 없는 시트들은 한 번의 batch 요청으로 같이 받아 옴)
+    with stage("fetch") as timed:
+        sheet_snapshots = load_worksheets(sheet_id, selected_sheets, ttl=SHEET_TTL, force=force, schema=SCHEMA)
+        timed.rows = sum(len(s.data) for s in sheet_snapshots)
+    snapshots = [names_snapshot] + sheet_snapshots
+    snapshot_caption(*snapshots)
+
+    if sheet_snapshots:
+        # 시트 병합 + 수량 정제 + 집계 큐브 (선택한 시트 스냅샷 조합마다 한 번, core/returns.py)
+        with stage("transform") as timed:
+            cube, reports = returns_cube_cached(selected_sheets, sheet_snapshots)
+            timed.rows = len(cube.frame)
+        numeric_warnings(reports)
+        view = cube.view()
+
+        # 🔍 필터 UI (행이 아니라 큐브 칸에 거는 필터)
+        with st.expander("🔍 필터 열기/닫기"), stage("aggregate", rows=len(cube.cells)):
+            if view.has("처리방식"):
+                처리방식_목록 = view.members("처리방식", dropna=False)
+                처리방식_선택 = st.multiselect("처리방식 필터", 처리방식_목록, default=처리방식_목록)
+                view = view.where("처리방식", 처리방식_선택)
+
+            if view.has("모델명"):
+                고유모델명 = sorted(view.members("모델명"))
                 선택된모델 = st.selectbox("🔍 모델명 자동완성 선택:", options=["(전체 보기)"] + 고유모델명)
                 if 선택된모델 != "(전체 보기)":
-                    df = df[df["모델명"] == 선택된모델]
+                    view = view.where("모델명", [선택된모델])
 
         # 📊 통계 요약
         with st.expander("📊 통계 요약"):
-            total_qty = df["수량"].sum() if "수량" in df else 0
-            avg_qty = df["수량"].mean() if "수량" in df else 0
-            max_qty = df["수량"].max() if "수량" in df else 0
-            row_count = len(df)
-            unique_models = df["모델명"].nunique() if "모델명" in df else 0
-            unique_methods = df["처리방식"].nunique() if "처리방식" in df else 0
+            has_qty = view.has("수량")
+            total_qty = view.total("수량") if has_qty else 0
+            avg_qty = view.mean("수량") if has_qty else 0
+            max_qty = view.max("수량") if has_qty else 0
+            row_count = view.count()
+            unique_models = len(view.members("모델명")) if view.has("모델명") else 0
+            unique_methods = len(view.members("처리방식")) if view.has("처리방식") else 0
 
             st.metric("총 수량", f"{total_qty:,}")
             st.metric("평균 수량", f"{avg_qty:.2f}")
@@ -67,44 +71,62 @@ try:
             st.metric("고유 모델 수", f"{unique_models}개")
             st.metric("처리방식 수", f"{unique_methods}개")
 
-        # 📂 시트별 보기
-        for 시트이름 in df["시트이름"].unique():
-            with st.expander(f"📂 {시트이름}"):
-                partial_df = df[df["시트이름"] == 시트이름]
-                st.dataframe(partial_df, use_container_width=True)
-
-        # 📊 고급 차트
-        if "수량" in df.columns and pd.api.types.is_numeric_dtype(df["수량"]):
-            st.markdown("### 📊 시트별 처리방식 수량")
-            chart_data = df.groupby(["시트이름", "처리방식"])["수량"].sum().reset_index()
-            fig = px.bar(chart_data, x="처리방식", y="수량", color="시트이름", barmode="group", title="시트별 처리방식별 수량")
-            st.plotly_chart(fig, use_container_width=True)
-
-            st.markdown("### 📦 수량 기준 Top 10 모델")
-            top_models = df.groupby("모델명")["수량"].sum().nlargest(10).reset_index()
-            fig_top = px.bar(top_models, x="모델명", y="수량", title="Top 10 모델명 by 수량")
-            st.plotly_chart(fig_top, use_container_width=True)
-
-            st.markdown("### 🥧 처리방식별 비율 비교")
-            col1, col2 = st.columns(2)
-
-            with col1:
-                st.subheader("✅ 수량 기준 비율")
-                pie_data_qty = df.groupby("처리방식")["수량"].sum().reset_index()
-                fig_pie_qty = px.pie(pie_data_qty, values="수량", names="처리방식", title="수량 기준 비율")
-                st.plotly_chart(fig_pie_qty, use_container_width=True)
-
-            with col2:
-                st.subheader("✅ 건수 기준 비율")
-                pie_data_count = df["처리방식"].value_counts().reset_index()
-                pie_data_count.columns = ["처리방식", "건수"]
-                fig_pie_count = px.pie(pie_data_count, values="건수", names="처리방식", title="건수 기준 비율")
-                st.plotly_chart(fig_pie_count, use_container_width=True)
-
-            st.markdown("### 🔥 시트별 처리방식별 수량 Heatmap")
-            pivot = df.pivot_table(index="처리방식", columns="시트이름", values="수량", aggfunc="sum").fillna(0)
-            fig_heat = px.imshow(pivot, text_auto=True, title="시트-처리방식별 수량 Heatmap")
-            st.plotly_chart(fig_heat, use_container_width=True)
+        # 📂 시트별 보기 (원본 행). 접힌 expander 도 본문은 매번 실행되므로 토글로 펼친 시트만
+        #    행을 꺼내고, 그것도 보이는 쪽만 보낸다.
+        data_key = (tuple(s.version for s in sheet_snapshots), tuple(selected_sheets))
+        for 시트이름 in view.members("시트이름"):
+            sheet_view = view.where("시트이름", [시트이름])
+            if st.toggle(f"📂 {시트이름} ({sheet_view.count():,}건)", key=f"sheet_open_{시트이름}"):
+                with stage("render") as timed:
+                    partial = sheet_view.rows()
+                    timed.rows = len(partial)
+                    paged_table(partial, key=f"sheet_rows_{시트이름}", cache_key=data_key + (sheet_view.state(),))
+
+        # 📊 고급 차트: (시트 스냅샷 조합, 필터 상태, 차트 id) 가 같으면 만들어 둔 Figure 재사용 (core/figures.py)
+        chart_key = (tuple(s.version for s in sheet_snapshots), tuple(selected_sheets), view.state())
+
+        def sheet_method_bar():
+            chart_data = view.rollup(["시트이름", "처리방식"], "수량").reset_index()
+            return px.bar(chart_data, x="처리방식", y="수량", color="시트이름", barmode="group", title="시트별 처리방식별 수량")
+
+        def top_models_bar():
+            top_models = view.rollup("모델명", "수량").nlargest(10).reset_index()
+            return px.bar(top_models, x="모델명", y="수량", title="Top 10 모델명 by 수량")
+
+        def method_quantity_pie():
+            pie_data_qty = view.rollup("처리방식", "수량").reset_index()
+            return px.pie(pie_data_qty, values="수량", names="처리방식", title="수량 기준 비율")
+
+        def method_count_pie():
+            pie_data_count = view.rollup("처리방식", sort=False).sort_values(ascending=False).reset_index()
+            pie_data_count.columns = ["처리방식", "건수"]
+            return px.pie(pie_data_count, values="건수", names="처리방식", title="건수 기준 비율")
+
+        def sheet_method_heatmap():
+            pivot = view.rollup(["처리방식", "시트이름"], "수량").unstack("시트이름").fillna(0)
+            return px.imshow(pivot, text_auto=True, title="시트-처리방식별 수량 Heatmap")
+
+        with stage("render", rows=view.count()):
+            if view.has("수량"):
+                st.markdown("### 📊 시트별 처리방식 수량")
+                st.plotly_chart(figure_cached(chart_key, "sheet_method_bar", sheet_method_bar), use_container_width=True)
+
+                st.markdown("### 📦 수량 기준 Top 10 모델")
+                st.plotly_chart(figure_cached(chart_key, "top_models_bar", top_models_bar), use_container_width=True)
+
+                st.markdown("### 🥧 처리방식별 비율 비교")
+                col1, col2 = st.columns(2)
+
+                with col1:
+                    st.subheader("✅ 수량 기준 비율")
+                    st.plotly_chart(figure_cached(chart_key, "method_quantity_pie", method_quantity_pie), use_container_width=True)
+
+                with col2:
+                    st.subheader("✅ 건수 기준 비율")
+                    st.plotly_chart(figure_cached(chart_key, "method_count_pie", method_count_pie), use_container_width=True)
+
+                st.markdown("### 🔥 시트별 처리방식별 수량 Heatmap")
+                st.plotly_chart(figure_cached(chart_key, "sheet_method_heatmap", sheet_method_heatmap), use_container_width=True)
 
 except Exception as e:
     st.error(f"❌ 오류 발생: {e}")
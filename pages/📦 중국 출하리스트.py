@@ -1,197 +1,118 @@
 # ✅ 중국 출하리스트 전체 필터 대시보드 (도착 여부와 관계없이 모델명 다중 검색 가능)
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from datetime import timedelta
 from streamlit_calendar import calendar
-import os
-import json
+from core.datasource import load_worksheet
+from core.profiling import stage, start_run
+from core.scheduler import start_refresh_scheduler
+from core.shipments import (
+    CALENDAR_MARGIN_DAYS, MIRROR, SCHEMA, SHEET_TTL, SPREADSHEET_ID, WORKSHEET_NAME, calendar_events_cached,
+    calendar_months, kst_today, month_range, shipment_cards, shipment_store_cached, upcoming_cards,
+)
+from core.views import RowView
+from core.widgets import CARD_PAGE_SIZES, card_grid, paged_table, refresh_button, snapshot_caption
 
 # ✅ 날짜 및 페이지 설정
-today = datetime.now(ZoneInfo("Asia/Seoul")).date()
+today = kst_today()
 today_str = today.strftime("%Y-%m-%d")
 st.set_page_config(page_title="중국 출하 리스트 (ETA 기준)", layout="wide")
 st.title("📦 중국 출하 리스트 (📅 ETA+1 기준 전체 검색 포함)")
 st.markdown(f"### ⏰ 기준일: **{today_str} (KST)**")
-
-# ✅ 구글 인증
-if "gcp_service_account" in os.environ:
-    SERVICE_ACCOUNT_INFO = json.loads(os.environ["gcp_service_account"])
-else:
-    SERVICE_ACCOUNT_INFO = st.secrets["gcp_service_account"]
-
-credentials = Credentials.from_service_account_info(
-    SERVICE_ACCOUNT_INFO,
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-)
-gc = gspread.authorize(credentials)
-
-# ✅ 데이터 불러오기
-SPREADSHEET_ID = "19xAdSPAXY-BYPylN5xRMf0d-sJ4u0RBGXpVJ5W82p04"
-worksheet = gc.open_by_key(SPREADSHEET_ID).worksheet("제품 발주 및 출하예정 차트")
-data = worksheet.get_all_records()
-df = pd.DataFrame(data)
-
-# ✅ 전처리
-df.columns = df.columns.str.replace('\n', '', regex=False).str.strip()
-df["출하예정일"] = pd.to_datetime(df["출하예정일"], errors="coerce")
-df["ETD배타는 날"] = pd.to_datetime(df["ETD배타는 날"], errors="coerce")
-df["회사실제 도착일"] = pd.to_datetime(df["회사실제 도착일"], errors="coerce")
-df["회사도착 예상일(=ETA+1)"] = pd.to_datetime(df["회사도착 예상일(=ETA+1)"], errors="coerce")
-
-# ✅ 도착여부 (상태 기반)
-df["도착여부"] = df["상태"].apply(lambda x: "도착 완료 ✅" if str(x).strip() == "회사 도착" else "미도착 🔴")
-
-# ✅ D-Day 계산
-def classify_dday(row):
-    eta = row["회사도착 예상일(=ETA+1)"]
-    if pd.isna(eta): return "N/A"
-    if eta.date() < today and row["도착여부"] == "미도착 🔴":
-        return f"D+{(today - eta.date()).days} ⚠️"
-    elif eta.date() == today:
-        return "Today"
-    elif eta.date() > today:
-        return f"D-{(eta.date() - today).days}"
-    return "✅"
-
-df["D-Day"] = df.apply(classify_dday, axis=1)
-
-# ✅ 상태 이모지 변환
-def status_emoji(status):
-    status = str(status).strip()
-    if status == "회사 도착": return "✅ 회사 도착"
-    if "지연" in status: return "⚠️ 지연됨"
-    if "생산" in status: return "⏳ 생산중"
-    return f"🔍 {status}"
-
-df["상태표시"] = df["상태"].apply(status_emoji)
-
-# ✅ 테두리 색상 함수
-def get_border_color(d_day):
-    if "D+" in d_day: return "#E74C3C"
-    if "D-DAY" in d_day or "Today" in d_day: return "#2ECC71"
-    if "D-1" in d_day or "D-2" in d_day: return "#F4D03F"
-    return "#3498DB"
-
-# ✅ 상단 요약 (미래 or 미도착 기준 필터링)
-filtered_df = df[
-    df["회사도착 예상일(=ETA+1)"].notna() &
-    (
-        (df["회사도착 예상일(=ETA+1)"].dt.date >= today) |
-        ((df["회사도착 예상일(=ETA+1)"].dt.date < today) & (df["도착여부"] != "도착 완료 ✅"))
+start_run("중국 출하리스트")
+start_refresh_scheduler()
+
+# ✅ 데이터 불러오기 (데이터 소스는 MURRAY_DATA_SOURCE 로 선택, 기본은 구글 시트)
+#    예약 갱신(core/scheduler.py)이 TTL 전에 미리 받아 정렬·집계까지 해 둔다
+with stage("fetch") as timed:
+    snapshot = load_worksheet(
+        SPREADSHEET_ID, WORKSHEET_NAME, ttl=SHEET_TTL, force=refresh_button(), mirror=MIRROR, schema=SCHEMA,
     )
-]
+    timed.rows = len(snapshot.data)
+snapshot_caption(snapshot)
+
+# ✅ 전처리 + 도착여부 / D-Day / 상태표시 + ETA 순 정렬·날짜별 집계 (스냅샷·기준일마다 한 번, core/shipments.py)
+with stage("transform") as timed:
+    store = shipment_store_cached(snapshot, today)
+    df = store.frame
+    timed.rows = len(df)
 
+# ✅ 상단 요약 (미래 or 미도착 기준, 날짜별 집계의 누적합으로 계산)
+total, arrived_count, pending_count, delayed_count = store.summary(today)
 col1, col2, col3, col4 = st.columns(4)
-col1.metric("전체 건수", len(filtered_df))
-col2.metric("도착 완료", sum(filtered_df["도착여부"] == "도착 완료 ✅"))
-col3.metric("미도착", sum(filtered_df["도착여부"] == "미도착 🔴"))
-col4.metric("💼 지연 건", sum(filtered_df["D-Day"].str.contains("D\\+")))
+col1.metric("전체 건수", total)
+col2.metric("도착 완료", arrived_count)
+col3.metric("미도착", pending_count)
+col4.metric("💼 지연 건", delayed_count)
 
 # ✅ 캘린더
 st.subheader("🗓 ETA 일정 캘린더 (달력 스타일 뷰)")
-events = []
-for _, row in df.iterrows():
-    eta = row["회사도착 예상일(=ETA+1)"]
-    if pd.isna(eta): continue
-    status = row["상태표시"]
-    product = row["PRODUCT"]
-    color = "#2ECC71" if "도착" in status else "#E74C3C"
-    events.append({
-        "title": f"{product} - {status}",
-        "start": eta.strftime("%Y-%m-%d"),
-        "end": eta.strftime("%Y-%m-%d"),
-        "color": color,
-        "id": eta.strftime("%Y-%m-%d")
-    })
+with st.sidebar.expander("🗓 캘린더 설정"):
+    margin_days = st.number_input("기준 월 앞뒤 표시 기간(일)", min_value=0, max_value=365, value=CALENDAR_MARGIN_DAYS)
+    aggregate_events = st.toggle("같은 날 출하건 묶어서 보기", value=False)
+
+# 기준 월 앞뒤 구간의 이벤트만 만들어 보낸다 (스냅샷 버전별 캐시)
+months = calendar_months(df, today)
+calendar_month = st.selectbox("📅 캘린더 기준 월", months, index=months.index(today.strftime("%Y-%m")))
+view_start, view_end = month_range(calendar_month)
+window_start, window_end = view_start - pd.Timedelta(days=margin_days), view_end + pd.Timedelta(days=margin_days)
+with stage("aggregate") as timed:
+    events = calendar_events_cached(
+        snapshot, today, store.window(window_start, window_end), window_start, window_end,
+        aggregate=aggregate_events,
+    )
+    timed.rows = len(events)
 
-calendar(events=events, options={
-    "initialView": "dayGridMonth",
-    "locale": "ko",
-    "height": 600,
-    "headerToolbar": {"start": "title", "center": "", "end": "today prev,next"}
-}, key="calendar_view")
+with stage("render", rows=len(events)):
+    calendar(events=events, options={
+        "initialView": "dayGridMonth",
+        "initialDate": view_start.strftime("%Y-%m-%d"),
+        "locale": "ko",
+        "height": 600,
+        "headerToolbar": {"start": "title", "center": "", "end": "today prev,next"}
+    }, key=f"calendar_view_{calendar_month}")
 
 # ✅ 사이드바 필터 (과거 포함 + 다중 선택)
 st.sidebar.markdown("## 🔎 날짜 및 모델명 필터")
 selected_date = st.sidebar.date_input("출하 예정일 선택", value=today)
+day_total, day_arrived, day_pending, day_delayed = store.day_summary(selected_date)
+st.sidebar.caption(f"📊 {selected_date}: 전체 {day_total} · 도착 완료 {day_arrived} · 미도착 {day_pending} · 지연 {day_delayed}")
 all_models = sorted(df["모델명"].dropna().unique())
 selected_models = st.sidebar.multiselect("📦 모델명 검색", all_models)
 
-# ✅ 필터 적용
-matched = df[df["회사도착 예상일(=ETA+1)"].dt.date == selected_date]
+# ✅ 필터 적용 (공유 스냅샷 위의 행 뷰, 카드로 그릴 쪽만 꺼냄)
+matched = RowView(store.on(selected_date))
 if selected_models:
-    matched = matched[matched["모델명"].isin(selected_models)]
+    matched = matched.isin("모델명", selected_models)
+
+arrived = matched.where(matched.column("도착여부") == "도착 완료 ✅")
+not_arrived = matched.where(matched.column("도착여부") == "미도착 🔴")
 
-arrived = matched[matched["도착여부"] == "도착 완료 ✅"]
-not_arrived = matched[matched["도착여부"] == "미도착 🔴"]
+# ✅ 카드 출력 (현재 쪽의 카드만 한 번에 그림)
+card_page_size = st.sidebar.selectbox("🃏 한 쪽에 보일 카드 수", CARD_PAGE_SIZES, index=1)
 
-# ✅ 카드 출력 함수
-def render_cards(df, title, color):
-    if df.empty: return
+def render_cards(rows, title, color, key):
+    if rows.empty: return
     st.markdown("---")
     st.markdown(f"## {color} {selected_date} {title} 출하건")
-    cols = st.columns(3)
-    for i, (_, row) in enumerate(df.iterrows()):
-        eta = row["회사도착 예상일(=ETA+1)"]
-        d_day = row["D-Day"]
-        border_color = get_border_color(d_day)
-        with cols[i % 3]:
-            st.markdown(f"""
-            <div style='border:3px solid {border_color}; border-radius:14px; padding:20px; margin:10px; background-color:#fefefe;'>
-                <h4>📦 {row['PRODUCT']}</h4>
-                <div style='font-size:15px; margin-bottom:4px;'>
-                    <b>모델명:</b> {row['모델명']}
-                </div>
-                <div style='font-size:16px; line-height:1.8;'>
-                    🔢 발주수량: {row['발주수량']}개<br>
-                    📝 주문상세: {row['주문상세']}<br>
-                    📦 상태: {row['상태표시']}<br>
-                    🗓 ETA+1: {eta.date() if pd.notna(eta) else "N/A"}<br>
-                    🚚 도착여부: {row['도착여부']}<br>
-                    📆 D-Day: {d_day}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    card_grid(rows, shipment_cards, key=key, columns=3, page_size=card_page_size)
 
-render_cards(not_arrived, "미도착", "🔴")
-render_cards(arrived, "도착 완료", "✅")
+with stage("render", rows=len(matched)):
+    render_cards(not_arrived, "미도착", "🔴", key="cards_not_arrived")
+    render_cards(arrived, "도착 완료", "✅", key="cards_arrived")
 
 # ✅ 개별 카드 뷰 (7일 이내)
 st.subheader("📦 개별 출하 현황 (ETA+1 기준 7일 이내)")
-for _, row in df.sort_values("회사도착 예상일(=ETA+1)").iterrows():
-    eta = row["회사도착 예상일(=ETA+1)"]
-    d_day = row["D-Day"]
-    if pd.isna(eta): continue
-    days_to_eta = (eta.date() - today).days
-    if not (0 <= days_to_eta <= 7): continue
-    d_day_display = {
-        2: "🐢 D-2: 도착 임박",
-        1: "🐇 D-1: 매우 임박!",
-        0: "🚛 D-DAY: 오늘 도착!"
-    }.get(days_to_eta, f"🗖 D-Day: {d_day}")
-    border_color = get_border_color(d_day)
-    st.markdown(f"""
-    <div style='border:3px solid {border_color}; border-radius:14px; padding:26px; margin-bottom:22px; background-color:#fefefe;'>
-        <h3>📦 {row['PRODUCT']}</h3>
-        <div style='font-size:20px; font-weight:bold;'>{d_day_display}</div>
-        <div style='line-height:2.1; font-size:18px; margin-top:16px;'>
-            🔢 발주수량: {row['발주수량']}개<br>
-            📝 주문상세: {row['주문상세']}<br>
-            📦 상태: {row['상태표시']}<br>
-            🗓 ETA+1: {eta.date()}<br>
-            🚚 도착여부: {row['도착여부']}
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+upcoming = RowView(store.between(today, today + timedelta(days=7)))
+with stage("render", rows=len(upcoming)):
+    card_grid(upcoming, upcoming_cards, key="cards_upcoming", columns=1, page_size=card_page_size)
 
-# ✅ 원본 표 보기
+# ✅ 원본 표 보기 (켰을 때만, 보이는 쪽만)
 if st.checkbox("📄 원본 표 보기"):
-    st.dataframe(df[[
-        "PRODUCT", "발주수량", "주문상세", "AS불량건 요청수량",
-        "실제 출하 수량", "출하예정일", "ETD배타는 날",
-        "상태표시", "회사도착 예상일(=ETA+1)", "회사실제 도착일",
-        "도착여부", "D-Day"
-    ]], use_container_width=True)
+    with stage("render", rows=len(df)):
+        paged_table(RowView(df), key="raw_table", cache_key=(snapshot.version, today), columns=[
+            "PRODUCT", "발주수량", "주문상세", "AS불량건 요청수량",
+            "실제 출하 수량", "출하예정일", "ETD배타는 날",
+            "상태표시", "회사도착 예상일(=ETA+1)", "회사실제 도착일",
+            "도착여부", "D-Day"
+        ])
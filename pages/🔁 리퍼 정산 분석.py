@@ -1,78 +1,74 @@
+import contextvars
+
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 import plotly.express as px
-import re
-import os
-import json
-
-# 🔐 Railway 환경변수 인증 처리
-service_account_info = json.loads(os.environ["gcp_service_account"])
-credentials = Credentials.from_service_account_info(
-    service_account_info,
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-)
-gc = gspread.authorize(credentials)
-
-# 📥 구글 시트 불러오기
-SPREADSHEET_ID = "1O1eIiuYXjpTBclv-4_RYKvmJELglr7cGUfQ18eWUeVE"
-WORKSHEET_NAME = "배송및 정산대기중"
-worksheet = gc.open_by_key(SPREADSHEET_ID).worksheet(WORKSHEET_NAME)
-records = worksheet.get_all_records()
-df = pd.DataFrame(records)
-
-# 🧼 데이터 정제
-def clean_price(value):
-    if isinstance(value, str):
-        return int(re.sub(r"[^\d]", "", value)) if re.sub(r"[^\d]", "", value) else 0
-    return int(value) if isinstance(value, (int, float)) else 0
-
-df.fillna("", inplace=True)
-for col in ["정산 금액", "수량"]:
-    if col in df.columns:
-        df[col] = df[col].apply(clean_price)
+from core.datasource import load_worksheet
+from core.export import EXPORT_FORMATS, export_cached
+from core.figures import figure_cached
+from core.profiling import stage, start_run
+from core.refurb import MIRROR, SCHEMA, SHEET_TTL, SPREADSHEET_ID, WORKSHEET_NAME, refurb_cube_cached
+from core.scheduler import start_refresh_scheduler
+from core.widgets import numeric_warnings, paged_table, refresh_button, snapshot_caption
 
 # ✅ Streamlit UI 설정
 st.set_page_config(page_title="📦 리퍼제품 판매 대시보드", layout="wide")
 st.title("📦 리퍼제품 판매 대시보드")
-
-# 🔍 사이드바 필터
-with st.sidebar:
-    if "거래 상태" in df.columns:
-        status_list = df["거래 상태"].dropna().unique().tolist()
+start_run("리퍼 정산 분석")
+start_refresh_scheduler()
+
+# 📥 구글 시트 불러오기 (프로세스 공용 캐시, 예약 갱신이 10분마다 미리 받아 큐브까지 만들어 둠)
+with stage("fetch") as timed:
+    snapshot = load_worksheet(
+        SPREADSHEET_ID, WORKSHEET_NAME, ttl=SHEET_TTL, force=refresh_button(), mirror=MIRROR, schema=SCHEMA,
+    )
+    timed.rows = len(snapshot.data)
+snapshot_caption(snapshot)
+
+# 🧼 정제 + 집계 큐브 (스냅샷마다 한 번, core/refurb.py) — 금액/수량: "12,000원" 등 표기 처리, 읽지 못한 값은 0 + 경고
+with stage("transform") as timed:
+    cube, reports = refurb_cube_cached(snapshot)
+    timed.rows = len(cube.frame)
+numeric_warnings(reports)
+view = cube.view()
+
+# 🔍 사이드바 필터 (행이 아니라 큐브 칸에 거는 필터)
+with st.sidebar, stage("aggregate", rows=len(cube.cells)):
+    if view.has("거래 상태"):
+        status_list = view.members("거래 상태")
         selected_status = st.multiselect("📌 거래 상태", status_list, default=status_list)
-        df = df[df["거래 상태"].isin(selected_status)]
+        view = view.where("거래 상태", selected_status)
 
-    if "모델명" in df.columns:
-        model_list = df["모델명"].dropna().unique().tolist()
+    if view.has("모델명"):
+        model_list = view.members("모델명")
         selected_model = st.multiselect("📦 모델명", model_list, default=model_list)
-        df = df[df["모델명"].isin(selected_model)]
+        view = view.where("모델명", selected_model)
 
-    if "사이트" in df.columns:
-        site_list = df["사이트"].dropna().unique().tolist()
+    if view.has("사이트"):
+        site_list = view.members("사이트")
         selected_site = st.multiselect("🌐 사이트", site_list, default=site_list)
-        df = df[df["사이트"].isin(selected_site)]
+        view = view.where("사이트", selected_site)
 
-    if "날짜" in df.columns:
+    if view.has("날짜"):
         try:
-            df["날짜"] = pd.to_datetime(df["날짜"], format="%y-%m-%d", errors="coerce")
-            df = df[df["날짜"].notna()]
-            min_date, max_date = df["날짜"].min(), df["날짜"].max()
+            view = view.dropna("날짜")
+            dates = view.cells["날짜"]
+            min_date, max_date = dates.min(), dates.max()
             selected_range = st.slider("🗓️ 날짜 범위", min_value=min_date, max_value=max_date, value=(min_date, max_date))
-            df = df[(df["날짜"] >= selected_range[0]) & (df["날짜"] <= selected_range[1])]
+            view = view.between("날짜", selected_range[0], selected_range[1])
         except Exception:
             pass
 
 # 📊 통계 요약
 st.subheader("📊 통계 요약")
 col1, col2, col3, col4, col5 = st.columns(5)
-col1.metric("총 거래 수", len(df))
-if "정산 금액" in df.columns and not df["정산 금액"].empty:
-    col2.metric("총 정산 금액", f"{df['정산 금액'].sum():,} 원")
-    col3.metric("평균 정산 금액", f"{df['정산 금액'].mean():,.0f} 원")
-    col4.metric("최대 정산 금액", f"{df['정산 금액'].max():,} 원")
-    col5.metric("최소 정산 금액", f"{df['정산 금액'].min():,} 원")
+row_count = view.count()
+col1.metric("총 거래 수", row_count)
+if view.has("정산 금액") and row_count:
+    col2.metric("총 정산 금액", f"{view.total('정산 금액'):,} 원")
+    col3.metric("평균 정산 금액", f"{view.mean('정산 금액'):,.0f} 원")
+    col4.metric("최대 정산 금액", f"{view.max('정산 금액'):,} 원")
+    col5.metric("최소 정산 금액", f"{view.min('정산 금액'):,} 원")
 else:
     col2.metric("총 정산 금액", "데이터 없음")
     col3.metric("평균 정산 금액", "데이터 없음")
@@ -80,83 +76,120 @@ else:
     col5.metric("최소 정산 금액", "데이터 없음")
 
 # 🏷️ 최고/최저 정산 금액 모델명
-if "정산 금액" in df.columns and "모델명" in df.columns and not df["정산 금액"].empty:
-    max_amt = df["정산 금액"].max()
-    min_amt = df["정산 금액"].min()
-    max_models = ", ".join(df[df["정산 금액"] == max_amt]["모델명"].unique())
-    min_models = ", ".join(df[df["정산 금액"] == min_amt]["모델명"].unique())
+if view.has("정산 금액") and view.has("모델명") and row_count:
+    max_amt = view.max("정산 금액")
+    min_amt = view.min("정산 금액")
+    max_models = ", ".join(view.members_at("모델명", "정산 금액", max_amt, "max"))
+    min_models = ", ".join(view.members_at("모델명", "정산 금액", min_amt, "min"))
 
     st.markdown("### 🏷️ 최고/최저 정산 모델명")
     st.markdown(f"- 🏆 **최고 정산 금액 모델:** `{max_models}` (`{max_amt:,} 원`)")
     st.markdown(f"- 💤 **최저 정산 금액 모델:** `{min_models}` (`{min_amt:,} 원`)")
     st.markdown("---")
 
-# 📈 거래 상태 비율
-if "거래 상태" in df.columns:
-    st.subheader("📈 거래 상태 비율")
-    status_counts = df["거래 상태"].value_counts().reset_index()
+# 📈 차트: (스냅샷 버전, 필터 상태, 차트 id) 가 같으면 만들어 둔 Figure 재사용 (core/figures.py)
+chart_key = (snapshot.version, view.state())
+
+def full_dates():
+    return pd.date_range(start=view.cells["날짜"].min(), end=view.cells["날짜"].max(), freq="D")
+
+def status_pie():
+    status_counts = view.rollup("거래 상태", sort=False).sort_values(ascending=False).reset_index()
     status_counts.columns = ["거래 상태", "건수"]
-    fig1 = px.pie(status_counts, names="거래 상태", values="건수", title="거래 상태 비율")
-    st.plotly_chart(fig1, use_container_width=True)
-
-# 📉 날짜별 정산 금액 추이
-if "날짜" in df.columns and "정산 금액" in df.columns:
-    st.subheader("📉 날짜별 정산 금액 추이")
-    df["정산 금액(만원)"] = df["정산 금액"] / 10000
-    full_dates = pd.date_range(start=df["날짜"].min(), end=df["날짜"].max(), freq="D")
-    trend = df.groupby("날짜")["정산 금액(만원)"].sum().reindex(full_dates, fill_value=0).reset_index()
+    return px.pie(status_counts, names="거래 상태", values="건수", title="거래 상태 비율")
+
+def amount_trend():
+    trend = (view.rollup("날짜", "정산 금액") / 10000).reindex(full_dates(), fill_value=0).reset_index()
     trend.columns = ["날짜", "정산 금액(만원)"]
-    fig2 = px.line(trend, x="날짜", y="정산 금액(만원)", markers=True)
-    fig2.update_traces(hovertemplate='날짜=%{x|%Y-%m-%d}<br>정산 금액=%{y:.1f}만원')
-    fig2.update_layout(yaxis_title="정산 금액 (만원)", yaxis_tickformat=".1f")
-    st.plotly_chart(fig2, use_container_width=True)
-
-# 📈 날짜별 정산 수량 추이
-if "날짜" in df.columns and "수량" in df.columns:
-    st.subheader("📈 날짜별 정산 수량 추이")
-    qty_trend = df.groupby("날짜")["수량"].sum().reindex(full_dates, fill_value=0).reset_index()
+    fig = px.line(trend, x="날짜", y="정산 금액(만원)", markers=True)
+    fig.update_traces(hovertemplate='날짜=%{x|%Y-%m-%d}<br>정산 금액=%{y:.1f}만원')
+    fig.update_layout(yaxis_title="정산 금액 (만원)", yaxis_tickformat=".1f")
+    return fig
+
+def quantity_trend():
+    qty_trend = view.rollup("날짜", "수량").reindex(full_dates(), fill_value=0).reset_index()
     qty_trend.columns = ["날짜", "정산 수량"]
-    fig_qty = px.line(qty_trend, x="날짜", y="정산 수량", markers=True)
-    fig_qty.update_traces(hovertemplate='날짜=%{x|%Y-%m-%d}<br>수량=%{y}')
-    fig_qty.update_layout(yaxis_title="수량")
-    st.plotly_chart(fig_qty, use_container_width=True)
-
-# 📦 모델명별 정산 금액
-if "모델명" in df.columns and "정산 금액" in df.columns:
-    st.subheader("📦 모델명별 정산 금액")
-    model_group = df.groupby("모델명")["정산 금액"].sum().reset_index()
+    fig = px.line(qty_trend, x="날짜", y="정산 수량", markers=True)
+    fig.update_traces(hovertemplate='날짜=%{x|%Y-%m-%d}<br>수량=%{y}')
+    fig.update_layout(yaxis_title="수량")
+    return fig
+
+def model_amounts():
+    model_group = view.rollup("모델명", "정산 금액").reset_index()
     model_group["정산 금액(만원)"] = model_group["정산 금액"] / 10000
     model_group = model_group.sort_values(by="정산 금액(만원)", ascending=False)
-    fig3 = px.bar(model_group, x="모델명", y="정산 금액(만원)")
-    fig3.update_traces(hovertemplate='모델명=%{x}<br>정산 금액=%{y:.1f}만원')
-    fig3.update_layout(yaxis_title="정산 금액 (만원)", yaxis_tickformat=".1f")
-    st.plotly_chart(fig3, use_container_width=True)
-
-# 📦 모델명별 정산 수량
-if "모델명" in df.columns and "수량" in df.columns:
-    st.subheader("📦 모델명별 정산 수량")
-    qty_model = df.groupby("모델명")["수량"].sum().reset_index()
+    fig = px.bar(model_group, x="모델명", y="정산 금액(만원)")
+    fig.update_traces(hovertemplate='모델명=%{x}<br>정산 금액=%{y:.1f}만원')
+    fig.update_layout(yaxis_title="정산 금액 (만원)", yaxis_tickformat=".1f")
+    return fig
+
+def model_quantities():
+    qty_model = view.rollup("모델명", "수량").reset_index()
     qty_model = qty_model.sort_values(by="수량", ascending=False)
-    fig_qty_model = px.bar(qty_model, x="모델명", y="수량")
-    fig_qty_model.update_traces(hovertemplate='모델명=%{x}<br>수량=%{y}')
-    fig_qty_model.update_layout(yaxis_title="수량")
-    st.plotly_chart(fig_qty_model, use_container_width=True)
-
-# 🌐 사이트별 거래 상태
-if "사이트" in df.columns and "거래 상태" in df.columns:
-    st.subheader("🌐 사이트별 거래 상태")
-    cross = df.groupby(["사이트", "거래 상태"]).size().reset_index(name="건수")
-    fig4 = px.bar(cross, x="사이트", y="건수", color="거래 상태", barmode="stack")
-    st.plotly_chart(fig4, use_container_width=True)
-
-# 📋 전체 거래 내역
+    fig = px.bar(qty_model, x="모델명", y="수량")
+    fig.update_traces(hovertemplate='모델명=%{x}<br>수량=%{y}')
+    fig.update_layout(yaxis_title="수량")
+    return fig
+
+def site_status():
+    cross = view.rollup(["사이트", "거래 상태"]).reset_index(name="건수")
+    return px.bar(cross, x="사이트", y="건수", color="거래 상태", barmode="stack")
+
+with stage("render", rows=view.count()):
+    # 📈 거래 상태 비율
+    if view.has("거래 상태"):
+        st.subheader("📈 거래 상태 비율")
+        st.plotly_chart(figure_cached(chart_key, "status_pie", status_pie), use_container_width=True)
+
+    # 📉 날짜별 정산 금액 추이
+    if view.has("날짜") and view.has("정산 금액"):
+        st.subheader("📉 날짜별 정산 금액 추이")
+        st.plotly_chart(figure_cached(chart_key, "amount_trend", amount_trend), use_container_width=True)
+
+    # 📈 날짜별 정산 수량 추이
+    if view.has("날짜") and view.has("수량"):
+        st.subheader("📈 날짜별 정산 수량 추이")
+        st.plotly_chart(figure_cached(chart_key, "quantity_trend", quantity_trend), use_container_width=True)
+
+    # 📦 모델명별 정산 금액
+    if view.has("모델명") and view.has("정산 금액"):
+        st.subheader("📦 모델명별 정산 금액")
+        st.plotly_chart(figure_cached(chart_key, "model_amounts", model_amounts), use_container_width=True)
+
+    # 📦 모델명별 정산 수량
+    if view.has("모델명") and view.has("수량"):
+        st.subheader("📦 모델명별 정산 수량")
+        st.plotly_chart(figure_cached(chart_key, "model_quantities", model_quantities), use_container_width=True)
+
+    # 🌐 사이트별 거래 상태
+    if view.has("사이트") and view.has("거래 상태"):
+        st.subheader("🌐 사이트별 거래 상태")
+        st.plotly_chart(figure_cached(chart_key, "site_status", site_status), use_container_width=True)
+
+# 📋 전체 거래 내역 (필터에 해당하는 원본 행: 공유 데이터 위의 행 뷰, 보이는 쪽만 꺼내 보냄)
+rows = view.rows()
 st.subheader("📋 전체 거래 내역")
-st.dataframe(df, use_container_width=True)
+with stage("render", rows=len(rows)):
+    paged_table(rows, key="refurb_rows", cache_key=(snapshot.version, view.state()))
+
+# ⬇️ 다운로드 (다운로드 버튼을 누를 때 파일을 만들고, 필터 상태·형식별로 캐시, core/export.py)
+export_format = st.selectbox("📥 다운로드 형식", list(EXPORT_FORMATS))
+extension, mime = EXPORT_FORMATS[export_format]
+export_key = (snapshot.version, view.state(), export_format)
+
+
+def build_export():
+    with stage("export", rows=len(rows)):
+        return export_cached(export_key, rows, export_format, sheet_name="리퍼 정산")
+
 
-# ⬇️ 다운로드 버튼
+# 클릭 시 함수는 스크립트 실행 밖에서 불리므로, 프로파일 기록이 이번 실행에 붙도록 컨텍스트를 넘긴다.
+# 다운로드만으로는 페이지를 다시 그릴 필요가 없다 (on_click="ignore").
+run_context = contextvars.copy_context()
 st.download_button(
-    label="📥 데이터 다운로드 (Excel)",
-    data=df.to_csv(index=False).encode("utf-8-sig"),
-    file_name="refur_data.csv",
-    mime="text/csv"
+    label=f"📥 데이터 다운로드 ({export_format})",
+    data=lambda: run_context.run(build_export),
+    file_name=f"refur_data.{extension}",
+    mime=mime,
+    on_click="ignore",
 )
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from core.cache import LRUCache, sizeof
+
+
+def _scatter(n):
+    rng = np.random.default_rng(0)
+    return px.scatter(pd.DataFrame({"x": rng.random(n), "y": rng.random(n)}), x="x", y="y")
+
+
+def test_sizeof_figure_counts_trace_data():
+    assert sizeof(_scatter(100_000)) > 1_000_000
+    assert sizeof(_scatter(100_000)) > 50 * sizeof(_scatter(1_000))
+
+
+def test_sizeof_object_array_counts_strings():
+    values = np.array(["x" * 1000] * 100, dtype=object)
+    assert sizeof(values) > 100 * 1000
+
+
+def test_lru_byte_limit_applies_to_figures():
+    cache = LRUCache(3_000_000)
+    for key in range(3):
+        cache.put(key, _scatter(100_000))
+    assert len(cache) < 3 and 2 in cache
+    assert cache.total_bytes <= 3_000_000
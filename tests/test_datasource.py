@@ -0,0 +1,45 @@
+import pandas as pd
+import pytest
+
+from core.datasource import DataSource, FakeSource, LocalSource, snapshot_to_local
+
+
+def test_incomplete_backend_fails_on_construction():
+    class NoRead(DataSource):
+        def worksheet_titles(self, spreadsheet_id):
+            return []
+
+    with pytest.raises(TypeError):
+        NoRead()
+
+
+def _sheet():
+    return pd.DataFrame({
+        "모델": ["A", "", "C"],
+        "수량": ["1", "", "3"],
+        "금액": ["1,000", "2.5", ""],
+    })
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".xlsx"])
+def test_local_formats_read_like_parquet(tmp_path, suffix):
+    folder = tmp_path / "sheet-id"
+    folder.mkdir()
+    _sheet().to_parquet(folder / "parquet.parquet", index=False)
+    if suffix == ".csv":
+        _sheet().to_csv(folder / "other.csv", index=False)
+    else:
+        _sheet().to_excel(folder / "other.xlsx", index=False)
+    source = LocalSource(tmp_path)
+    expected, actual = source.read("sheet-id", "parquet"), source.read("sheet-id", "other")
+    for name in expected.columns:
+        assert actual[name].tolist() == expected[name].tolist()
+    assert expected["수량"].tolist() == [1, "", 3] and expected["금액"].tolist() == [1000, 2.5, ""]
+
+
+def test_snapshot_keeps_missing_values_blank(tmp_path):
+    fake = FakeSource()
+    fake.put("sheet-id", "시트", pd.DataFrame({"이름": ["a", None], "수량": [1.5, float("nan")]}))
+    snapshot_to_local(tmp_path, ["sheet-id"], source=fake)
+    df = LocalSource(tmp_path).read("sheet-id", "시트")
+    assert df["이름"].tolist() == ["a", ""] and df["수량"].tolist() == [1.5, ""]
@@ -0,0 +1,22 @@
+import io
+from datetime import datetime
+
+import openpyxl
+import pandas as pd
+
+from core.export import export_bytes
+
+
+def test_excel_export_writes_dated_cells():
+    df = pd.DataFrame({
+        "날짜": pd.to_datetime(["2025-01-02", None]),
+        "시각": pd.to_datetime(["2025-01-02 03:04", "2025-01-03 00:00"]),
+        "수량": [1, 2],
+    })
+    sheet = openpyxl.load_workbook(io.BytesIO(export_bytes(df, "Excel (xlsx)"))).active
+    assert [(c.value, c.number_format) for c in sheet[2]] == [
+        (datetime(2025, 1, 2), "yyyy-mm-dd"),
+        (datetime(2025, 1, 2, 3, 4), "yyyy-mm-dd h:mm:ss"),
+        (1, "General"),
+    ]
+    assert sheet["A3"].value is None
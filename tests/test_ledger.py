@@ -0,0 +1,113 @@
+import pandas as pd
+
+from core import ledger as ledger_module
+from core.ledger import Ledger, id_columns, ledger_reconcile_cached, row_fingerprints
+
+
+def _orders(amounts, names=None):
+    names = names or ["김철수"] * len(amounts)
+    return pd.DataFrame({
+        "주문번호": [f"ORD{i}" for i in range(1, len(amounts) + 1)],
+        "주문자": names,
+        "입금자명": names,
+        "결제금액": [f"{amount:,}" for amount in amounts],
+    })
+
+
+def _deposits(amounts, names=None):
+    names = names or ["김철수"] * len(amounts)
+    return pd.DataFrame({
+        "거래일시": [f"2026-01-0{i} 10:00" for i in range(1, len(amounts) + 1)],
+        "내용": names,
+        "입금액": amounts,
+        "잔액": pd.Series(amounts).cumsum(),
+    })
+
+
+def test_id_columns_needs_every_group():
+    assert id_columns(["주문번호", "주문자"], ledger_module.ORDER_ID_COLUMNS) == ["주문번호"]
+    assert id_columns(["거래일시", "내용", "입금액"], ledger_module.DEPOSIT_ID_COLUMNS) == []
+
+
+def test_fingerprints_follow_id_columns():
+    before = _orders([1000, 2000])
+    edited = before.assign(결제금액=["1,500", "2,000"])
+    assert (row_fingerprints(before, ["주문번호"]) == row_fingerprints(edited, ["주문번호"])).all()
+    assert (row_fingerprints(before) != row_fingerprints(edited)).sum() == 1
+
+
+def test_fingerprints_count_repeated_ids():
+    items = pd.DataFrame({"주문번호": ["ORD1", "ORD1", "ORD2"], "상품": ["a", "a", "b"]})
+    fingerprints = row_fingerprints(items, ["주문번호"])
+    assert len(set(fingerprints.tolist())) == 3
+    assert (row_fingerprints(pd.concat([items, items.iloc[:1]]), ["주문번호"])[:3] == fingerprints).all()
+
+
+def test_edited_row_is_not_recorded_twice(tmp_path):
+    ledger = Ledger(tmp_path / "ledger.sqlite")
+    ledger.reconcile(_orders([1000]), _deposits([500]))
+    _, _, _, run = ledger.reconcile(_orders([1500]), _deposits([500]))
+    assert run.order_id_columns == ["주문번호"] and run.deposit_id_columns == ["거래일시", "잔액"]
+    assert (run.new_orders, run.skipped_orders) == (0, 1)
+
+
+def test_close_drops_cached_results(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger_module, "_results", ledger_module.LRUCache(1 << 20, max_entries=4))
+    path = tmp_path / "ledger.sqlite"
+    first = ledger_reconcile_cached(("o", "d"), _orders([1000]), _deposits([500]), path=path)
+    assert ledger_reconcile_cached(("o", "d"), _orders([1000]), _deposits([500]), path=path) is first
+    ledger_module.get_ledger(path).close(["김철수"], ["김철수"])
+    again = ledger_reconcile_cached(("o", "d"), _orders([1000]), _deposits([500]), path=path)
+    assert again is not first and again[0].empty
+
+
+def test_unmatched_order_carries_over_until_paid(tmp_path):
+    ledger = Ledger(tmp_path / "ledger.sqlite")
+    _, _, _, first = ledger.reconcile(_orders([1000, 2000], ["김철수", "이영희"]), _deposits([1000], ["김철수"]))
+    assert (first.matched_orders, first.matched_deposits) == (1, 1)
+    orders, deposits = ledger.open_items()
+    assert orders["입금자키"].tolist() == ["이영희"] and deposits.empty
+
+    # 누적 주문 파일을 다시 올리고 이번에 이영희 입금이 들어옴
+    result, _, _, second = ledger.reconcile(
+        _orders([1000, 2000], ["김철수", "이영희"]), _deposits([1000, 2000], ["김철수", "이영희"]),
+    )
+    assert (second.new_orders, second.skipped_orders) == (0, 2)
+    assert (second.new_deposits, second.skipped_deposits) == (1, 1)
+    assert second.carried_orders == 1 and second.matched_orders == 1
+    assert result["입금자(실제)"].tolist() == ["이영희"]
+    assert all(frame.empty for frame in ledger.open_items())
+
+
+def test_short_payment_stays_open_and_sums_with_next_deposit(tmp_path):
+    ledger = Ledger(tmp_path / "ledger.sqlite")
+    result, _, _, _ = ledger.reconcile(_orders([3000]), _deposits([1000]))
+    assert result["차이"].tolist() == [-2000]
+    orders, deposits = ledger.open_items()
+    assert orders["총 구매금액"].tolist() == [3000] and deposits["통장입금"].tolist() == [1000]
+
+    result, _, _, run = ledger.reconcile(_orders([3000]), _deposits([1000, 2000]))
+    assert run.carried_deposits == 1 and run.new_deposits == 1
+    assert result["통장입금"].tolist() == [3000] and result["차이"].tolist() == [0]
+    assert all(frame.empty for frame in ledger.open_items())
+
+
+def test_manual_close_removes_items_from_next_run(tmp_path):
+    ledger = Ledger(tmp_path / "ledger.sqlite")
+    ledger.reconcile(_orders([1000], ["김철수"]), _deposits([700], ["박민수"]))
+    assert ledger.close(["김철수"], ["박민수"]) == (1, 1)
+    result, _, _, run = ledger.reconcile(_orders([1000], ["김철수"]), _deposits([700], ["박민수"]))
+    assert result.empty and run.carried_orders == 0 and run.skipped_orders == 1
+
+
+def test_cached_result_is_redone_after_another_upload(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger_module, "_results", ledger_module.LRUCache(1 << 20, max_entries=4))
+    path = tmp_path / "ledger.sqlite"
+    first = ledger_reconcile_cached(("a", "a"), _orders([1000], ["김철수"]), _deposits([500], ["박민수"]), path=path)
+    ledger_reconcile_cached(("b", "b"), _orders([1000], ["김철수"]), _deposits([1000], ["김철수"]).assign(잔액=[9000]), path=path)
+    again = ledger_reconcile_cached(("a", "a"), _orders([1000], ["김철수"]), _deposits([500], ["박민수"]), path=path)
+    assert again is not first and again[3].run_id > first[3].run_id
+    # 김철수 주문은 b 업로드에서 닫혔으므로 이월되지 않고, 박민수 입금만 미결로 남는다
+    assert "김철수" in first[0]["주문자"].tolist()
+    assert again[0]["입금자(실제)"].tolist() == ["박민수"]
+    assert (again[3].carried_orders, again[3].carried_deposits) == (0, 1)
@@ -0,0 +1,134 @@
+import time
+
+import numpy as np
+import pytest
+
+from core.matching import match_amounts, match_deposits
+
+
+def _naive_deposits(site_keys, deposit_keys):
+    """예전 페이지의 이중 루프: 주문 순서대로, 조건을 만족하는 아직 안 쓴 첫 입금 (키가 겹치면 행마다 따로)."""
+    used, result = set(), []
+    for site_key in site_keys:
+        for i, deposit_key in enumerate(deposit_keys):
+            if (site_key in deposit_key or deposit_key in site_key) and i not in used:
+                used.add(i)
+                result.append(i)
+                break
+        else:
+            result.append(-1)
+    return result
+
+
+def _random_keys(rng, count, alphabet="김이박철수영희", max_len=5):
+    keys = {"".join(rng.choice(list(alphabet), rng.integers(0, max_len + 1))) for _ in range(count)}
+    keys = sorted(keys)
+    rng.shuffle(keys)
+    return keys
+
+
+def test_match_deposits_examples():
+    assert match_deposits(["김철수", "이영희", "박"], ["이영희님", "김철수(입금)", "박민수"]) == [1, 0, 2]
+    # 먼저 온 주문이 키를 가져가면 뒤 주문은 다음 후보로
+    assert match_deposits(["김철수", "김철수A"], ["김철수A", "김철수"]) == [0, 1]
+    assert match_deposits(["최민", ""], ["김철수"]) == [-1, 0]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("gram_size", [1, 2, 3])
+def test_match_deposits_matches_naive_loop(seed, gram_size):
+    rng = np.random.default_rng(seed)
+    site_keys = [str(k) for k in rng.choice(_random_keys(rng, 60), 80)]
+    deposit_keys = _random_keys(rng, 60)
+    assert match_deposits(site_keys, deposit_keys, gram_size=gram_size) == _naive_deposits(site_keys, deposit_keys)
+
+
+def test_match_deposits_assigns_each_duplicate_key_once():
+    assert match_deposits(["김철수", "김철수", "철수", "김철수"], ["박", "김철수", "김철수"]) == [1, 2, -1, -1]
+    # 짧은 주문 키가 긴 입금 키를 포함 쪽으로 찾을 때도 겹친 키를 차례로 쓴다
+    assert match_deposits(["김철수님", "김철수님"], ["김철수", "김철수"]) == [0, 1]
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("gram_size", [1, 2, 3])
+def test_match_deposits_with_duplicate_keys_matches_naive_loop(seed, gram_size):
+    rng = np.random.default_rng(seed + 100)
+    pool = _random_keys(rng, 15, max_len=3)
+    site_keys = [str(k) for k in rng.choice(pool, 60)]
+    deposit_keys = [str(k) for k in rng.choice(pool, 50)]
+    assert match_deposits(site_keys, deposit_keys, gram_size=gram_size) == _naive_deposits(site_keys, deposit_keys)
+
+
+def _pairs(result):
+    return {int(o): int(d) for o, d in enumerate(result) if d >= 0}
+
+
+def _nearest_first(orders, deposits, tolerance):
+    """금액이 모두 다를 때의 기준 구현: 같은 금액 없이 차이가 가장 작은 짝부터 하나씩."""
+    free_orders, free_deposits, pairs = set(range(len(orders))), set(range(len(deposits))), {}
+    while True:
+        candidates = [
+            (abs(orders[o] - deposits[d]), o, d)
+            for o in free_orders for d in free_deposits
+            if orders[o] > 0 and deposits[d] > 0 and abs(orders[o] - deposits[d]) <= tolerance
+        ]
+        if not candidates:
+            return pairs
+        _, o, d = min(candidates)
+        pairs[o] = d
+        free_orders.discard(o)
+        free_deposits.discard(d)
+
+
+def test_exact_amounts_pair_in_original_order():
+    result = match_amounts([100, 200, 100, 300], [100, 100, 200, 999])
+    assert _pairs(result) == {0: 0, 1: 2, 2: 1}
+
+
+def test_exact_pass_runs_before_tolerance():
+    # 1000 은 같은 금액의 입금과 먼저 짝지어지고, 990 은 남은 995 와
+    result = match_amounts([990, 1000], [1000, 995], tolerance=50)
+    assert _pairs(result) == {0: 1, 1: 0}
+
+
+def test_tolerance_prefers_the_nearest_order():
+    assert _pairs(match_amounts([550, 990], [1000], tolerance=500)) == {1: 0}
+    assert _pairs(match_amounts([1000], [550, 990], tolerance=500)) == {0: 1}
+
+
+def test_tolerance_is_inclusive_and_skips_non_positive():
+    assert _pairs(match_amounts([100, 0, -5], [110, 0, -5], tolerance=10)) == {0: 0}
+    assert _pairs(match_amounts([100], [111], tolerance=10)) == {}
+    assert _pairs(match_amounts([100], [np.nan], tolerance=10)) == {}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_nearest_first_reference(seed):
+    rng = np.random.default_rng(seed)
+    orders = rng.uniform(1, 1000, rng.integers(0, 25)).round(3)
+    deposits = rng.uniform(1, 1000, rng.integers(0, 25)).round(3)
+    result = match_amounts(orders, deposits, tolerance=60)
+    assert _pairs(result) == _nearest_first(orders.tolist(), deposits.tolist(), 60)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pairs_are_one_to_one_within_tolerance_and_maximal(seed):
+    rng = np.random.default_rng(seed)
+    orders = rng.integers(-2, 40, 200) * 100
+    deposits = rng.integers(-2, 40, 150) * 100 + rng.integers(-30, 30, 150)
+    pairs = _pairs(match_amounts(orders, deposits, tolerance=25))
+    assert len(set(pairs.values())) == len(pairs)
+    assert all(abs(orders[o] - deposits[d]) <= 25 and orders[o] > 0 for o, d in pairs.items())
+    free_orders = [o for o in range(len(orders)) if o not in pairs and orders[o] > 0]
+    free_deposits = [d for d in range(len(deposits)) if d not in set(pairs.values()) and deposits[d] > 0]
+    assert not any(abs(orders[o] - deposits[d]) <= 25 for o in free_orders for d in free_deposits)
+
+
+def test_100k_leftovers_run_quickly():
+    rng = np.random.default_rng(0)
+    orders = rng.integers(1, 10 ** 7, 100_000) * 10
+    deposits = orders[rng.permutation(100_000)] + rng.integers(-3000, 3000, 100_000)
+    started = time.perf_counter()
+    result = match_amounts(orders, deposits, tolerance=5000)
+    assert time.perf_counter() - started < 5
+    assert len(set(result[result >= 0].tolist())) == int((result >= 0).sum())
@@ -0,0 +1,105 @@
+import re
+
+import pandas as pd
+import pytest
+
+from core.mirror import BLOCK_ROWS, RECHECK_BLOCKS, RECHECK_CYCLE, SheetMirror
+from core.sheets import records_frame
+
+
+class FakeWorksheet:
+    """values_batch_get 의 "'시트'!a:b" 행 범위만 지원하는 가짜 워크시트 (뒤쪽 빈 행은 API 처럼 생략)."""
+
+    title = "시트"
+
+    def __init__(self, values):
+        self.values = values
+        self.spreadsheet = self
+
+    @property
+    def row_count(self):
+        return len(self.values) + 100
+
+    def get_all_values(self):
+        return [list(row) for row in self.values]
+
+    def values_batch_get(self, ranges):
+        value_ranges = []
+        for a1 in ranges:
+            first, last = map(int, re.search(r"!(\d+):(\d+)$", a1).groups())
+            rows = [list(row) for row in self.values[first - 1:last]]
+            while rows and not any(rows[-1]):
+                rows.pop()
+            value_ranges.append({"range": a1, "values": rows} if rows else {"range": a1})
+        return {"valueRanges": value_ranges}
+
+
+def _sheet(count):
+    return [["번호", "상태"]] + [[str(i), "대기"] for i in range(count)]
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return SheetMirror("test", directory=tmp_path)
+
+
+def _assert_synced(mirror, worksheet):
+    pd.testing.assert_frame_equal(mirror.sync(worksheet), records_frame(worksheet.values))
+
+
+def test_appended_rows_are_fetched_incrementally(mirror):
+    worksheet = FakeWorksheet(_sheet(20 * BLOCK_ROWS))
+    _assert_synced(mirror, worksheet)
+    worksheet.values += [[str(i), "신규"] for i in range(10)]
+    _assert_synced(mirror, worksheet)
+    assert mirror.last_fetched_rows < 10 * BLOCK_ROWS
+
+
+def test_recent_edit_is_picked_up_without_full_sync(mirror):
+    worksheet = FakeWorksheet(_sheet(20 * BLOCK_ROWS))
+    mirror.sync(worksheet)
+    worksheet.values[-5][1] = "도착"
+    _assert_synced(mirror, worksheet)
+    assert mirror.last_fetched_rows < 10 * BLOCK_ROWS
+
+
+def test_old_edit_is_picked_up_within_one_cycle(mirror):
+    worksheet = FakeWorksheet(_sheet(20 * BLOCK_ROWS))
+    mirror.sync(worksheet)
+    mirror.sync(worksheet)
+    worksheet.values[3][1] = "도착"
+    for _ in range(RECHECK_CYCLE):
+        if (mirror.sync(worksheet)["상태"] == "도착").any():
+            break
+    _assert_synced(mirror, worksheet)
+
+
+def test_old_deletion_is_picked_up_on_next_sync(mirror):
+    worksheet = FakeWorksheet(_sheet(20 * BLOCK_ROWS))
+    mirror.sync(worksheet)
+    del worksheet.values[100]
+    worksheet.values += [["새 행", "신규"]]
+    _assert_synced(mirror, worksheet)
+
+
+def test_checked_blocks_cover_every_older_block(mirror):
+    older = 20 - RECHECK_BLOCKS
+    seen = set()
+    for _ in range(RECHECK_CYCLE):
+        seen.update(mirror._checked_blocks(older))
+    assert seen == set(range(older))
+
+
+def test_row_wider_than_header_widens_instead_of_truncating(mirror, caplog):
+    worksheet = FakeWorksheet(_sheet(20 * BLOCK_ROWS))
+    mirror.sync(worksheet)
+    worksheet.values.append(["x", "신규", "메모"])
+    with caplog.at_level("WARNING", logger="core.mirror"):
+        df = mirror.sync(worksheet)
+    assert df.iloc[-1].tolist() == ["x", "신규", "메모"]
+    assert "긴 행 1개" in caplog.text
+    _assert_synced(mirror, worksheet)
+    # 넓어진 헤더로 다시 증분 동기화가 된다
+    worksheet.values.append(["y", "신규"])
+    _assert_synced(mirror, worksheet)
+    assert mirror.last_fetched_rows < 10 * BLOCK_ROWS
@@ -0,0 +1,34 @@
+from core import profiling
+
+
+def _stage_records(count):
+    for i in range(count):
+        profiling._record({"run": "1", "page": "p", "stage": "fetch", "ms": float(i), "i": i})
+
+
+def test_log_is_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_LOG", tmp_path / "stages.jsonl")
+    monkeypatch.setattr(profiling, "LOG_FLUSH_SECONDS", 3600)
+    monkeypatch.setattr(profiling, "_last_flush", float("inf"))
+    _stage_records(profiling.LOG_FLUSH_RECORDS - 1)
+    assert not profiling.PROFILE_LOG.exists()
+    _stage_records(1)
+    assert len(profiling.PROFILE_LOG.read_text(encoding="utf-8").splitlines()) == profiling.LOG_FLUSH_RECORDS
+    profiling.clear()
+
+
+def test_log_rotates_by_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_LOG", tmp_path / "stages.jsonl")
+    monkeypatch.setattr(profiling, "LOG_MAX_BYTES", 2000)
+    monkeypatch.setattr(profiling, "LOG_FLUSH_RECORDS", 10)
+    _stage_records(500)
+    profiling.flush()
+    files = sorted(path.name for path in tmp_path.iterdir())
+    assert files == ["stages.jsonl", "stages.jsonl.1", "stages.jsonl.2"]
+    assert all(path.stat().st_size <= 2000 + 1000 for path in tmp_path.iterdir())
+    # 돌려 둔 파일까지 이어서 읽고, 마지막 기록이 맨 뒤에 온다
+    records = profiling.load_log()
+    assert records[-1]["i"] == 499
+    assert [r["i"] for r in records] == sorted(r["i"] for r in records)
+    profiling.clear()
+    assert list(tmp_path.iterdir()) == []
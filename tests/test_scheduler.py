@@ -0,0 +1,41 @@
+import threading
+import time
+
+from core import scheduler
+from core.datasource import FakeSource, set_data_source
+from core.sheets import SheetCache
+
+
+def test_scheduler_not_started_for_local_sources(monkeypatch):
+    monkeypatch.setattr(scheduler, "_scheduler", None)
+    set_data_source(FakeSource())
+    try:
+        assert scheduler.start_refresh_scheduler() is None
+        assert scheduler.get_scheduler() is None
+    finally:
+        set_data_source(None)
+
+
+def _blocked_until_loaded(call):
+    """call 이 항목 잠금을 기다리는 동안 다른 쪽이 받아 오게 한다 → 두 번째 fetch 횟수."""
+    cache = SheetCache()
+    entry = cache._entry("k")
+    calls = []
+    entry.lock.acquire()
+    worker = threading.Thread(target=call, args=(cache, lambda: calls.append(1) or "second"))
+    worker.start()
+    time.sleep(0.05)
+    cache._load("k", entry, lambda: "first")
+    entry.lock.release()
+    worker.join()
+    return cache, calls
+
+
+def test_refresh_reuses_load_finished_while_waiting():
+    cache, calls = _blocked_until_loaded(lambda cache, fetch: cache.refresh("k", fetch))
+    assert calls == [] and cache.get("k", lambda: "never").data == "first"
+
+
+def test_cold_get_reuses_refresh_finished_while_waiting():
+    cache, calls = _blocked_until_loaded(lambda cache, fetch: cache.get("k", fetch))
+    assert calls == [] and cache.get("k", lambda: "never").data == "first"
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from core import schema
+from core.numeric import NumericReport
+from core.refurb import SCHEMA as REFURB_SCHEMA, prepare_refurb
+from core.returns import SCHEMA as RETURNS_SCHEMA, build_returns_cube
+from core.sheets import Snapshot
+from core.shipments import SCHEMA as SHIPMENTS_SCHEMA
+
+
+def _refurb_raw():
+    return pd.DataFrame({
+        "날짜": ["25-01-02", "25-01-03", "잘못된 날짜"],
+        "모델명": ["A", "B", ""],
+        "사이트": ["쿠팡", "쿠팡", "11번가"],
+        "거래 상태": ["정산완료", "배송중", "정산완료"],
+        "정산 금액": ["12,000원", 5000, "미정"],
+        "수량": [1, "2", ""],
+        "메모": ["x", "", "y"],
+    }, dtype=object)
+
+
+def test_load_types_columns_and_keeps_reports():
+    raw = _refurb_raw()
+    df = REFURB_SCHEMA.load(raw)
+    assert isinstance(df["모델명"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df["날짜"].dtype)
+    assert df["정산 금액"].tolist() == [12000, 5000, 0]
+    assert df["메모"].dtype == schema.TEXT_DTYPE
+    reports = schema.numeric_reports(df)
+    assert reports["정산 금액"].unparsed == 1 and reports["수량"].blank == 1
+    assert raw["정산 금액"].tolist() == ["12,000원", 5000, "미정"]
+    assert REFURB_SCHEMA.name in schema.memory_reports()
+
+
+def test_prepare_refurb_does_not_touch_the_snapshot_frame():
+    df = REFURB_SCHEMA.load(_refurb_raw())
+    prepared, reports = prepare_refurb(df)
+    assert "정산 금액(만원)" in prepared.columns and "정산 금액(만원)" not in df.columns
+    assert reports is schema.numeric_reports(df)
+
+
+def test_header_function_runs_before_typing():
+    raw = pd.DataFrame({"회사도착 예상일\n(=ETA+1)": ["2025-01-02"], " PRODUCT ": ["p"]}, dtype=object)
+    df = SHIPMENTS_SCHEMA.load(raw)
+    assert list(df.columns) == ["회사도착 예상일(=ETA+1)", "PRODUCT"]
+    assert pd.api.types.is_datetime64_any_dtype(df["회사도착 예상일(=ETA+1)"].dtype)
+
+
+def test_returns_cube_merges_typed_sheets():
+    first = RETURNS_SCHEMA.load(pd.DataFrame({"모델명": ["A", "B"], "수량": ["1", "x"], "처리방식": ["반품", "교환"]}))
+    second = RETURNS_SCHEMA.load(pd.DataFrame({"모델명": ["C"], "수량": ["y"]}))
+    snapshots = [Snapshot(("t", name), df, 0.0, i) for i, (name, df) in enumerate([("1월", first), ("2월", second)])]
+    cube, reports = build_returns_cube(["1월", "2월"], snapshots)
+    assert isinstance(cube.frame["모델명"].dtype, pd.CategoricalDtype)
+    assert cube.frame["모델명"].astype(str).tolist() == ["A", "B", "C"]
+    assert cube.frame["시트이름"].astype(str).tolist() == ["1월", "1월", "2월"]
+    assert reports["수량"].unparsed == 2 and reports["수량"].samples == ["x", "y"]
+
+
+def test_merge_reports_sums_counts():
+    merged = schema.merge_reports([
+        {"a": NumericReport(1, 2, ["x"])},
+        {"a": NumericReport(3, 4, ["x", "y"]), "b": NumericReport(0, 0, [])},
+    ])
+    assert (merged["a"].blank, merged["a"].unparsed, merged["a"].samples) == (4, 6, ["x", "y"])
+    assert set(merged) == {"a", "b"}
@@ -0,0 +1,103 @@
+import math
+import random
+
+import pandas as pd
+import pytest
+from gspread.utils import numericise as gspread_numericise
+
+from core.sheets import SheetCache, fetch_worksheets, numericise, numericise_frame, records_frame
+
+SAMPLES = [
+    "", " ", "0", "-0", "+5", "007", "12", " 12 ", "\t7\n", "1,000", "1,234,567", "-1,000", "1,2,3", ",5",
+    "1.", ".5", "-.5", "3.14", "1,000.5", "1e5", "1E+5", "+3.25e-2", "-0.0", "1e400", "1e-400",
+    "nan", "NaN", "-nan", "inf", "-inf", "Infinity", "banana", "info",
+    "1_000", "1_0", "12345678901234567890", "-999999999999999999", "9" * 40,
+    "１２３", "٣", "3월", "12,000원", "₩1,000", "0x10", "True", "5 000", "-", "미정", "2024-01-05", "24-01-05",
+]
+
+
+def _fuzz(count, seed=0):
+    rng = random.Random(seed)
+    alphabet = "0123456789,.-+eE _naif１ 원"
+    values = ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 6))) for _ in range(count)]
+    values += [repr(rng.uniform(-1e6, 1e6)) for _ in range(count)]
+    values += [f"{rng.uniform(0, 1e300):.17e}" for _ in range(count // 10)]
+    values += [f"{rng.randint(-10 ** 9, 10 ** 9):,}" for _ in range(count)]
+    return values
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return type(a) is type(b) and a == b
+
+
+def _assert_matches_gspread(values):
+    ours = numericise_frame(pd.DataFrame({"v": values}, dtype=object))["v"]
+    # get_all_records() → DataFrame 과 같은 결과여야 한다
+    expected = pd.DataFrame([{"v": gspread_numericise(v)} for v in values])["v"]
+    if pd.api.types.is_numeric_dtype(ours.dtype) or pd.api.types.is_numeric_dtype(expected.dtype):
+        assert ours.dtype == expected.dtype
+    mismatches = [(v, a, b) for v, a, b in zip(values, ours.tolist(), expected.tolist()) if not _same(a, b)]
+    assert not mismatches[:10]
+
+
+@pytest.mark.parametrize("value", SAMPLES)
+def test_numericise_matches_gspread(value):
+    assert _same(numericise(value), gspread_numericise(value))
+
+
+def test_numericise_frame_mixed_column_matches_gspread():
+    _assert_matches_gspread(SAMPLES + _fuzz(5000))
+
+
+@pytest.mark.parametrize("values", [
+    ["1", "2", "3"],
+    ["1", "2.5", ""],
+    ["1,000", "2,000"],
+    ["1", "nan"],
+    ["inf", "-inf", "0"],
+    ["a", "b"],
+    ["3월", "4월"],
+])
+def test_numericise_frame_column_dtype_matches_gspread(values):
+    _assert_matches_gspread(values)
+
+
+def test_numericise_frame_leaves_non_strings():
+    df = numericise_frame(pd.DataFrame({"v": [1, "2", None, "x"]}, dtype=object))
+    assert df["v"].tolist()[:2] == [1, 2] and df["v"][2] is None and df["v"][3] == "x"
+
+
+def test_records_frame_pads_rows():
+    df = records_frame([["이름", "수량", ""], ["a", "1,000"], ["b", "2", "x"]])
+    assert list(df.columns) == ["이름", "수량", ""]
+    assert df["수량"].tolist() == [1000, 2]
+    assert df[""].tolist() == ["", "x"]
+
+
+class _BatchSpreadsheet:
+    def __init__(self, value_ranges):
+        self.value_ranges = value_ranges
+
+    def values_batch_get(self, ranges):
+        return {"valueRanges": self.value_ranges[:len(ranges)]}
+
+
+def test_fetch_worksheets_maps_ranges_in_order():
+    spreadsheet = _BatchSpreadsheet([{"values": [["a"], ["1"]]}, {}])
+    fetched = fetch_worksheets(spreadsheet, ["첫 시트", "빈 시트"])
+    assert fetched["첫 시트"]["a"].tolist() == [1]
+    assert fetched["빈 시트"].empty
+
+
+def test_fetch_worksheets_rejects_missing_ranges():
+    with pytest.raises(ValueError):
+        fetch_worksheets(_BatchSpreadsheet([{"values": [["a"], ["1"]]}]), ["첫 시트", "둘째 시트"])
+
+
+def test_get_many_rejects_partial_fetch():
+    cache = SheetCache()
+    with pytest.raises(KeyError):
+        cache.get_many(["a", "b"], lambda keys: {"a": 1})
+    assert cache.get_many(["a", "b"], lambda keys: {key: key for key in keys})[1].data == "b"
@@ -0,0 +1,20 @@
+import pandas as pd
+
+from core.shipments import ETA_COLUMN, ShipmentStore, prepare_shipments
+
+
+def _store():
+    df = pd.DataFrame({
+        "상태": ["출하", "회사 도착", "출하", "출하"],
+        "모델명": ["A", "B", "C", "D"],
+        ETA_COLUMN: pd.to_datetime(["2025-01-03 18:00", "2025-01-02 09:00", "2025-01-03 08:00", None]),
+    })
+    return ShipmentStore(prepare_shipments(df, pd.Timestamp("2025-01-02")))
+
+
+def test_same_day_rows_keep_original_order():
+    store = _store()
+    assert store.dated["모델명"].tolist() == ["B", "A", "C"]
+    assert store.on("2025-01-03")["모델명"].tolist() == ["A", "C"]
+    assert store.between("2025-01-01", "2025-01-31")["모델명"].tolist() == ["B", "A", "C"]
+    assert store.daily["전체"].tolist() == [1, 2]
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.views import RowView
+
+
+def _frame():
+    return pd.DataFrame({
+        "모델": pd.Categorical(["Alpha", "beta", "Gamma", "alpha", None, "beta"]),
+        "메모": pd.array(["첫 주문", None, "ALPHA 교환", "둘째", "반품", "첫 반품"], dtype="string"),
+        "비고": pd.Series(["x", 3, None, "Alpha", "y", "z"], dtype=object),
+        "수량": [3, 1, np.nan, 2, 5, 1],
+    })
+
+
+def _rows(view):
+    return view.to_frame().index.tolist()
+
+
+def test_where_and_isin_keep_positions_into_shared_frame():
+    df = _frame()
+    view = RowView(df).where(np.array([True, False, True, True, False, True]))
+    assert _rows(view) == [0, 2, 3, 5]
+    assert _rows(view.isin("모델", ["beta", "alpha"])) == [3, 5]
+    assert view.column("수량")[[0, 2, 3]].tolist() == [3, 2, 1]
+    assert RowView(df).where(np.ones(len(df), dtype=bool)).positions is None
+
+
+def test_slice_and_to_frame_share_rows():
+    df = _frame()
+    view = RowView(df).where(np.array([False, True, True, False, True, True]))
+    assert view.slice(1, 3).index.tolist() == [2, 4]
+    assert RowView(df).to_frame() is df
+
+
+def test_search_every_text_column_case_insensitive():
+    view = RowView(_frame())
+    assert _rows(view.search("alpha")) == [0, 2, 3]
+    assert _rows(view.search("반품")) == [4, 5]
+    assert _rows(view.search("3")) == [1]  # object 열은 문자열로 보고, 숫자 열은 보지 않는다
+    assert view.search("없음").empty
+
+
+def test_search_limited_columns_and_filtered_view():
+    view = RowView(_frame()).where(np.array([True, True, True, False, True, True]))
+    assert _rows(view.search("alpha", ["모델"])) == [0]
+    assert _rows(view.search("alpha", ["메모"])) == [2]
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("name", ["모델", "메모", "수량"])
+def test_sort_matches_pandas(name, descending):
+    df = _frame()
+    expected = df.sort_values(name, ascending=not descending, kind="stable", na_position="last").index.tolist()
+    assert _rows(RowView(df).sort(name, descending)) == expected
+
+
+def test_sort_is_stable_on_filtered_view():
+    view = RowView(_frame()).search("첫").sort("수량")
+    assert _rows(view) == [5, 0]
+    assert _rows(RowView(_frame()).sort("수량").where(np.array([True, True, False, False, False, False]))) == [1, 5]
+
+
+def test_sort_mixed_column_compares_as_text():
+    # "3" < "Alpha" < "x" < "y" < "z", 빈 값은 맨 뒤
+    assert _rows(RowView(_frame()).sort("비고")) == [1, 3, 0, 4, 5, 2]
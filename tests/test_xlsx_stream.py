@@ -0,0 +1,81 @@
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import xlsx_stream
+from core.xlsx_stream import _escape_text, column_letter, write_xlsx
+
+CLEAN = ["", "a", "a & b", "<tag>", "x > y", "&amp;", "한글 ₩1,000", "줄\n바꿈", "탭\t", 'q"uote\'', 3, 2.5, None]
+DIRTY = CLEAN + ["bell\x07", "nul\x00byte", "\x1f"]
+
+
+def _slow(values):
+    return [xlsx_stream._ILLEGAL_XML.sub("", escape(v if isinstance(v, str) else str(v))) for v in values]
+
+
+@pytest.mark.parametrize("values", [CLEAN, DIRTY, [], ["only"]])
+def test_escape_text_matches_per_cell_escape(values):
+    assert _escape_text(np.array(values, dtype=object)).tolist() == _slow(values)
+
+
+def test_escape_text_clean_values_take_the_joined_path(monkeypatch):
+    calls = []
+    monkeypatch.setattr(xlsx_stream, "escape", lambda v: calls.append(v) or escape(v))
+    _escape_text(np.array(CLEAN * 100, dtype=object))
+    assert calls == []
+
+
+def test_column_letter():
+    assert [column_letter(i) for i in (0, 25, 26, 701, 702)] == ["A", "Z", "AA", "ZZ", "AAA"]
+
+
+def test_write_xlsx_round_trips_through_openpyxl():
+    df = pd.DataFrame({"이름": ["a & b", "<c>", "bell\x07", None], "금액": [1000, 2.5, np.nan, -3]})
+    buffer = io.BytesIO()
+    write_xlsx(buffer, {"시트": (df, {})})
+    with zipfile.ZipFile(io.BytesIO(buffer.getvalue())) as archive:
+        assert "xl/worksheets/sheet1.xml" in archive.namelist()
+    read = pd.read_excel(io.BytesIO(buffer.getvalue()), sheet_name="시트")
+    assert read["이름"].tolist()[:3] == ["a & b", "<c>", "bell"]
+    assert read["금액"].tolist()[:2] == [1000, 2.5] and read["금액"].tolist()[3] == -3
+
+
+def _round_trip(df, styles=None):
+    import openpyxl
+
+    buffer = io.BytesIO()
+    write_xlsx(buffer, {"시트": (df, styles or {})})
+    return openpyxl.load_workbook(io.BytesIO(buffer.getvalue()))["시트"]
+
+
+def test_large_integers_keep_every_digit():
+    big = 2 ** 60 + 1
+    df = pd.DataFrame({
+        "int": np.array([big, -big], dtype=np.int64),
+        "uint": np.array([2 ** 64 - 1, 1], dtype=np.uint64),
+        "nullable": pd.array([big, None], dtype="Int64"),
+        "object": pd.Series([big, 1.5], dtype=object),
+    })
+    sheet = _round_trip(df)
+    assert [c.value for c in sheet[2]] == [big, 2 ** 64 - 1, big, big]
+    assert [c.value for c in sheet[3]] == [-big, 1, None, 1.5]
+
+
+def test_datetimes_are_dated_cells_like_openpyxl():
+    from datetime import date, datetime
+
+    df = pd.DataFrame({
+        "ts": pd.to_datetime(["2025-01-03 12:30:15", None]),
+        "tz": pd.to_datetime(["2025-01-03 09:00", "2025-02-01 00:00"]).tz_localize("Asia/Seoul"),
+        "object": pd.Series([date(2024, 2, 29), datetime(2024, 3, 1, 6, 0)], dtype=object),
+    })
+    sheet = _round_trip(df, {0: np.array([xlsx_stream.STYLE_RED, xlsx_stream.STYLE_NONE])})
+    row = sheet[2]
+    assert [c.value for c in row] == [datetime(2025, 1, 3, 12, 30, 15), datetime(2025, 1, 3, 9, 0), datetime(2024, 2, 29)]
+    assert [c.number_format for c in row] == ["yyyy-mm-dd h:mm:ss", "yyyy-mm-dd h:mm:ss", "yyyy-mm-dd"]
+    assert row[0].font.b and row[0].font.color.rgb == "00FF0000"
+    assert sheet["C3"].value == datetime(2024, 3, 1, 6, 0) and sheet["A3"].value is None
@@ -1,7 +1,10 @@
 # 🏠 홈.py
 import streamlit as st
+from core.scheduler import start_refresh_scheduler
 
 st.set_page_config(page_title="📦 프로젝트 머레이 킬러앱", layout="centered")
+# 시트 예약 갱신 시작 (프로세스에 하나, core/scheduler.py)
+start_refresh_scheduler()
 
 st.title("📦 프로젝트 머레이 킬러앱")
 st.markdown("""
@@ -17,4 +20,5 @@ st.markdown("""
 - 🔁 **리퍼 정산 분석**
 - 💰 **입금자 정산 매칭**
 - 📦 **중국 출하 리스트 분석** *(ETA+1 기준, 캘린더 기반 시각화 포함)*
+- ⏱️ **성능 모니터링** *(페이지 단계별 p50/p95, `MURRAY_PROFILE=1` 로 기록)*
 """)